@@ -0,0 +1,253 @@
+# 기사 이력 저장소 모듈 - 추가 전용 레코드 파일 + mmap 이진 탐색 인덱스
+import hashlib
+import heapq
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from url_canonicalizer import url_key
+
+logger = logging.getLogger(__name__)
+
+
+def link_hash(link: str) -> int:
+    """정규화된 링크의 64비트 해시"""
+    return int(url_key(link), 16)
+
+
+def title_hash(title: str) -> int:
+    """정규화된 제목의 64비트 해시 (공백/특수문자 무시)"""
+    normalized = ''.join(ch for ch in (title or '').lower() if ch.isalnum())
+    return int.from_bytes(hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class ArticleStore:
+    """기사 이력 저장소
+
+    레코드는 JSON Lines 파일에 추가만 하고, 링크/제목 해시를 정렬해 둔 고정 폭
+    인덱스 파일을 mmap해 이진 탐색한다. 시작 시 전체 이력을 파싱하지 않는다.
+    """
+
+    MAGIC = b'EDUIDX01'
+    # magic, 인덱스에 반영된 레코드 파일 크기, 레코드 수, 링크 항목 수, 제목 항목 수
+    HEADER = struct.Struct('<8sQQQQ')
+    # 해시, 레코드 오프셋
+    ENTRY = struct.Struct('<QQ')
+
+    def __init__(self, store_file: str = 'news_history.jsonl',
+                 index_file: Optional[str] = None, rebuild_ratio: float = 0.05,
+                 min_rebuild_records: int = 1000):
+        self.store_file = store_file
+        self.index_file = index_file or f"{os.path.splitext(store_file)[0]}.idx"
+        self.rebuild_ratio = rebuild_ratio
+        self.min_rebuild_records = min_rebuild_records
+        self.lock = threading.Lock()
+
+        self.index_mm = None
+        self.index_handle = None
+        self.indexed_size = 0
+        self.indexed_count = 0
+        self.link_entries = 0
+        self.title_entries = 0
+
+        # 인덱스에 아직 반영되지 않은 레코드 (해시 → 오프셋 목록)
+        self.tail_links: Dict[int, List[int]] = {}
+        self.tail_titles: Dict[int, List[int]] = {}
+        self.tail_count = 0
+
+        if not os.path.exists(self.store_file):
+            open(self.store_file, 'ab').close()
+        self.reader = open(self.store_file, 'rb')
+        self._open_index()
+        self._scan_tail()
+
+    # ------------------------------------------------------------------
+    # 인덱스 열기/탐색
+    # ------------------------------------------------------------------
+    def _open_index(self):
+        """인덱스 파일 mmap (없거나 손상되었으면 빈 인덱스로 시작)"""
+        if not os.path.exists(self.index_file) or os.path.getsize(self.index_file) < self.HEADER.size:
+            return
+        handle = open(self.index_file, 'rb')
+        index_mm = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size, count, links, titles = self.HEADER.unpack_from(index_mm, 0)
+        expected = self.HEADER.size + (links + titles) * self.ENTRY.size
+        if magic != self.MAGIC or len(index_mm) != expected or size > os.path.getsize(self.store_file):
+            logger.warning(f"기사 인덱스가 올바르지 않아 다시 생성합니다: {self.index_file}")
+            index_mm.close()
+            handle.close()
+            return
+        self.index_handle, self.index_mm = handle, index_mm
+        self.indexed_size, self.indexed_count = size, count
+        self.link_entries, self.title_entries = links, titles
+
+    def _close_index(self):
+        if self.index_mm is not None:
+            self.index_mm.close()
+            self.index_handle.close()
+        self.index_mm = self.index_handle = None
+        self.indexed_size = self.indexed_count = self.link_entries = self.title_entries = 0
+
+    def _search(self, section: int, target: int) -> List[int]:
+        """정렬된 인덱스 구간에서 해시가 같은 레코드 오프셋 목록"""
+        if self.index_mm is None:
+            return []
+        if section == 0:
+            base, count = self.HEADER.size, self.link_entries
+        else:
+            base, count = self.HEADER.size + self.link_entries * self.ENTRY.size, self.title_entries
+
+        low, high = 0, count
+        while low < high:
+            mid = (low + high) // 2
+            if self.ENTRY.unpack_from(self.index_mm, base + mid * self.ENTRY.size)[0] < target:
+                low = mid + 1
+            else:
+                high = mid
+
+        offsets = []
+        while low < count:
+            value, offset = self.ENTRY.unpack_from(self.index_mm, base + low * self.ENTRY.size)
+            if value != target:
+                break
+            offsets.append(offset)
+            low += 1
+        return offsets
+
+    def _scan_tail(self):
+        """인덱스 이후에 추가된 레코드만 읽어 메모리 인덱스 구성"""
+        with open(self.store_file, 'rb') as f:
+            f.seek(self.indexed_size)
+            offset = self.indexed_size
+            for line in f:
+                if line.strip():
+                    try:
+                        self._add_tail(json.loads(line), offset)
+                    except ValueError:
+                        logger.warning(f"기사 레코드 파싱 실패 (오프셋 {offset})")
+                offset += len(line)
+
+    def _add_tail(self, record: Dict, offset: int):
+        if record.get('링크'):
+            self.tail_links.setdefault(link_hash(record['링크']), []).append(offset)
+        if record.get('제목'):
+            self.tail_titles.setdefault(title_hash(record['제목']), []).append(offset)
+        self.tail_count += 1
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self.indexed_count + self.tail_count
+
+    def read_record(self, offset: int) -> Optional[Dict]:
+        """오프셋 위치의 레코드 읽기"""
+        with self.lock:
+            self.reader.seek(offset)
+            line = self.reader.readline()
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    def find_by_link(self, link: str) -> Optional[Dict]:
+        """정규화된 링크가 같은 레코드 (해시 충돌은 레코드로 확인)"""
+        target = link_hash(link)
+        key = url_key(link)
+        for offset in self._search(0, target) + self.tail_links.get(target, []):
+            record = self.read_record(offset)
+            if record and url_key(record.get('링크', '')) == key:
+                return record
+        return None
+
+    def find_by_title(self, title: str) -> Optional[Dict]:
+        """정규화된 제목이 같은 레코드"""
+        target = title_hash(title)
+        for offset in self._search(1, target) + self.tail_titles.get(target, []):
+            record = self.read_record(offset)
+            if record and title_hash(record.get('제목', '')) == target:
+                return record
+        return None
+
+    def contains_link(self, link: str) -> bool:
+        return self.find_by_link(link) is not None
+
+    def contains_title(self, title: str) -> bool:
+        return self.find_by_title(title) is not None
+
+    def iter_records(self) -> Iterator[Dict]:
+        """전체 레코드 순회 (스트리밍)"""
+        with open(self.store_file, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    # ------------------------------------------------------------------
+    # 추가/인덱스 갱신
+    # ------------------------------------------------------------------
+    def append(self, records: List[Dict]):
+        """레코드 추가 (인덱스 반영은 commit에서)"""
+        if not records:
+            return
+        with self.lock, open(self.store_file, 'ab') as f:
+            offset = f.tell()
+            for record in records:
+                line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+                f.write(line)
+                self._add_tail(record, offset)
+                offset += len(line)
+
+    def commit(self, force: bool = False):
+        """미반영 레코드가 일정 비율을 넘으면 인덱스 병합 재생성"""
+        threshold = max(self.min_rebuild_records, int(self.indexed_count * self.rebuild_ratio))
+        if self.tail_count and (force or self.tail_count >= threshold):
+            self.rebuild_index()
+
+    def rebuild_index(self):
+        """기존 정렬 인덱스와 미반영 레코드를 병합해 새 인덱스 파일 작성"""
+        with self.lock:
+            store_size = os.path.getsize(self.store_file)
+            new_links = sorted((h, o) for h, offsets in self.tail_links.items() for o in offsets)
+            new_titles = sorted((h, o) for h, offsets in self.tail_titles.items() for o in offsets)
+            tmp_file = f"{self.index_file}.tmp"
+
+            with open(tmp_file, 'wb') as f:
+                f.write(self.HEADER.pack(
+                    self.MAGIC, store_size, self.indexed_count + self.tail_count,
+                    self.link_entries + len(new_links), self.title_entries + len(new_titles)
+                ))
+                for section, new_entries in ((0, new_links), (1, new_titles)):
+                    for entry in heapq.merge(self._iter_section(section), new_entries):
+                        f.write(self.ENTRY.pack(*entry))
+
+            self._close_index()
+            os.replace(tmp_file, self.index_file)
+            self.tail_links, self.tail_titles, self.tail_count = {}, {}, 0
+            self._open_index()
+        logger.info(f"기사 인덱스 갱신 완료: {self.indexed_count}개 레코드")
+
+    def _iter_section(self, section: int) -> Iterator[Tuple[int, int]]:
+        if self.index_mm is None:
+            return
+        if section == 0:
+            start, count = self.HEADER.size, self.link_entries
+        else:
+            start, count = self.HEADER.size + self.link_entries * self.ENTRY.size, self.title_entries
+        for i in range(count):
+            yield self.ENTRY.unpack_from(self.index_mm, start + i * self.ENTRY.size)
+
+    def import_records(self, records: List[Dict]):
+        """기존 JSON 이력 가져오기 (최초 1회)"""
+        self.append(records)
+        self.commit(force=True)
+
+    def close(self):
+        self._close_index()
+        self.reader.close()
@@ -0,0 +1,158 @@
+# 소스별 서킷 브레이커 모듈 - 장애 사이트는 반열림 탐색이 성공할 때까지 건너뜀
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from config import (
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_RECOVERY_SECONDS,
+    CIRCUIT_BREAKER_MAX_RECOVERY_SECONDS
+)
+from error_handler import error_handler
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# 사이트 장애로 볼 에러 분류 (파싱 오류 등은 사이트가 살아 있는 것)
+TRIP_CATEGORIES = {'network', 'timeout', 'server'}
+
+
+class CircuitBreaker:
+    """단일 소스 서킷 브레이커 (closed → open → half_open)"""
+
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                 recovery_timeout: float = CIRCUIT_BREAKER_RECOVERY_SECONDS,
+                 max_recovery_timeout: float = CIRCUIT_BREAKER_MAX_RECOVERY_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max_recovery_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.recovery_timeout = recovery_timeout
+        self.last_category = ''
+        self.lock = threading.Lock()
+
+    def allow_request(self, now: Optional[float] = None) -> bool:
+        """요청 허용 여부 (열림 상태에서 대기 시간이 지나면 반열림으로 전환)"""
+        now = now or time.time()
+        with self.lock:
+            if self.state == OPEN and now >= self.opened_at + self.recovery_timeout:
+                self.state = HALF_OPEN
+                logger.info(f"🔌 {self.name} 서킷 반열림 - 탐색 요청 허용")
+            return self.state != OPEN
+
+    def record_success(self):
+        """성공 기록 (닫힘 상태로 복구)"""
+        with self.lock:
+            if self.state != CLOSED:
+                logger.info(f"🔌 {self.name} 서킷 닫힘 - 정상 복구")
+            self.state = CLOSED
+            self.failures = 0
+            self.recovery_timeout = self.base_recovery_timeout
+
+    def record_failure(self, category: str = 'network', now: Optional[float] = None):
+        """실패 기록 (연속 실패가 임계값에 도달하면 열림)
+
+        장애가 아닌 분류(404, 파싱 오류 등)는 사이트가 응답한 것이므로 세지 않고,
+        반열림 탐색 중이면 탐색 성공으로 보고 닫는다.
+        """
+        if category not in TRIP_CATEGORIES:
+            if self.state == HALF_OPEN:
+                self.record_success()
+            return
+        now = now or time.time()
+        with self.lock:
+            self.failures += 1
+            self.last_category = category
+            if self.state == HALF_OPEN:
+                # 탐색 실패 시 대기 시간을 늘려 다시 열림
+                self.recovery_timeout = min(self.recovery_timeout * 2, self.max_recovery_timeout)
+                self._open(now)
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open(now)
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self.opened_at = now
+        logger.warning(f"🔌 {self.name} 서킷 열림 ({self.last_category}) - "
+                       f"{self.recovery_timeout / 60:.0f}분 동안 크롤링 생략")
+
+    def to_dict(self) -> Dict:
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'opened_at': self.opened_at,
+            'recovery_timeout': self.recovery_timeout,
+            'last_category': self.last_category
+        }
+
+    def load_dict(self, data: Dict):
+        self.state = data.get('state', CLOSED)
+        self.failures = data.get('failures', 0)
+        self.opened_at = data.get('opened_at', 0.0)
+        self.recovery_timeout = data.get('recovery_timeout', self.base_recovery_timeout)
+        self.last_category = data.get('last_category', '')
+
+
+class CircuitBreakerRegistry:
+    """소스별 서킷 브레이커 모음 (상태 파일에 저장)"""
+
+    def __init__(self, state_file: str = 'circuit_state.json'):
+        self.state_file = state_file
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.lock = threading.Lock()
+        self.saved_state: Dict[str, Dict] = {}
+        if os.path.exists(state_file):
+            try:
+                with open(state_file, 'r', encoding='utf-8') as f:
+                    self.saved_state = json.load(f)
+            except Exception as e:
+                logger.warning(f"서킷 브레이커 상태 로드 실패: {e}")
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self.lock:
+            if name not in self.breakers:
+                breaker = CircuitBreaker(name)
+                if name in self.saved_state:
+                    breaker.load_dict(self.saved_state[name])
+                self.breakers[name] = breaker
+            return self.breakers[name]
+
+    def allow_request(self, name: str) -> bool:
+        return self.get(name).allow_request()
+
+    def is_probe(self, name: str) -> bool:
+        """반열림 탐색 요청인지"""
+        return self.get(name).state == HALF_OPEN
+
+    def record_success(self, name: str):
+        self.get(name).record_success()
+
+    def on_error(self, error_info: Dict):
+        """ErrorHandler가 분류한 에러 정보를 받아 실패 기록"""
+        source = error_info.get('source')
+        if source:
+            self.get(source).record_failure(error_info.get('category', 'unknown'))
+
+    def save(self):
+        """상태 저장"""
+        with self.lock:
+            state = {**self.saved_state, **{name: b.to_dict() for name, b in self.breakers.items()}}
+        try:
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            logger.error(f"서킷 브레이커 상태 저장 실패: {e}")
+
+
+# 전역 서킷 브레이커 (에러 처리기의 분류 결과를 구독)
+circuit_breakers = CircuitBreakerRegistry()
+error_handler.add_listener(circuit_breakers.on_error)
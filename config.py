@@ -5,8 +5,21 @@ import os
 GOOGLE_CREDENTIALS_FILE = 'credentials.json'  # 구글 서비스 계정 키 파일
 SPREADSHEET_ID = '1B001qtMZKIEv_1DGCdwidNuiYI4-QLBZNzR5EpwyoKg' #교육 뉴스 크롤링 스프레드시트 ID
 WORKSHEET_NAME = '교육 뉴스 크롤링'  # 워크시트 이름
+# 월별 워크시트로 분할 ('교육 뉴스 크롤링 2025-10', 목록은 '교육 뉴스 크롤링 목록' 탭)
+# 켜면 이후 새 행만 월별 워크시트로 가고 기존 WORKSHEET_NAME 행은 옮기지 않는다 (README '월별 워크시트 분할' 참조)
+SHEET_SHARD_BY_MONTH = False
+SHEET_SHARD_MAX_ROWS = 5000  # 분할 워크시트당 최대 행 수 (넘으면 '... 2025-10 (2)'로 이어서 생성)
 
 # 크롤링 설정
+# 소스별 선택 항목:
+#   'list_region': 기사 목록 블록 정규식 (변경 감지 지문 계산 범위, 없으면 기사 링크 전체)
+#   'max_pages': 크롤링할 목록 페이지 수 (기본 1)
+#   'page_param': 페이지 번호 파라미터 이름 (기본 'page')
+#   'max_news': 소스당 최대 수집 기사 수 (기본 20)
+#   'end_marker': 기사 목록 뒤에 나오는 문자열 (예: '<footer') - 이후는 받지 않고 파싱
+#   'max_bytes': 목록 페이지에서 읽을 최대 바이트 수 (end_marker가 없을 때의 상한)
+#   'feed_url': RSS/Atom/뉴스 사이트맵 주소 (있으면 목록 페이지 대신 피드로 수집, 파싱 실패 시 목록 페이지)
+#              예: ND소프트 CMS는 'https://www.edupress.kr/rss/allArticle.xml'
 NEWS_SOURCES = [
 
         {
@@ -31,6 +44,29 @@ NEWS_SOURCES = [
     }
 ]
 
+# URL 정규화 규칙 (대표 호스트 기준)
+#   'aliases': 같은 사이트의 다른 호스트 (모바일, www 생략 등)
+#   'id_params': 기사를 식별하는 파라미터 (있으면 나머지 파라미터 제거)
+#   'strip_params': 소스 전용 추적 파라미터
+#   'https': 스킴을 https로 통일할지 여부 (기본 True)
+URL_CANONICAL_RULES = {
+    'news.eduhope.net': {
+        'aliases': ['m.news.eduhope.net', 'eduhope.net', 'www.eduhope.net']
+    },
+    'www.educhang.co.kr': {
+        'aliases': ['educhang.co.kr', 'm.educhang.co.kr'],
+        'id_params': ['idxno']
+    },
+    'www.edupress.kr': {
+        'aliases': ['edupress.kr', 'm.edupress.kr'],
+        'id_params': ['idxno']
+    },
+    'www.khan.co.kr': {
+        'aliases': ['khan.co.kr', 'm.khan.co.kr', 'mobile.khan.co.kr'],
+        'strip_params': ['pt', 'code']
+    }
+}
+
 # 스프레드시트 컬럼 설정
 COLUMNS = [
     '날짜',
@@ -42,3 +78,87 @@ COLUMNS = [
 
 # 크롤링 간격 (분)
 CRAWL_INTERVAL = 60  # 1시간마다 실행
+
+# 실행 마감 시간 설정 (다음 정시 실행과 겹치지 않도록)
+RUN_DEADLINE_SECONDS = 50 * 60  # 실행 전체 시간 예산 (None: 무제한)
+UPLOAD_RESERVE_SECONDS = 5 * 60  # 저장/업로드용으로 남겨 둘 시간 (크롤링은 그 전에 중단)
+SHEETS_HTTP_TIMEOUT = 60  # Google Sheets API 요청 타임아웃 (초)
+UPLOAD_OUTBOX_FILE = 'upload_outbox.db'  # 스프레드시트 미전달 행 대기열 (다음 실행에서 재시도)
+UPLOAD_OUTBOX_MAX_ATTEMPTS = 12  # 이 횟수만큼 실패한 행은 전달 불가로 남기고 건너뜀 (잘못된 워크시트 이름 등)
+
+# 분산 크롤링 작업 대기열 (main_final.py --work-queue, work_queue.py worker)
+WORK_QUEUE_FILE = 'work_queue.db'
+WORK_QUEUE_LEASE_SECONDS = 120  # 작업 임대 기간 (하트비트는 1/3 주기)
+
+# Google Sheets API 할당량 (사용자당 분당 요청 수 기본 한도에 맞춤)
+SHEETS_READ_PER_MINUTE = 60
+SHEETS_WRITE_PER_MINUTE = 60
+SHEETS_MAX_RETRIES = 4  # 429/5xx 응답 재시도 횟수
+SHEETS_RETRY_BASE_DELAY = 2.0  # 지수 백오프 시작 대기 시간 (초)
+SHEETS_RETRY_MAX_DELAY = 32.0  # 최대 대기 시간 (Retry-After도 이 값으로 제한)
+
+# 로깅 설정 (큐 기반 비동기 기록)
+LOG_FILE = 'education_news_crawler.log'
+LOG_ITEM_DETAILS = os.getenv('LOG_ITEM_DETAILS', '0') == '1'  # 기사/링크 단위 로그 기록 여부
+# 기사 단위 메시지 유형별 샘플링 비율 (LOG_ITEM_DETAILS가 켜진 경우)
+LOG_ITEM_SAMPLING = {
+    'anchor_text': 0.1,     # 원본 텍스트
+    'title_extracted': 0.1, # 추출된 제목
+    'collected': 1.0,       # 수집
+    'duplicate': 0.2,       # 중복 제외
+    'filtered': 0.2         # 필터링 제외
+}
+LOG_ITEM_RATE_LIMIT = 50  # 유형별 초당 최대 기록 건수 (0: 제한 없음)
+
+# 중복 제목 판단 설정 (매체 구분 없이, 문자 n-gram 셔글 자카드 유사도)
+# 이 값 이상인 다른 매체 기사는 중복으로 제외하고, 그보다 덜 비슷한 같은 사건 기사는 사건 묶음(STORY_CLUSTER_*)으로 묶는다
+TITLE_SIMILARITY_THRESHOLD = 0.5
+
+# 수집 이력 블룸 필터 설정 (seen_articles.bloom.* 파일)
+SEEN_FILTER_CAPACITY = 100000  # 첫 슬라이스 용량 (차면 2배 크기 슬라이스 추가)
+SEEN_FILTER_ERROR_RATE = 0.001
+
+# 기사 이력 저장소 설정
+NEWS_HISTORY_FILE = 'news_history.jsonl'  # 전체 이력 (인덱스: news_history.idx, 검색 인덱스: news_history.search)
+RECENT_NEWS_LIMIT = 100  # existing_news.json에 유지할 최근 뉴스 수 (유사 제목 비교 대상)
+
+# 사건 묶음 설정 (같은 날 기사의 해시 n-gram TF-IDF 코사인 유사도, 기사 '묶음' 필드에 저장)
+STORY_CLUSTER_THRESHOLD = 0.35
+STORY_CLUSTER_MAX_DAY_RECORDS = 5000  # 묶음 비교에 불러올 그날 저장 기사 수 상한
+
+# 팀별 검색어 구독 설정 파일 (없으면 구독 기능 비활성)
+# [{"name": "고교학점제", "query": "고교학점제 | 학점제 고교", "worksheet": "고교학점제", "recipients": ["team@example.com"], "sources": []}]
+SUBSCRIPTIONS_FILE = 'subscriptions.json'
+
+# 메트릭 이력 설정 (SQLite, 1분/1시간/1일 롤업)
+METRICS_HISTORY_FILE = 'metrics_history.db'
+METRICS_RETENTION_DAYS = {'raw': 35, '1m': 7, '1h': 90, '1d': None}  # None: 무기한
+
+# 소스별 서킷 브레이커 설정 (circuit_state.json에 상태 저장)
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3  # 연속 장애 횟수
+CIRCUIT_BREAKER_RECOVERY_SECONDS = 50 * 60  # 다음 정시 실행에서 반열림 탐색
+CIRCUIT_BREAKER_MAX_RECOVERY_SECONDS = 24 * 3600  # 탐색 실패 시 대기 시간 상한
+
+# 프로파일 저장 위치 (--profile 실행 시 실행마다 하위 디렉터리 생성)
+PROFILE_DIR = 'profiles'
+
+# 알림 발송 설정 (monitor_config.json의 'email' 항목으로 메일 발송)
+ALERT_DEDUP_SECONDS = 3600  # 같은 알림을 다시 보내지 않는 시간 (초)
+ALERT_FLUSH_SECONDS = 30  # 알림을 모아 요약 메일로 보내는 간격 (초)
+
+# 자원 사용량 샘플링 설정 (psutil)
+RESOURCE_SAMPLE_INTERVAL = 1.0  # 측정 간격 (초)
+RESOURCE_TRACE_ALLOCATIONS = os.getenv('TRACE_ALLOCATIONS', '0') == '1'  # 단계별 tracemalloc 상위 할당 기록
+
+# 원본 페이지 아카이브 설정 (page_archive/archive-YYYYMM.warc.gz + index.db)
+PAGE_ARCHIVE_ENABLED = True
+PAGE_ARCHIVE_DIR = 'page_archive'
+PAGE_ARCHIVE_RETENTION_DAYS = 90  # 보존 기간 (일, 월별 파일 단위로 삭제, 0이면 무기한)
+
+# 스트리밍 다운로드 청크 크기 ('end_marker'/'max_bytes' 소스)
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# 요청 재시도 설정 (5xx/429/타임아웃/연결 오류만 재시도, 대기 중에는 작업자 반환)
+FETCH_MAX_RETRIES = 2  # 요청당 최대 재시도 횟수
+FETCH_RETRY_BASE_DELAY = 1.0  # 첫 재시도 대기 시간 (초, 이후 2배씩 증가)
+FETCH_RETRY_MAX_DELAY = 30.0  # 재시도 대기 시간 상한 (Retry-After 포함)
@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import Any, Callable, Optional
 import json
 import os
+import requests
 
 class ErrorHandler:
     """통합 에러 처리 및 로깅 클래스"""
@@ -18,8 +19,11 @@ class ErrorHandler:
             'parsing_errors': 0,
             'timeout_errors': 0,
             'authentication_errors': 0,
+            'server_errors': 0,
+            'http_errors': 0,
             'total_errors': 0
         }
+        self.listeners = []  # 에러 분류 결과 구독자 (서킷 브레이커 등)
     
     def setup_logging(self):
         """로깅 설정"""
@@ -54,16 +58,25 @@ class ErrorHandler:
             'traceback': traceback.format_exc()
         }
         
-        # 에러 타입별 분류
-        if isinstance(error, (ConnectionError, TimeoutError)):
+        # 에러 타입별 분류 (타임아웃은 ConnectionError 계열보다 먼저 확인)
+        status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+        if isinstance(error, (TimeoutError, requests.Timeout)):
+            self.error_stats['timeout_errors'] += 1
+            error_info['category'] = 'timeout'
+        elif isinstance(error, (ConnectionError, requests.ConnectionError)):
             self.error_stats['network_errors'] += 1
             error_info['category'] = 'network'
+        elif isinstance(error, requests.HTTPError) and status_code is not None:
+            error_info['status_code'] = status_code
+            if status_code >= 500:
+                self.error_stats['server_errors'] += 1
+                error_info['category'] = 'server'
+            else:
+                self.error_stats['http_errors'] += 1
+                error_info['category'] = 'http'
         elif isinstance(error, (AttributeError, KeyError, ValueError)):
             self.error_stats['parsing_errors'] += 1
             error_info['category'] = 'parsing'
-        elif isinstance(error, TimeoutError):
-            self.error_stats['timeout_errors'] += 1
-            error_info['category'] = 'timeout'
         elif 'auth' in str(error).lower() or 'credential' in str(error).lower():
             self.error_stats['authentication_errors'] += 1
             error_info['category'] = 'authentication'
@@ -75,8 +88,24 @@ class ErrorHandler:
         # 로그 기록
         self.error_logger.error(f"[{error_info['category'].upper()}] {context}: {error}")
         
+        for listener in self.listeners:
+            try:
+                listener(error_info)
+            except Exception as e:
+                self.error_logger.warning(f"에러 구독자 처리 실패: {e}")
+        
         return error_info
     
+    def add_listener(self, callback: Callable[[dict], None]):
+        """에러 분류 결과 구독 등록"""
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[dict], None]):
+        """에러 분류 결과 구독 해제"""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+    
     def retry_on_error(self, max_retries: int = 3, delay: float = 1.0):
         """에러 발생 시 재시도 데코레이터"""
         def decorator(func: Callable) -> Callable:
@@ -99,8 +128,8 @@ class ErrorHandler:
                             self.handle_error(
                                 e, 
                                 f"최대 재시도 횟수 초과: {func.__name__}",
-                                source=getattr(args[0], '__class__', {}).get('__name__', 'Unknown'),
-                                url=getattr(kwargs, 'url', '')
+                                source=type(args[0]).__name__ if args else 'Unknown',
+                                url=kwargs.get('url', '')
                             )
                 
                 raise last_error
@@ -116,7 +145,7 @@ class ErrorHandler:
             error_info = self.handle_error(
                 e, 
                 f"함수 실행 실패: {func.__name__}",
-                source=getattr(args[0], '__class__', {}).get('__name__', 'Unknown') if args else 'Unknown'
+                source=type(args[0]).__name__ if args else 'Unknown'
             )
             return None, False
     
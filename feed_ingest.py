@@ -0,0 +1,118 @@
+# 피드 수집 모듈 - RSS/Atom/뉴스 사이트맵을 스트리밍 XML 파서로 읽어 기사 항목 추출
+import html
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+
+# 항목 단위 요소 (RSS item, Atom entry, 사이트맵 url)
+ENTRY_TAGS = frozenset({'item', 'entry', 'url'})
+TITLE_TAGS = ('title',)                            # 뉴스 사이트맵은 news:title (로컬 이름 동일)
+DATE_TAGS = ('pubDate', 'published', 'publication_date', 'date', 'updated', 'lastmod')
+
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+def _local(tag) -> str:
+    """네임스페이스를 뗀 태그 이름"""
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _child_text(element: ET.Element, names) -> str:
+    """하위 요소 중 로컬 이름이 names 순서로 처음 일치하는 요소의 텍스트"""
+    found = {}
+    for child in element.iter():
+        name = _local(child.tag)
+        if name in names and name not in found and child is not element:
+            found[name] = (child.text or '').strip()
+    for name in names:
+        if found.get(name):
+            return found[name]
+    return ''
+
+
+def _entry_link(element: ET.Element) -> str:
+    """항목 링크 (RSS link/guid, Atom link[rel=alternate], 사이트맵 loc)"""
+    guid = ''
+    for child in element:
+        name = _local(child.tag)
+        if name == 'link':
+            href = child.get('href')
+            if href is None and child.text:
+                return child.text.strip()
+            if href and child.get('rel', 'alternate') == 'alternate':
+                return href.strip()
+        elif name == 'loc' and child.text:
+            return child.text.strip()
+        elif name == 'guid' and child.get('isPermaLink', 'true') != 'false' and child.text:
+            guid = child.text.strip()
+    return guid
+
+
+def parse_date(text: str) -> Optional[datetime]:
+    """RFC 822(RSS) 또는 ISO 8601(Atom/사이트맵) 날짜 → 로컬 시각"""
+    if not text:
+        return None
+    try:
+        parsed = parsedate_to_datetime(text)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(text.strip().replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def clean_title(text: str) -> str:
+    """제목의 HTML 태그/엔티티/연속 공백 정리"""
+    text = html.unescape(_TAG_PATTERN.sub('', html.unescape(text)))
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def parse_feed(content: bytes, max_items: Optional[int] = None, chunk_size: int = 16384) -> List[Dict]:
+    """피드 본문에서 (제목, 링크, 발행시각) 항목 추출
+
+    XMLPullParser에 조각 단위로 넣으면서 항목이 끝날 때마다 처리 후 비우므로 트리
+    전체를 만들지 않고, max_items개를 채우면 나머지는 파싱하지 않는다. 바이트 상한으로
+    잘린 본문은 그 전까지 완성된 항목만 사용한다.
+    """
+    parser = ET.XMLPullParser(events=('end',))
+    entries = []
+    try:
+        for offset in range(0, len(content), chunk_size):
+            parser.feed(content[offset:offset + chunk_size])
+            for _, element in parser.read_events():
+                if _local(element.tag) not in ENTRY_TAGS:
+                    continue
+                title = clean_title(_child_text(element, TITLE_TAGS))
+                link = _entry_link(element)
+                if title and link:
+                    entries.append({
+                        'title': title,
+                        'link': link,
+                        'published': parse_date(_child_text(element, DATE_TAGS))
+                    })
+                element.clear()
+                if max_items and len(entries) >= max_items:
+                    return entries
+        parser.close()
+    except ET.ParseError:
+        if not entries:
+            raise
+    return entries
+
+
+def feed_records(entries: List[Dict], source_name: str) -> List[Dict]:
+    """피드 항목 → 크롤러 기사 레코드 (날짜는 실제 발행일, 없으면 수집일)"""
+    now = datetime.now()
+    return [
+        {
+            '날짜': (entry['published'] or now).strftime('%Y-%m-%d'),
+            '제목': entry['title'],
+            '출처': source_name,
+            '링크': entry['link'],
+            '크롤링시간': now.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        for entry in entries
+    ]
@@ -0,0 +1,63 @@
+# 요청 단위 재시도 정책 모듈 - 상태 코드/예외별 재시도 여부와 백오프 계산
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+
+from config import FETCH_MAX_RETRIES, FETCH_RETRY_BASE_DELAY, FETCH_RETRY_MAX_DELAY
+
+# 일시적 장애로 볼 HTTP 상태 코드 (404 등 다른 4xx는 재시도해도 결과가 같음)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# 일시적 장애로 볼 예외 (타임아웃, 연결 끊김, 응답 도중 끊김)
+RETRY_EXCEPTIONS = (
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    TimeoutError,
+    ConnectionError
+)
+
+
+def retry_after_seconds(response) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) 해석"""
+    value = (getattr(response, 'headers', None) or {}).get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """요청 재시도 정책 (지수 백오프 + 지터, Retry-After 우선)"""
+
+    def __init__(self, max_retries: int = FETCH_MAX_RETRIES, base_delay: float = FETCH_RETRY_BASE_DELAY,
+                 max_delay: float = FETCH_RETRY_MAX_DELAY, retry_statuses=RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+
+    def should_retry(self, error: Exception) -> bool:
+        """재시도할 만한 오류인지"""
+        if isinstance(error, requests.exceptions.HTTPError):
+            response = getattr(error, 'response', None)
+            return response is not None and response.status_code in self.retry_statuses
+        return isinstance(error, RETRY_EXCEPTIONS)
+
+    def delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """attempt번째 재시도 전 대기 시간 (초)"""
+        response = getattr(error, 'response', None)
+        retry_after = retry_after_seconds(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        backoff = self.base_delay * (2 ** (attempt - 1))
+        return min(backoff * random.uniform(0.5, 1.0), self.max_delay)
@@ -3,25 +3,37 @@ import pandas as pd
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 import logging
 from datetime import datetime
+from config import SHEETS_HTTP_TIMEOUT
+from sheets_quota import sheets_quota
+from run_deadline import DeadlineExceeded
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 분할 워크시트 목록 탭 컬럼
+SHARD_INDEX_COLUMNS = ['워크시트', '기간', '행 수', '갱신시간']
+
 class GoogleSheetsManager:
-    def __init__(self, credentials_file, spreadsheet_id):
+    def __init__(self, credentials_file, spreadsheet_id, timeout=SHEETS_HTTP_TIMEOUT, quota=None):
         """
         구글 스프레드시트 매니저 초기화
         
         Args:
             credentials_file (str): 구글 서비스 계정 키 파일 경로
             spreadsheet_id (str): 구글 스프레드시트 ID
+            timeout (float): API 요청 타임아웃 (초)
+            quota (SheetsQuotaGovernor): 할당량 관리자 (기본: 전역 공유)
         """
         self.credentials_file = credentials_file
         self.spreadsheet_id = spreadsheet_id
+        self.timeout = timeout
+        self.quota = quota or sheets_quota
         self.service = None
+        self._shard_index = {}  # 기본 이름 → 분할 워크시트 목록 (실행 중 캐시)
+        self.deadline = None    # 재시도 대기 상한 (업로드 시 실행 마감 시간 지정)
         self._authenticate()
     
     def _authenticate(self):
@@ -33,23 +45,29 @@ class GoogleSheetsManager:
                 self.credentials_file, scopes=scopes
             )
             
-            self.service = build('sheets', 'v4', credentials=credentials)
+            # 응답 없는 요청이 실행 마감 시간을 넘기지 않도록 타임아웃 지정
+            http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=self.timeout))
+            self.service = build('sheets', 'v4', http=http)
             logger.info("구글 스프레드시트 API 인증 성공")
             
         except Exception as e:
             logger.error(f"구글 API 인증 실패: {e}")
             raise
     
+    def _execute(self, request, kind='read', idempotent=True):
+        """할당량 관리자를 거쳐 요청 실행 (kind: 'read' 또는 'write', 행 추가는 idempotent=False)"""
+        return self.quota.execute(request, kind, idempotent, self.deadline)
+    
     def get_worksheet_data(self, worksheet_name, range_name=None):
         """워크시트 데이터 읽기"""
         try:
             if range_name is None:
                 range_name = f"{worksheet_name}!A:Z"
             
-            result = self.service.spreadsheets().values().get(
+            result = self._execute(self.service.spreadsheets().values().get(
                 spreadsheetId=self.spreadsheet_id,
                 range=range_name
-            ).execute()
+            ), 'read')
             
             values = result.get('values', [])
             return values
@@ -85,13 +103,13 @@ class GoogleSheetsManager:
                 'values': values
             }
             
-            result = self.service.spreadsheets().values().append(
+            result = self._execute(self.service.spreadsheets().values().append(
                 spreadsheetId=self.spreadsheet_id,
                 range=f"{worksheet_name}!A:Z",
                 valueInputOption='RAW',
                 insertDataOption='INSERT_ROWS',
                 body=body
-            ).execute()
+            ), 'write', idempotent=False)
             
             logger.info(f"데이터 추가 완료: {result.get('updates', {}).get('updatedRows', 0)}행")
             return True
@@ -108,12 +126,12 @@ class GoogleSheetsManager:
             
             # 전체 범위 교체
             body = {'values': values}
-            result = self.service.spreadsheets().values().update(
+            result = self._execute(self.service.spreadsheets().values().update(
                 spreadsheetId=self.spreadsheet_id,
                 range=f"{worksheet_name}!A:Z",
                 valueInputOption='RAW',
                 body=body
-            ).execute()
+            ), 'write')
             
             logger.info(f"워크시트 '{worksheet_name}' 전체 데이터 교체 완료 ({len(df)}개 행)")
             return True
@@ -121,6 +139,8 @@ class GoogleSheetsManager:
         except HttpError as e:
             logger.error(f"워크시트 데이터 교체 실패: {e}")
             return False
+        except DeadlineExceeded:
+            raise  # 시간 부족은 실패가 아니므로 호출자에게 그대로 전달
         except Exception as e:
             logger.error(f"워크시트 데이터 교체 중 오류 발생: {e}")
             return False
@@ -149,12 +169,12 @@ class GoogleSheetsManager:
                 'values': values
             }
             
-            result = self.service.spreadsheets().values().update(
+            result = self._execute(self.service.spreadsheets().values().update(
                 spreadsheetId=self.spreadsheet_id,
                 range=range_name,
                 valueInputOption='RAW',
                 body=body
-            ).execute()
+            ), 'write')
             
             logger.info(f"데이터 업데이트 완료: {result.get('updatedRows', 0)}행")
             return True
@@ -166,10 +186,10 @@ class GoogleSheetsManager:
     def clear_worksheet(self, worksheet_name):
         """워크시트 데이터 전체 삭제"""
         try:
-            result = self.service.spreadsheets().values().clear(
+            result = self._execute(self.service.spreadsheets().values().clear(
                 spreadsheetId=self.spreadsheet_id,
                 range=f"{worksheet_name}!A:Z"
-            ).execute()
+            ), 'write')
             
             logger.info("워크시트 데이터 삭제 완료")
             return True
@@ -191,10 +211,10 @@ class GoogleSheetsManager:
                 }]
             }
             
-            result = self.service.spreadsheets().batchUpdate(
+            result = self._execute(self.service.spreadsheets().batchUpdate(
                 spreadsheetId=self.spreadsheet_id,
                 body=request_body
-            ).execute()
+            ), 'write')
             
             logger.info(f"워크시트 생성 완료: {worksheet_name}")
             return True
@@ -210,9 +230,9 @@ class GoogleSheetsManager:
     def get_worksheets(self):
         """스프레드시트의 모든 워크시트 정보 가져오기"""
         try:
-            result = self.service.spreadsheets().get(
+            result = self._execute(self.service.spreadsheets().get(
                 spreadsheetId=self.spreadsheet_id
-            ).execute()
+            ), 'read')
             
             worksheets = result.get('sheets', [])
             logger.info(f"워크시트 수: {len(worksheets)}")
@@ -229,12 +249,12 @@ class GoogleSheetsManager:
                 'values': [headers]
             }
             
-            result = self.service.spreadsheets().values().update(
+            result = self._execute(self.service.spreadsheets().values().update(
                 spreadsheetId=self.spreadsheet_id,
                 range=f"{worksheet_name}!A1",
                 valueInputOption='RAW',
                 body=body
-            ).execute()
+            ), 'write')
             
             logger.info("헤더 설정 완료")
             return True
@@ -243,8 +263,92 @@ class GoogleSheetsManager:
             logger.error(f"헤더 설정 실패: {e}")
             return False
 
+    # ------------------------------------------------------------------
+    # 워크시트 분할 (월별 + 행 수 상한)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def index_title(base_name):
+        """분할 워크시트 목록 탭 이름"""
+        return f"{base_name} 목록"
+
+    @staticmethod
+    def shard_title(base_name, period, part=1):
+        """분할 워크시트 이름 (예: '교육 뉴스 크롤링 2025-10', '교육 뉴스 크롤링 2025-10 (2)')"""
+        return f"{base_name} {period}" if part == 1 else f"{base_name} {period} ({part})"
+
+    def load_shard_index(self, base_name):
+        """목록 탭 읽기 (없으면 생성), 실행 중에는 캐시 사용
+
+        목록을 읽지 못하면 예외를 그대로 전달한다 (빈 목록으로 덮어쓰지 않도록).
+        """
+        cache = self._shard_index
+        if base_name in cache:
+            return cache[base_name]
+
+        index_name = self.index_title(base_name)
+        try:
+            result = self._execute(self.service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{index_name}!A:D"
+            ), 'read')
+            rows = result.get('values', [])[1:]
+        except HttpError as e:
+            if int(getattr(e.resp, 'status', 0) or 0) != 400:
+                raise
+            # 목록 탭이 아직 없음
+            if not self.create_worksheet(index_name):
+                raise
+            self.setup_headers(index_name, SHARD_INDEX_COLUMNS)
+            rows = []
+
+        cache[base_name] = [
+            {'title': row[0], 'period': row[1], 'rows': int(row[2]) if len(row) > 2 and row[2] else 0}
+            for row in rows if len(row) >= 2
+        ]
+        return cache[base_name]
+
+    def current_shard(self, base_name, period, headers, incoming_rows=0, max_rows=None):
+        """기간에 해당하는 현재 분할 워크시트 이름 (행 수 상한을 넘으면 다음 번호로 새로 생성)"""
+        entries = [e for e in self.load_shard_index(base_name) if e['period'] == period]
+        if entries:
+            last = entries[-1]
+            if not max_rows or last['rows'] + incoming_rows <= max_rows:
+                return last['title']
+
+        title = self.shard_title(base_name, period, len(entries) + 1)
+        if not self.create_worksheet(title):
+            raise RuntimeError(f"분할 워크시트 생성 실패: {title}")
+        self.setup_headers(title, headers)
+        self.load_shard_index(base_name).append({'title': title, 'period': period, 'rows': 0})
+        logger.info(f"분할 워크시트 생성: {title}")
+        return title
+
+    def record_shard_rows(self, base_name, title, row_count):
+        """분할 워크시트의 데이터 행 수를 목록 탭에 기록"""
+        index = self.load_shard_index(base_name)
+        for entry in index:
+            if entry['title'] == title:
+                entry['rows'] = row_count
+
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        values = [SHARD_INDEX_COLUMNS] + [[e['title'], e['period'], e['rows'], now] for e in index]
+        try:
+            self._execute(self.service.spreadsheets().values().update(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{self.index_title(base_name)}!A1",
+                valueInputOption='RAW',
+                body={'values': values}
+            ), 'write')
+            return True
+        except HttpError as e:
+            logger.error(f"분할 워크시트 목록 갱신 실패: {e}")
+            return False
+
 if __name__ == "__main__":
     from config import GOOGLE_CREDENTIALS_FILE, SPREADSHEET_ID, WORKSHEET_NAME, COLUMNS
+    from log_config import setup_logging
+    
+    setup_logging()
     
     # 테스트용
     if SPREADSHEET_ID:
@@ -0,0 +1,114 @@
+# 로깅 설정 모듈 - 큐 기반 비동기 로깅 + 기사 단위 메시지 샘플링/속도 제한
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+from config import LOG_FILE, LOG_ITEM_DETAILS, LOG_ITEM_SAMPLING, LOG_ITEM_RATE_LIMIT
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# 기사/링크 단위 메시지 전용 로거 (기본은 INFO라 debug 호출은 포맷팅 없이 버려짐)
+ITEM_LOGGER_NAME = 'crawler.items'
+item_logger = logging.getLogger(ITEM_LOGGER_NAME)
+
+
+class ItemSamplingFilter(logging.Filter):
+    """메시지 유형(extra={'msg_type': ...})별 샘플링 및 초당 속도 제한
+
+    유형이 없는 메시지는 그대로 통과시키고, 버린 건수는 유형별로 집계해
+    summary()로 한 줄 요약을 남긴다.
+    """
+
+    def __init__(self, sampling: Optional[Dict[str, float]] = None, rate_limit: int = 0):
+        super().__init__()
+        self.sampling = sampling or {}
+        self.rate_limit = rate_limit
+        self.windows: Dict[str, list] = {}  # 유형 → [현재 초, 통과 건수]
+        self.dropped: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        msg_type = getattr(record, 'msg_type', None)
+        if msg_type is None:
+            return True
+
+        rate = self.sampling.get(msg_type, 1.0)
+        allowed = rate >= 1.0 or random.random() < rate
+        if allowed and self.rate_limit:
+            second = int(time.monotonic())
+            with self.lock:
+                window = self.windows.setdefault(msg_type, [second, 0])
+                if window[0] != second:
+                    window[0], window[1] = second, 0
+                window[1] += 1
+                allowed = window[1] <= self.rate_limit
+
+        if not allowed:
+            with self.lock:
+                self.dropped[msg_type] = self.dropped.get(msg_type, 0) + 1
+        return allowed
+
+    def summary(self) -> str:
+        with self.lock:
+            return ', '.join(f"{msg_type} {count}건" for msg_type, count in sorted(self.dropped.items()))
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_sampling_filter: Optional[ItemSamplingFilter] = None
+
+
+def setup_logging(log_file: str = LOG_FILE, level: int = logging.INFO,
+                  item_details: bool = LOG_ITEM_DETAILS) -> logging.handlers.QueueListener:
+    """루트 로거를 큐 핸들러로 설정 (포맷팅/파일·콘솔 출력은 별도 스레드에서)"""
+    global _listener, _sampling_filter
+    if _listener is not None:
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    # 파일 핸들러 (레벨은 로거에서 결정)
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(formatter)
+
+    # 콘솔 핸들러
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
+
+    # 호출 스레드는 레코드를 큐에 넣기만 함 (샘플링은 큐에 넣기 전에 적용)
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    _sampling_filter = ItemSamplingFilter(LOG_ITEM_SAMPLING, LOG_ITEM_RATE_LIMIT)
+    queue_handler.addFilter(_sampling_filter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    # 기사 단위 메시지는 플래그가 켜진 경우에만 기록
+    item_logger.setLevel(logging.DEBUG if item_details else logging.INFO)
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """남은 로그를 모두 기록하고 리스너 종료 (샘플링으로 버린 건수 요약)"""
+    global _listener
+    if _listener is None:
+        return
+    if _sampling_filter is not None and _sampling_filter.dropped:
+        logging.getLogger(__name__).info(f"샘플링으로 생략된 로그: {_sampling_filter.summary()}")
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
@@ -1,10 +1,10 @@
 # 🚀 최종 통합된 교육 뉴스 크롤링 프로그램
+import argparse
 import logging
-import sys
 import os
 import json
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 # 핵심 모듈들 import
 from news_crawler import EducationNewsCrawler
@@ -14,45 +14,67 @@ from config import (
     GOOGLE_CREDENTIALS_FILE, 
     SPREADSHEET_ID, 
     WORKSHEET_NAME, 
-    COLUMNS
+    COLUMNS,
+    TITLE_SIMILARITY_THRESHOLD,
+    SEEN_FILTER_CAPACITY,
+    SEEN_FILTER_ERROR_RATE,
+    NEWS_HISTORY_FILE,
+    RECENT_NEWS_LIMIT,
+    RUN_DEADLINE_SECONDS,
+    UPLOAD_RESERVE_SECONDS,
+    UPLOAD_OUTBOX_FILE,
+    UPLOAD_OUTBOX_MAX_ATTEMPTS,
+    SHEET_SHARD_BY_MONTH,
+    SHEET_SHARD_MAX_ROWS,
+    WORK_QUEUE_LEASE_SECONDS,
+    SUBSCRIPTIONS_FILE,
+    STORY_CLUSTER_THRESHOLD,
+    STORY_CLUSTER_MAX_DAY_RECORDS,
+    PROFILE_DIR
 )
+from article_store import ArticleStore
+from search_index import SearchIndex
+from story_clustering import StoryClusterer
+from title_tokenizer import TitleShingleIndex
+from seen_filter import SeenArticleFilter
+from upload_outbox import UploadOutbox
+from subscriptions import build_message, load_subscriptions
+from work_queue import SqliteWorkQueue, crawl_with_queue
+from url_canonicalizer import url_key
+from run_deadline import RunDeadline, DeadlineExceeded
 from error_handler import error_handler
 from monitor import performance_monitor, notification_manager
+from log_config import setup_logging
+from profiling import profiler
+from resource_sampler import resource_sampler
 
-# 로깅 설정
-def setup_logging():
-    """로깅 설정"""
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    
-    # 파일 핸들러
-    file_handler = logging.FileHandler('education_news_crawler.log', encoding='utf-8')
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(logging.Formatter(log_format))
-    
-    # 콘솔 핸들러
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(logging.Formatter(log_format))
-    
-    # 루트 로거 설정
-    logging.basicConfig(
-        level=logging.INFO,
-        format=log_format,
-        handlers=[file_handler, console_handler]
-    )
+item_logger = logging.getLogger('crawler.items')  # 기사 단위 메시지 (기본 비활성)
 
 class FinalEducationNewsManager:
     """최종 통합된 교육 뉴스 관리자"""
     
-    def __init__(self):
-        """초기화"""
-        self.crawler = EducationNewsCrawler()
+    def __init__(self, work_queue_file: Optional[str] = None):
+        """초기화 (work_queue_file을 주면 소스 크롤링을 작업 대기열로 분배)"""
         self.sheets_manager = None
+        self.work_queue = SqliteWorkQueue(work_queue_file) if work_queue_file else None
         self.existing_news_file = 'existing_news.json'
         self.existing_news = self.load_existing_news()
+        self.article_store = self.initialize_article_store()
+        self.search_index = SearchIndex(NEWS_HISTORY_FILE)
+        self.story_clusterer = StoryClusterer(STORY_CLUSTER_THRESHOLD, STORY_CLUSTER_MAX_DAY_RECORDS)
+        self.title_index = self.build_title_index(self.existing_news)
+        self.seen_filter = self.initialize_seen_filter()
+        self.crawler = EducationNewsCrawler(seen_filter=self.seen_filter)
         
         # Google Sheets 초기화
         self.initialize_google_sheets()
+        
+        # 업로드 대기열 (스프레드시트가 설정된 경우에만 행을 쌓음)
+        self.outbox = UploadOutbox(UPLOAD_OUTBOX_FILE, max_attempts=UPLOAD_OUTBOX_MAX_ATTEMPTS)
+        self.uploads_enabled = os.path.exists(GOOGLE_CREDENTIALS_FILE) and bool(SPREADSHEET_ID)
+        
+        # 팀별 검색어 구독 (일치 기사를 구독 워크시트/알림으로 전달)
+        self.subscriptions = load_subscriptions(SUBSCRIPTIONS_FILE)
     
     def initialize_google_sheets(self):
         """Google Sheets 초기화 (통합된 버전)"""
@@ -80,6 +102,11 @@ class FinalEducationNewsManager:
             worksheets = self.sheets_manager.get_worksheets()
             print(f"Google Sheets 연결 성공! (워크시트 수: {len(worksheets)})")
             
+            # 월별 분할 워크시트는 업로드할 때 필요하면 생성
+            if SHEET_SHARD_BY_MONTH:
+                print(f"월별 워크시트 사용: '{WORKSHEET_NAME} YYYY-MM' (목록: '{WORKSHEET_NAME} 목록')")
+                return True
+            
             # 대상 워크시트 확인
             target_worksheet = None
             for ws in worksheets:
@@ -116,6 +143,33 @@ class FinalEducationNewsManager:
                 return []
         return []
     
+    def initialize_article_store(self) -> ArticleStore:
+        """기사 이력 저장소 열기 (인덱스 mmap, 비어 있으면 기존 뉴스 가져오기)"""
+        article_store = ArticleStore(NEWS_HISTORY_FILE)
+        if len(article_store) == 0 and self.existing_news:
+            article_store.import_records(self.existing_news)
+            print(f"기사 이력 저장소 생성: {len(article_store)}개")
+        return article_store
+    
+    def initialize_seen_filter(self) -> SeenArticleFilter:
+        """수집 이력 블룸 필터 초기화 (비어 있으면 기사 이력으로 채움)"""
+        seen_filter = SeenArticleFilter(
+            capacity=SEEN_FILTER_CAPACITY,
+            error_rate=SEEN_FILTER_ERROR_RATE,
+            confirm_link=self.article_store.contains_link,
+            confirm_title=self.article_store.contains_title
+        )
+        if seen_filter.count == 0 and len(self.article_store):
+            seen_filter.add_news(self.article_store.iter_records())
+        return seen_filter
+    
+    def build_title_index(self, news_list: List[Dict]) -> TitleShingleIndex:
+        """기존 뉴스 제목의 셔글 인덱스 생성 (매체 간 유사 제목 중복 체크용)"""
+        title_index = TitleShingleIndex(threshold=TITLE_SIMILARITY_THRESHOLD)
+        for news in news_list:
+            title_index.add(news.get('링크', ''), news.get('제목', ''))
+        return title_index
+    
     def save_existing_news(self, news_list: List[Dict]):
         """기존 뉴스 데이터 저장"""
         try:
@@ -125,21 +179,39 @@ class FinalEducationNewsManager:
             error_handler.handle_error(e, "기존 뉴스 저장 실패")
     
     def is_duplicate(self, new_news: Dict) -> bool:
-        """중복 뉴스 체크"""
-        for existing in self.existing_news:
-            if (existing.get('제목') == new_news.get('제목') or 
-                existing.get('링크') == new_news.get('링크')):
-                return True
+        """중복 뉴스 체크 (블룸 필터 양성일 때만 저장소 확인)"""
+        if self.seen_filter.is_seen(new_news):
+            return True
+        
+        # 다른 매체의 같은 기사 (유사 제목)
+        similar = self.title_index.find_similar(new_news.get('제목', ''))
+        if similar:
+            logging.debug(f"유사 제목 중복 ({similar[1]:.2f}): {new_news.get('제목', '')[:30]}")
+            return True
         return False
     
     def crawl_and_save_news(self) -> bool:
         """뉴스 크롤링 및 저장 (최종 통합 버전)"""
+        # 실행 마감 시간 (크롤링은 저장/업로드 시간을 남기고 중단)
+        deadline = RunDeadline(RUN_DEADLINE_SECONDS)
+        crawl_deadline = deadline.reserve(UPLOAD_RESERVE_SECONDS)
+        start_time = datetime.now()
+        success, news_count = False, 0
         try:
             print("교육 뉴스 크롤링 시작...")
-            start_time = datetime.now()
             
-            # 뉴스 크롤링
-            new_news_list = self.crawler.crawl_all_sources(NEWS_SOURCES)
+            # 이전 실행에서 전달하지 못한 행은 크롤링과 동시에 업로드
+            self.start_upload(deadline)
+            
+            # 뉴스 크롤링 (마감 시간이 지나면 수집한 만큼만 반환)
+            with profiler.stage('crawl'), resource_sampler.stage('crawl'):
+                if self.work_queue:
+                    new_news_list = crawl_with_queue(self.work_queue, self.crawler, NEWS_SOURCES,
+                                                     deadline=crawl_deadline, lease_seconds=WORK_QUEUE_LEASE_SECONDS)
+                else:
+                    new_news_list = self.crawler.crawl_all_sources(NEWS_SOURCES, deadline=crawl_deadline)
+            if crawl_deadline.expired():
+                print("크롤링 마감 시간 초과 - 수집된 뉴스만 저장합니다.")
             
             if not new_news_list:
                 print("크롤링된 뉴스가 없습니다.")
@@ -149,36 +221,59 @@ class FinalEducationNewsManager:
             
             # 중복 제거
             unique_new_news = []
-            for news in new_news_list:
-                if not self.is_duplicate(news):
-                    unique_new_news.append(news)
-                else:
-                    print(f"중복 제외: {news.get('제목', '')[:30]}...")
+            with profiler.stage('dedup'), resource_sampler.stage('dedup'):
+                for news in new_news_list:
+                    if not self.is_duplicate(news):
+                        unique_new_news.append(news)
+                        self.title_index.add(news.get('링크', ''), news.get('제목', ''))
+                    else:
+                        item_logger.debug("중복 제외: %.30s...", news.get('제목', ''), extra={'msg_type': 'duplicate'})
             
             print(f"중복 제거 후 새 뉴스: {len(unique_new_news)}개")
             
             if not unique_new_news:
                 print("새로운 뉴스가 없습니다.")
+                self.crawler.commit_fingerprints()  # 모두 이미 저장된 뉴스
+                success = True
                 return True
             
+            # 같은 사건 기사 묶음 지정 (같은 날 저장된 기사의 묶음 ID를 이어받음)
+            with profiler.stage('cluster'), resource_sampler.stage('cluster'):
+                grouped = self.story_clusterer.assign(
+                    unique_new_news,
+                    lambda day: self.search_index.search(since=day, until=day, limit=STORY_CLUSTER_MAX_DAY_RECORDS)
+                )
+            print(f"사건 묶음: 새 뉴스 {grouped}개가 다른 기사와 묶임")
+            
+            # 업로드 대기열에 먼저 넣음 (한 트랜잭션) - 대기열에 들어간 뒤에만 저장/수집 이력에 반영해
+            # 중간에 실패해도 다음 실행에서 다시 수집되어 최소 1회 전달이 유지된다
+            routed = self.subscriptions.route(unique_new_news) if len(self.subscriptions) else {}
+            if self.uploads_enabled:
+                added = self.outbox.enqueue_many(self.upload_batches(unique_new_news, routed))
+                print(f"업로드 대기열에 추가: {added}개")
+            
             # 기존 뉴스와 합치기 (새 뉴스가 뒤에 추가되어 자연스럽게 최신순)
             all_news = self.existing_news + unique_new_news
             
-            # 최대 100개 유지 (오래된 뉴스부터 제거)
-            all_news = all_news[-100:]
+            # 최근 뉴스만 유지 (전체 이력은 기사 이력 저장소에 보관)
+            all_news = all_news[-RECENT_NEWS_LIMIT:]
             
             # 기존 뉴스 업데이트
             self.existing_news = all_news
-            self.save_existing_news(all_news)
-            
-            # 구글 스프레드시트에 업로드
-            if self.sheets_manager:
-                print("Google Sheets 업로드 시작...")
-                success = self.upload_to_sheets(unique_new_news)
-                if success:
-                    print("Google Sheets 업로드 완료!")
-                else:
-                    print("Google Sheets 업로드 실패!")
+            with profiler.stage('save'), resource_sampler.stage('save'):
+                self.save_existing_news(all_news)
+                self.article_store.append(unique_new_news)
+                self.article_store.commit()
+                self.search_index.refresh()
+                self.search_index.commit()
+                self.seen_filter.add_news(unique_new_news)
+                self.crawler.commit_fingerprints()  # 저장이 끝난 뒤에만 '변경 없음' 판단에 사용
+            
+            self.notify_subscribers(routed)
+            
+            # 구글 스프레드시트 업로드는 대기열에서 백그라운드로 전달
+            if self.uploads_enabled:
+                self.start_upload(deadline)
             else:
                 print("Google Sheets가 연결되지 않았습니다.")
                 print("JSON 파일로만 저장됩니다.")
@@ -186,132 +281,247 @@ class FinalEducationNewsManager:
             # JSON 파일로도 저장 (백업)
             self.crawler.save_to_json(unique_new_news, 'education_news.json')
             
+            success, news_count = True, len(unique_new_news)
+            return True
+            
+        except Exception as e:
+            error_handler.handle_error(e, "뉴스 크롤링 및 저장 실패")
+            return False
+        finally:
+            self.finish_upload(deadline)
+            self.record_session(start_time, news_count, success)
+    
+    def record_session(self, start_time: datetime, news_count: int, success: bool):
+        """실행 결과 기록 및 알림 확인 (뉴스가 없거나 실패한 실행 포함)"""
+        try:
             # 성능 모니터링
             duration = (datetime.now() - start_time).total_seconds()
             performance_monitor.record_crawl_session(
                 source="all_sources",
-                news_count=len(unique_new_news),
+                news_count=news_count,
                 duration=duration,
-                success=True
+                success=success
             )
+            performance_monitor.save_metrics()
             
             # 알림 확인
             alerts = performance_monitor.check_alerts()
             if alerts:
                 for alert in alerts:
-                    notification_manager.send_console_alert(
+                    notification_manager.send_alert(
                         alert['message'], 
-                        alert['severity']
+                        alert['severity'],
+                        alert['type'],
+                        alert.get('id')
                     )
             
-            print(f"크롤링 완료 (소요시간: {duration:.1f}초)")
-            
-            return True
-            
+            print(f"크롤링 {'완료' if success else '실패'} (소요시간: {duration:.1f}초)")
         except Exception as e:
-            error_handler.handle_error(e, "뉴스 크롤링 및 저장 실패")
-            return False
+            error_handler.handle_error(e, "실행 기록 실패")
+    
+    def upload_batches(self, news_list: List[Dict], routed: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """워크시트 → 업로드할 기사 (기본 워크시트 + 구독 워크시트)"""
+        batches = {WORKSHEET_NAME: list(news_list)}
+        for name, matched in routed.items():
+            subscription = self.subscriptions.get(name)
+            if subscription.worksheet:
+                batches.setdefault(subscription.worksheet, []).extend(matched)
+        return batches
+    
+    def notify_subscribers(self, routed: Dict[str, List[Dict]]):
+        """구독별 일치 기사를 팀 수신자 메일로 전달 (발송 스레드가 모아서 한 번에 전송)"""
+        for name, matched in routed.items():
+            subscription = self.subscriptions.get(name)
+            if subscription.recipients:
+                # 팀 수신자에게 따로 보냄 (운영 알림 요약 메일과 같은 SMTP 연결)
+                subject, body = build_message(subscription, matched)
+                notification_manager.queue_email(subject, body, subscription.recipients)
+        if routed:
+            print(f"구독 매칭: {', '.join(f'{name} {len(matched)}건' for name, matched in routed.items())}")
+    
+    def start_upload(self, deadline: RunDeadline):
+        """업로드 대기열의 남은 행을 백그라운드 스레드에서 전달"""
+        if not self.sheets_manager or self.outbox.pending_count() == 0:
+            return
+        
+        def upload(news_list: List[Dict], worksheet: str) -> bool:
+            with profiler.stage('upload'), resource_sampler.stage('upload'):
+                return self.upload_to_sheets(news_list, deadline, worksheet)
+        
+        print(f"Google Sheets 업로드 시작 (대기 {self.outbox.pending_count()}개)...")
+        self.outbox.drain_async(upload)
+    
+    def finish_upload(self, deadline: RunDeadline):
+        """실행 마감 시간까지 업로드 완료 대기 (남은 행은 다음 실행에서 재시도)"""
+        remaining = deadline.remaining()
+        self.outbox.wait(None if remaining == float('inf') else remaining)
+        pending = self.outbox.pending_count()
+        if pending:
+            print(f"Google Sheets 미전달 {pending}개 - 다음 실행에서 재시도합니다.")
+        elif self.sheets_manager:
+            print("Google Sheets 업로드 완료!")
+        for worksheet, info in self.outbox.dead_letters().items():
+            print(f"Google Sheets 전달 불가 {info['count']}개 ({worksheet}): {info['last_error']}")
     
-    def upload_to_sheets(self, news_list: List[Dict]) -> bool:
-        """구글 스프레드시트에 데이터 업로드 (개선된 버전)"""
+    def upload_to_sheets(self, news_list: List[Dict], deadline: Optional[RunDeadline] = None,
+                         worksheet: str = WORKSHEET_NAME) -> bool:
+        """구글 스프레드시트에 데이터 업로드 (각 API 호출 전에 마감 시간 확인)
+        
+        같은 행을 다시 보내도 링크 키 기준으로 합쳐지므로 대기열 재전달에 안전하다.
+        분할이 켜져 있으면 크롤링 월별 워크시트 중 현재 워크시트만 읽고 쓴다.
+        """
+        deadline = deadline or RunDeadline()
         try:
             if not self.sheets_manager:
                 print("Google Sheets 매니저가 초기화되지 않았습니다.")
                 return False
-            
-            # 워크시트 생성 (이미 존재하면 무시)
-            self.sheets_manager.create_worksheet(WORKSHEET_NAME)
-            
-            # 기존 데이터 가져오기
-            existing_data = self.sheets_manager.get_worksheet_data(WORKSHEET_NAME)
-            
-            # 헤더 중복 방지: 기존 데이터가 없거나 헤더가 없을 때만 설정
-            if not existing_data or len(existing_data) == 0:
-                self.sheets_manager.setup_headers(WORKSHEET_NAME, COLUMNS)
-                print("헤더 설정 완료")
-                # 헤더 설정 후 다시 데이터 가져오기
-                existing_data = self.sheets_manager.get_worksheet_data(WORKSHEET_NAME)
+            self.sheets_manager.deadline = deadline  # 할당량 재시도 대기도 마감 시간 안에서만
             
             # 데이터를 DataFrame으로 변환
             import pandas as pd
             df = pd.DataFrame(news_list)
             
-            if not df.empty:
-                # 중복 제거 (제목 기준)
-                df = df.drop_duplicates(subset=['제목'], keep='last')
-                
-                # 날짜 형식만 정리 (정렬은 제거)
-                if '날짜' in df.columns:
-                    df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce')
-                    df['날짜'] = df['날짜'].dt.strftime('%Y-%m-%d')
-                
-                # 크롤링시간 정리
-                if '크롤링시간' in df.columns:
-                    df['크롤링시간'] = pd.to_datetime(df['크롤링시간']).dt.strftime('%Y-%m-%d %H:%M:%S')
-                
-                # 기존 데이터와 합치기
-                if existing_data and len(existing_data) > 1:
-                    # 기존 데이터를 DataFrame으로 변환 (헤더 제외)
-                    existing_df = pd.DataFrame(existing_data[1:], columns=existing_data[0])
-                    
-                    # 새 데이터와 기존 데이터 합치기
-                    combined_df = pd.concat([df, existing_df], ignore_index=True)
-                    
-                    # 중복 제거 (제목 기준, 새 데이터 우선)
-                    combined_df = combined_df.drop_duplicates(subset=['제목'], keep='first')
-                    
-                    # 날짜 형식만 정리 (정렬은 제거)
-                    if '날짜' in combined_df.columns:
-                        combined_df['날짜'] = pd.to_datetime(combined_df['날짜'], errors='coerce')
-                        combined_df['날짜'] = combined_df['날짜'].dt.strftime('%Y-%m-%d')
-                    
-                    # 전체 워크시트 교체 (헤더 + 데이터)
-                    success = self.sheets_manager.replace_worksheet_data(WORKSHEET_NAME, combined_df)
-                    print(f"전체 데이터 업데이트: {len(combined_df)}개 뉴스")
-                else:
-                    # 새 데이터만 추가
-                    success = self.sheets_manager.append_data(WORKSHEET_NAME, df)
-                    print(f"새 데이터 추가: {len(df)}개 뉴스")
-                
-                if success:
-                    print(f"구글 스프레드시트 업로드 완료")
-                    return True
-                else:
-                    print("구글 스프레드시트 업로드 실패")
-                    return False
-            else:
+            if df.empty:
                 print("업로드할 뉴스 데이터가 없습니다.")
                 return True
+            
+            # 시트 컬럼만 업로드 (묶음 ID 등 내부 필드 제외)
+            df = df[[column for column in COLUMNS if column in df.columns]]
+            
+            # 중복 제거 (제목 기준 + 정규화된 링크 키 기준)
+            df = df.drop_duplicates(subset=['제목'], keep='last')
+            if '링크' in df.columns:
+                df = df[~df['링크'].map(url_key).duplicated(keep='last')]
+            
+            # 날짜 형식만 정리 (정렬은 제거)
+            if '날짜' in df.columns:
+                df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce')
+                df['날짜'] = df['날짜'].dt.strftime('%Y-%m-%d')
+            
+            # 크롤링시간 정리
+            if '크롤링시간' in df.columns:
+                df['크롤링시간'] = pd.to_datetime(df['크롤링시간']).dt.strftime('%Y-%m-%d %H:%M:%S')
+            
+            if not SHEET_SHARD_BY_MONTH:
+                deadline.check('워크시트 확인')
+                self.sheets_manager.create_worksheet(worksheet)
+                return self._upload_worksheet(worksheet, df, deadline)[0]
+            
+            # 크롤링 월별로 나눠 해당 월의 현재 분할 워크시트에 업로드
+            if '크롤링시간' in df.columns:
+                periods = df['크롤링시간'].str[:7].fillna(datetime.now().strftime('%Y-%m'))
+            else:
+                periods = pd.Series(datetime.now().strftime('%Y-%m'), index=df.index)
+            for period, group in df.groupby(periods, sort=True):
+                deadline.check('분할 워크시트 확인')
+                shard = self.sheets_manager.current_shard(
+                    worksheet, period, COLUMNS, incoming_rows=len(group), max_rows=SHEET_SHARD_MAX_ROWS
+                )
+                success, row_count = self._upload_worksheet(shard, group, deadline)
+                if not success:
+                    return False
+                self.sheets_manager.record_shard_rows(worksheet, shard, row_count)
+            return True
                 
+        except DeadlineExceeded as e:
+            logging.warning(f"구글 스프레드시트 업로드 중단: {e}")
+            print(f"업로드 중단 ({e}) - 업로드 대기열에 남겨 다음 실행에서 재시도합니다.")
+            raise  # 업로드 대기열이 실패 횟수에 넣지 않도록 그대로 전달
         except Exception as e:
             error_handler.handle_error(e, "구글 스프레드시트 업로드 실패")
             print(f"업로드 중 오류 발생: {e}")
             return False
     
+    def _upload_worksheet(self, worksheet: str, df, deadline: RunDeadline) -> tuple:
+        """워크시트 하나에 새 데이터 합쳐 쓰기, (성공 여부, 데이터 행 수) 반환"""
+        import pandas as pd
+        
+        # 기존 데이터 가져오기
+        deadline.check('기존 데이터 조회')
+        existing_data = self.sheets_manager.get_worksheet_data(worksheet)
+        
+        # 헤더 중복 방지: 기존 데이터가 없거나 헤더가 없을 때만 설정
+        if not existing_data or len(existing_data) == 0:
+            self.sheets_manager.setup_headers(worksheet, COLUMNS)
+            print("헤더 설정 완료")
+            # 헤더 설정 후 다시 데이터 가져오기
+            existing_data = self.sheets_manager.get_worksheet_data(worksheet)
+        
+        # 기존 데이터와 합치기
+        if existing_data and len(existing_data) > 1:
+            # 기존 데이터를 DataFrame으로 변환 (헤더 제외)
+            existing_df = pd.DataFrame(existing_data[1:], columns=existing_data[0])
+            
+            # 새 데이터와 기존 데이터 합치기
+            combined_df = pd.concat([df, existing_df], ignore_index=True)
+            
+            # 중복 제거 (제목 기준 + 정규화된 링크 키 기준, 새 데이터 우선)
+            combined_df = combined_df.drop_duplicates(subset=['제목'], keep='first')
+            if '링크' in combined_df.columns:
+                combined_df = combined_df[~combined_df['링크'].fillna('').map(url_key).duplicated(keep='first')]
+            
+            # 날짜 형식만 정리 (정렬은 제거)
+            if '날짜' in combined_df.columns:
+                combined_df['날짜'] = pd.to_datetime(combined_df['날짜'], errors='coerce')
+                combined_df['날짜'] = combined_df['날짜'].dt.strftime('%Y-%m-%d')
+            
+            # 전체 워크시트 교체 (헤더 + 데이터)
+            deadline.check('데이터 업로드')
+            success = self.sheets_manager.replace_worksheet_data(worksheet, combined_df)
+            row_count = len(combined_df)
+            print(f"전체 데이터 업데이트 ({worksheet}): {row_count}개 뉴스")
+        else:
+            # 새 데이터만 추가
+            deadline.check('데이터 업로드')
+            success = self.sheets_manager.append_data(worksheet, df)
+            row_count = len(df)
+            print(f"새 데이터 추가 ({worksheet}): {row_count}개 뉴스")
+        
+        if success:
+            print(f"구글 스프레드시트 업로드 완료")
+        else:
+            print("구글 스프레드시트 업로드 실패")
+        return success, row_count
+    
     def get_system_status(self) -> Dict:
         """시스템 상태 조회"""
         return {
             'google_sheets_connected': self.sheets_manager is not None,
-            'existing_news_count': len(self.existing_news),
+            'existing_news_count': len(self.article_store),
+            'pending_uploads': self.outbox.pending_count(),
+            'dead_letter_uploads': self.outbox.dead_letters(),
             'performance_summary': performance_monitor.get_performance_summary(),
             'error_stats': error_handler.get_error_stats()
         }
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='교육 뉴스 크롤링')
+    parser.add_argument('--profile', action='store_true', help='단계/소스별 프로파일 저장')
+    parser.add_argument('--profile-dir', default=PROFILE_DIR)
+    parser.add_argument('--work-queue', default=None, metavar='DB',
+                        help='소스 작업을 공유 대기열로 분배 (다른 머신은 work_queue.py worker로 참여)')
+    args = parser.parse_args()
+    
     setup_logging()
+    if args.profile:
+        profiler.enable(args.profile_dir)
+    resource_sampler.start()
     print("최종 통합된 교육 뉴스 크롤링 프로그램")
     print("=" * 50)
     
     try:
         # 교육 뉴스 관리자 초기화
-        manager = FinalEducationNewsManager()
+        with profiler.stage('init'), resource_sampler.stage('init'):
+            manager = FinalEducationNewsManager(args.work_queue)
         
         # 시스템 상태 출력
         status = manager.get_system_status()
         print(f"시스템 상태:")
         print(f"   - Google Sheets: {'연결됨' if status['google_sheets_connected'] else '연결 안됨'}")
         print(f"   - 기존 뉴스: {status['existing_news_count']}개")
+        if status['pending_uploads']:
+            print(f"   - 업로드 대기: {status['pending_uploads']}개")
         
         # 뉴스 크롤링 및 저장
         success = manager.crawl_and_save_news()
@@ -332,6 +542,11 @@ def main():
     except Exception as e:
         error_handler.handle_error(e, "메인 프로그램 실행 실패")
         print(f"프로그램 실행 중 치명적 오류 발생: {e}")
+    finally:
+        notification_manager.close()
+        resource_sampler.stop()
+        performance_monitor.flush_history()
+        profiler.write_reports()
 
 if __name__ == "__main__":
     main()
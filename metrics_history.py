@@ -0,0 +1,251 @@
+# 실행 간 메트릭 이력 저장소 모듈 (SQLite, 1분/1시간/1일 롤업)
+import argparse
+import logging
+import math
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 롤업 해상도 (초)
+RESOLUTIONS = {
+    '1m': 60,
+    '1h': 3600,
+    '1d': 86400
+}
+
+# 보존 기간 (일, None이면 무기한)
+DEFAULT_RETENTION_DAYS = {
+    'raw': 35,
+    '1m': 7,
+    '1h': 90,
+    '1d': None
+}
+
+# (timestamp, metric, source, duration, success, value)
+Sample = Tuple[float, str, str, float, bool, int]
+
+
+class MetricsHistory:
+    """원본 샘플 + 자동 롤업을 저장하는 SQLite 시계열 저장소"""
+
+    def __init__(self, db_file: str = 'metrics_history.db',
+                 retention_days: Optional[Dict[str, Optional[int]]] = None):
+        self.db_file = db_file
+        self.retention_days = {**DEFAULT_RETENTION_DAYS, **(retention_days or {})}
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self._create_tables()
+
+    def _create_tables(self):
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS samples (
+                    ts REAL NOT NULL,
+                    metric TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    duration REAL NOT NULL,
+                    success INTEGER NOT NULL,
+                    value INTEGER NOT NULL
+                )""")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_samples ON samples (metric, source, ts)")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS rollups (
+                    resolution TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    metric TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    successes INTEGER NOT NULL,
+                    value_sum INTEGER NOT NULL,
+                    duration_sum REAL NOT NULL,
+                    duration_min REAL NOT NULL,
+                    duration_max REAL NOT NULL,
+                    PRIMARY KEY (resolution, metric, source, bucket)
+                )""")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS alert_state (
+                    alert_id TEXT PRIMARY KEY,
+                    last_sent REAL NOT NULL
+                )""")
+
+    def write_samples(self, samples: Iterable[Sample]):
+        """원본 샘플 저장 및 롤업 누적"""
+        samples = list(samples)
+        if not samples:
+            return
+        rows = [(ts, metric, source or '', duration, int(success), value)
+                for ts, metric, source, duration, success, value in samples]
+        rollup_rows = [
+            (resolution, int(ts // seconds) * seconds, metric, source,
+             1, success, value, duration, duration, duration)
+            for resolution, seconds in RESOLUTIONS.items()
+            for ts, metric, source, duration, success, value in rows
+        ]
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.conn.executemany("""
+                INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (resolution, metric, source, bucket) DO UPDATE SET
+                    count = count + excluded.count,
+                    successes = successes + excluded.successes,
+                    value_sum = value_sum + excluded.value_sum,
+                    duration_sum = duration_sum + excluded.duration_sum,
+                    duration_min = MIN(duration_min, excluded.duration_min),
+                    duration_max = MAX(duration_max, excluded.duration_max)
+            """, rollup_rows)
+
+    def apply_retention(self, now: Optional[float] = None):
+        """보존 기간이 지난 샘플/롤업 삭제"""
+        now = now or time.time()
+        with self.lock, self.conn:
+            raw_days = self.retention_days.get('raw')
+            if raw_days:
+                self.conn.execute("DELETE FROM samples WHERE ts < ?", (now - raw_days * 86400,))
+            for resolution in RESOLUTIONS:
+                days = self.retention_days.get(resolution)
+                if days:
+                    self.conn.execute(
+                        "DELETE FROM rollups WHERE resolution = ? AND bucket < ?",
+                        (resolution, now - days * 86400))
+
+    def query_rollups(self, metric: str, resolution: str = '1h', source: Optional[str] = None,
+                      since: Optional[float] = None) -> List[Dict]:
+        """롤업 조회 (source 생략 시 전체 소스 합산)"""
+        since = since or 0
+        with self.lock:
+            if source is None:
+                cursor = self.conn.execute("""
+                    SELECT bucket, SUM(count), SUM(successes), SUM(value_sum), SUM(duration_sum),
+                           MIN(duration_min), MAX(duration_max)
+                    FROM rollups WHERE resolution = ? AND metric = ? AND bucket >= ?
+                    GROUP BY bucket ORDER BY bucket""", (resolution, metric, since))
+            else:
+                cursor = self.conn.execute("""
+                    SELECT bucket, count, successes, value_sum, duration_sum, duration_min, duration_max
+                    FROM rollups WHERE resolution = ? AND metric = ? AND source = ? AND bucket >= ?
+                    ORDER BY bucket""", (resolution, metric, source, since))
+            rows = cursor.fetchall()
+        return [
+            {
+                'bucket': bucket, 'count': count, 'successes': successes, 'value_sum': value_sum,
+                'duration_sum': duration_sum, 'duration_min': duration_min, 'duration_max': duration_max
+            }
+            for bucket, count, successes, value_sum, duration_sum, duration_min, duration_max in rows
+        ]
+
+    def query_source_rollups(self, metric: str, resolution: str, since: float) -> List[Dict]:
+        """소스별 롤업 조회"""
+        with self.lock:
+            rows = self.conn.execute("""
+                SELECT bucket, source, count, successes, value_sum, duration_sum, duration_max
+                FROM rollups WHERE resolution = ? AND metric = ? AND bucket >= ?
+                ORDER BY bucket""", (resolution, metric, since)).fetchall()
+        return [
+            {
+                'bucket': bucket, 'source': source, 'count': count, 'successes': successes,
+                'value_sum': value_sum, 'duration_sum': duration_sum, 'duration_max': duration_max
+            }
+            for bucket, source, count, successes, value_sum, duration_sum, duration_max in rows
+        ]
+
+    def percentile(self, metric: str, percentile: float = 95, source: Optional[str] = None,
+                   days: float = 30) -> Optional[float]:
+        """원본 샘플 기준 소요시간 백분위수 (예: 최근 30일 경향신문 요청 p95)"""
+        since = time.time() - days * 86400
+        condition = "metric = ? AND ts >= ?" + (" AND source = ?" if source else "")
+        params = (metric, since) + ((source,) if source else ())
+        with self.lock:
+            count = self.conn.execute(f"SELECT COUNT(*) FROM samples WHERE {condition}", params).fetchone()[0]
+            if not count:
+                return None
+            rank = max(0, min(count - 1, math.ceil(percentile / 100 * count) - 1))  # nearest-rank
+            row = self.conn.execute(
+                f"SELECT duration FROM samples WHERE {condition} ORDER BY duration LIMIT 1 OFFSET ?",
+                params + (rank,)).fetchone()
+        return row[0] if row else None
+
+    def average_duration(self, metric: str, source: Optional[str], since: float,
+                         until: Optional[float] = None) -> Tuple[int, float]:
+        """기간 내 (건수, 평균 소요시간) - 1시간 롤업 기준"""
+        until = until or time.time()
+        condition = "resolution = '1h' AND metric = ? AND bucket >= ? AND bucket < ?"
+        params = (metric, since, until)
+        if source:
+            condition += " AND source = ?"
+            params += (source,)
+        with self.lock:
+            count, duration_sum = self.conn.execute(
+                f"SELECT COALESCE(SUM(count), 0), COALESCE(SUM(duration_sum), 0) FROM rollups WHERE {condition}",
+                params).fetchone()
+        return count, (duration_sum / count if count else 0.0)
+
+    def load_alert_state(self, since: float) -> Dict[str, float]:
+        """알림 ID → 마지막 발송 시각 (since 이후 발송분, 그 이전 기록은 삭제)"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM alert_state WHERE last_sent < ?", (since,))
+            rows = self.conn.execute("SELECT alert_id, last_sent FROM alert_state").fetchall()
+        return dict(rows)
+
+    def save_alert_state(self, last_sent: Dict[str, float]):
+        """알림 마지막 발송 시각 기록"""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO alert_state VALUES (?, ?) "
+                "ON CONFLICT (alert_id) DO UPDATE SET last_sent = excluded.last_sent",
+                list(last_sent.items()))
+
+    def sources(self, metric: str) -> List[str]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT DISTINCT source FROM rollups WHERE resolution = '1d' AND metric = ?", (metric,)).fetchall()
+        return sorted(row[0] for row in rows if row[0])
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def main():
+    """메트릭 이력 조회 명령"""
+    parser = argparse.ArgumentParser(description='메트릭 이력 조회')
+    parser.add_argument('--db', default='metrics_history.db')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    p_percentile = subparsers.add_parser('percentile', help='소요시간 백분위수')
+    p_percentile.add_argument('metric', help='request, crawl_session 등')
+    p_percentile.add_argument('--source', default=None)
+    p_percentile.add_argument('--pct', type=float, default=95)
+    p_percentile.add_argument('--days', type=float, default=30)
+
+    p_rollups = subparsers.add_parser('rollups', help='롤업 조회')
+    p_rollups.add_argument('metric')
+    p_rollups.add_argument('--source', default=None)
+    p_rollups.add_argument('--resolution', choices=list(RESOLUTIONS), default='1d')
+    p_rollups.add_argument('--days', type=float, default=30)
+
+    args = parser.parse_args()
+    history = MetricsHistory(args.db)
+    try:
+        if args.command == 'percentile':
+            value = history.percentile(args.metric, args.pct, args.source, args.days)
+            label = args.source or '전체'
+            print(f"{label} {args.metric} p{args.pct:g} (최근 {args.days:g}일): "
+                  f"{'데이터 없음' if value is None else f'{value:.3f}초'}")
+        else:
+            since = time.time() - args.days * 86400
+            for row in history.query_rollups(args.metric, args.resolution, args.source, since):
+                avg = row['duration_sum'] / row['count'] if row['count'] else 0
+                print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(row['bucket']))}  "
+                      f"건수 {row['count']:>5}  성공 {row['successes']:>5}  "
+                      f"평균 {avg:.3f}초  최대 {row['duration_max']:.3f}초")
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
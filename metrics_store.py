@@ -0,0 +1,133 @@
+# 시간 버킷 링 버퍼 메트릭 저장소 모듈
+import threading
+import time
+from array import array
+from typing import Dict, Optional, Tuple
+
+# 전체 소스 합계 시리즈 이름
+ALL_SOURCES = '*'
+
+
+def make_summary(count: int = 0, successes: int = 0, values: int = 0,
+                 duration_sum: float = 0.0, duration_max: float = 0.0) -> Dict:
+    """요약 딕셔너리 생성"""
+    return {
+        'count': count,
+        'successes': successes,
+        'value_sum': values,
+        'duration_sum': duration_sum,
+        'duration_max': duration_max,
+        'avg_duration': duration_sum / count if count else 0.0
+    }
+
+
+class RingBufferSeries:
+    """고정 크기 시간 버킷 링 버퍼 (기록 O(1), 요약 O(버킷 수))"""
+
+    def __init__(self, num_buckets: int = 1440, bucket_seconds: int = 60):
+        self.num_buckets = num_buckets
+        self.bucket_seconds = bucket_seconds
+        # 각 슬롯이 어느 시간 버킷인지 (-1: 비어 있음)
+        self.epochs = array('q', [-1]) * num_buckets
+        self.counts = array('q', [0]) * num_buckets
+        self.successes = array('q', [0]) * num_buckets
+        self.values = array('q', [0]) * num_buckets
+        self.duration_sums = array('d', [0.0]) * num_buckets
+        self.duration_max = array('d', [0.0]) * num_buckets
+
+    def record(self, duration: float = 0.0, success: bool = True, value: int = 0,
+               timestamp: Optional[float] = None):
+        """현재 버킷에 값 누적 (오래된 슬롯은 덮어씀)"""
+        epoch = int((timestamp or time.time()) // self.bucket_seconds)
+        slot = epoch % self.num_buckets
+        if self.epochs[slot] != epoch:
+            self.epochs[slot] = epoch
+            self.counts[slot] = self.successes[slot] = self.values[slot] = 0
+            self.duration_sums[slot] = self.duration_max[slot] = 0.0
+
+        self.counts[slot] += 1
+        self.successes[slot] += 1 if success else 0
+        self.values[slot] += value
+        self.duration_sums[slot] += duration
+        if duration > self.duration_max[slot]:
+            self.duration_max[slot] = duration
+
+    def merge_bucket(self, timestamp: float, count: int, successes: int, value: int,
+                     duration_sum: float, duration_max: float):
+        """이미 집계된 버킷 값 합치기 (저장된 이력 복원용)"""
+        epoch = int(timestamp // self.bucket_seconds)
+        slot = epoch % self.num_buckets
+        if self.epochs[slot] != epoch:
+            if self.epochs[slot] > epoch:
+                return  # 링 버퍼 범위를 벗어난 오래된 버킷
+            self.epochs[slot] = epoch
+            self.counts[slot] = self.successes[slot] = self.values[slot] = 0
+            self.duration_sums[slot] = self.duration_max[slot] = 0.0
+
+        self.counts[slot] += count
+        self.successes[slot] += successes
+        self.values[slot] += value
+        self.duration_sums[slot] += duration_sum
+        if duration_max > self.duration_max[slot]:
+            self.duration_max[slot] = duration_max
+
+    def summarize(self, window_seconds: int, now: Optional[float] = None) -> Dict:
+        """최근 window_seconds 동안의 합계"""
+        current = int((now or time.time()) // self.bucket_seconds)
+        oldest = current - min(self.num_buckets, -(-window_seconds // self.bucket_seconds)) + 1
+        count = successes = values = 0
+        duration_sum = duration_max = 0.0
+        for slot in range(self.num_buckets):
+            if oldest <= self.epochs[slot] <= current:
+                count += self.counts[slot]
+                successes += self.successes[slot]
+                values += self.values[slot]
+                duration_sum += self.duration_sums[slot]
+                duration_max = max(duration_max, self.duration_max[slot])
+        return make_summary(count, successes, values, duration_sum, duration_max)
+
+
+class MetricsStore:
+    """메트릭 이름/소스별 링 버퍼 모음 (소스 합계 시리즈를 함께 갱신)"""
+
+    def __init__(self, num_buckets: int = 1440, bucket_seconds: int = 60):
+        self.num_buckets = num_buckets
+        self.bucket_seconds = bucket_seconds
+        self.series: Dict[Tuple[str, str], RingBufferSeries] = {}
+        self.lock = threading.Lock()
+
+    def _get_series(self, name: str, source: str) -> RingBufferSeries:
+        key = (name, source)
+        if key not in self.series:
+            self.series[key] = RingBufferSeries(self.num_buckets, self.bucket_seconds)
+        return self.series[key]
+
+    def record(self, name: str, source: str = '', duration: float = 0.0,
+               success: bool = True, value: int = 0, timestamp: Optional[float] = None):
+        """메트릭 기록"""
+        timestamp = timestamp or time.time()
+        with self.lock:
+            self._get_series(name, ALL_SOURCES).record(duration, success, value, timestamp)
+            if source and source != ALL_SOURCES:
+                self._get_series(name, source).record(duration, success, value, timestamp)
+
+    def merge_bucket(self, name: str, source: str, timestamp: float, count: int, successes: int,
+                     value: int, duration_sum: float, duration_max: float):
+        """집계된 버킷 합치기 (소스 합계 시리즈 포함)"""
+        with self.lock:
+            targets = [ALL_SOURCES] + ([source] if source and source != ALL_SOURCES else [])
+            for target in targets:
+                self._get_series(name, target).merge_bucket(
+                    timestamp, count, successes, value, duration_sum, duration_max)
+
+    def summarize(self, name: str, window_seconds: int, source: str = ALL_SOURCES) -> Dict:
+        """메트릭 요약 (source 생략 시 전체 합계)"""
+        with self.lock:
+            series = self.series.get((name, source or ALL_SOURCES))
+            return series.summarize(window_seconds) if series else make_summary()
+
+    def sources(self, name: str):
+        """메트릭이 기록된 소스 목록"""
+        with self.lock:
+            return sorted(source for metric, source in self.series
+                          if metric == name and source != ALL_SOURCES)
@@ -4,11 +4,21 @@ import json
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, List, Optional
 import os
 from dataclasses import dataclass
 from typing import Any
+from collections import deque
+import time
+import queue
+import threading
+from metrics_store import MetricsStore
+from metrics_history import MetricsHistory
+from config import METRICS_HISTORY_FILE, METRICS_RETENTION_DAYS, ALERT_DEDUP_SECONDS, ALERT_FLUSH_SECONDS
+
+SMTP_TIMEOUT = 30  # SMTP 연결/명령 제한 시간 (초)
+SEVERITY_ORDER = {'info': 0, 'warning': 1, 'critical': 2}
 
 @dataclass
 class AlertThreshold:
@@ -17,17 +27,29 @@ class AlertThreshold:
     max_response_time: float = 30.0  # 초
     min_success_rate: float = 0.8  # 80%
     max_memory_usage: float = 0.9  # 90%
+    degradation_ratio: float = 2.0  # 최근 24시간 평균이 30일 평균의 몇 배 이상이면 알림
 
 class PerformanceMonitor:
     """성능 모니터링 클래스"""
     
-    def __init__(self, config_file: str = 'monitor_config.json'):
+    def __init__(self, config_file: str = 'monitor_config.json', max_detail_records: int = 1000,
+                 history_file: Optional[str] = METRICS_HISTORY_FILE):
         self.config_file = config_file
+        self.history_file = history_file
+        # 최근 상세 기록 (저장/디버깅용, 개수 제한)
         self.metrics = {
-            'crawl_sessions': [],
-            'error_logs': [],
-            'performance_data': []
+            'crawl_sessions': deque(maxlen=max_detail_records),
+            'error_logs': deque(maxlen=max_detail_records),
+            'performance_data': deque(maxlen=max_detail_records),
+            'resource_usage': deque(maxlen=max_detail_records)
         }
+        self.peak_memory_percent = 0.0  # 이번 실행의 최대 메모리 사용률 (%)
+        # 분 단위 버킷 집계 (최근 24시간)
+        self.store = MetricsStore(num_buckets=24 * 60, bucket_seconds=60)
+        # 실행 간 이력 (처음 필요할 때 열고 최근 24시간을 링 버퍼로 복원)
+        self._history = None
+        self.history_loaded = False
+        self.pending_samples = []
         self.thresholds = AlertThreshold()
         self.load_config()
     
@@ -41,6 +63,50 @@ class PerformanceMonitor:
             except Exception as e:
                 logging.warning(f"모니터링 설정 로드 실패: {e}")
     
+    @property
+    def history(self) -> Optional[MetricsHistory]:
+        """메트릭 이력 저장소 (지연 로드)"""
+        if not self.history_loaded:
+            self.history_loaded = True
+            if self.history_file:
+                try:
+                    self._history = MetricsHistory(self.history_file, METRICS_RETENTION_DAYS)
+                    self._restore_recent()
+                except Exception as e:
+                    logging.warning(f"메트릭 이력 로드 실패: {e}")
+                    self._history = None
+        return self._history
+    
+    def _restore_recent(self):
+        """최근 24시간 1분 롤업을 링 버퍼에 복원"""
+        since = time.time() - 24 * 3600
+        for metric in ('crawl_session', 'error', 'request', 'resource', 'sheets_request'):
+            for row in self._history.query_source_rollups(metric, '1m', since):
+                self.store.merge_bucket(
+                    metric, row['source'], row['bucket'], row['count'], row['successes'],
+                    row['value_sum'], row['duration_sum'], row['duration_max']
+                )
+    
+    def _record(self, metric: str, source: str, duration: float = 0.0,
+                success: bool = True, value: int = 0):
+        """링 버퍼 기록 + 이력 저장 대기열 추가"""
+        timestamp = time.time()
+        self.store.record(metric, source, duration=duration, success=success,
+                          value=value, timestamp=timestamp)
+        self.pending_samples.append((timestamp, metric, source, duration, success, value))
+    
+    def flush_history(self):
+        """대기 중인 샘플을 이력 저장소에 기록하고 보존 기간 적용"""
+        history = self.history
+        if history is None:
+            return
+        samples, self.pending_samples = self.pending_samples, []
+        try:
+            history.write_samples(samples)
+            history.apply_retention()
+        except Exception as e:
+            logging.error(f"메트릭 이력 저장 실패: {e}")
+    
     def record_crawl_session(self, source: str, news_count: int, 
                            duration: float, success: bool, errors: List[str] = None):
         """크롤링 세션 기록"""
@@ -54,13 +120,8 @@ class PerformanceMonitor:
         }
         
         self.metrics['crawl_sessions'].append(session_data)
-        
-        # 최근 24시간 데이터만 유지
-        cutoff_time = datetime.now() - timedelta(hours=24)
-        self.metrics['crawl_sessions'] = [
-            session for session in self.metrics['crawl_sessions']
-            if datetime.fromisoformat(session['timestamp']) > cutoff_time
-        ]
+        self._record('crawl_session', source, duration=duration,
+                     success=success, value=news_count)
     
     def record_error(self, error_type: str, message: str, source: str = ""):
         """에러 기록"""
@@ -72,58 +133,69 @@ class PerformanceMonitor:
         }
         
         self.metrics['error_logs'].append(error_data)
-        
-        # 최근 24시간 데이터만 유지
-        cutoff_time = datetime.now() - timedelta(hours=24)
-        self.metrics['error_logs'] = [
-            error for error in self.metrics['error_logs']
-            if datetime.fromisoformat(error['timestamp']) > cutoff_time
-        ]
+        self._record('error', source, success=False)
+    
+    def record_request(self, source: str, url: str, duration: float,
+                       success: bool, status_code: Optional[int] = None, size: int = 0):
+        """HTTP 요청 기록"""
+        self.metrics['performance_data'].append({
+            'timestamp': datetime.now().isoformat(),
+            'source': source,
+            'url': url,
+            'duration': duration,
+            'success': success,
+            'status_code': status_code,
+            'size': size
+        })
+        self._record('request', source, duration=duration, success=success, value=size)
+    
+    def record_sheets_request(self, kind: str, duration: float, success: bool, throttle_wait: float = 0.0):
+        """Google Sheets API 호출 기록 (값은 할당량 대기 시간 ms)"""
+        self._record('sheets_request', f"sheets:{kind}", duration=duration,
+                     success=success, value=int(throttle_wait * 1000))
+    
+    def record_resources(self, usage: Dict):
+        """단계별 자원 사용량 기록 (CPU 시간, 최대 RSS)"""
+        self.metrics['resource_usage'].append({'timestamp': datetime.now().isoformat(), **usage})
+        self._record('resource', usage['stage'], duration=usage['cpu_seconds'],
+                     value=usage['peak_rss'])
+        self.peak_memory_percent = max(self.peak_memory_percent, usage['peak_memory_percent'])
     
     def get_performance_summary(self) -> Dict[str, Any]:
         """성능 요약 정보"""
         now = datetime.now()
-        last_hour = now - timedelta(hours=1)
-        last_24h = now - timedelta(hours=24)
+        self.history  # 이전 실행 기록 복원
         
-        # 최근 1시간 에러 수
-        recent_errors = [
-            error for error in self.metrics['error_logs']
-            if datetime.fromisoformat(error['timestamp']) > last_hour
-        ]
+        # 최근 1시간 에러 수, 최근 24시간 세션 통계
+        recent_errors = self.store.summarize('error', 3600)['count']
+        sessions = self.store.summarize('crawl_session', 24 * 3600)
         
-        # 최근 24시간 세션 통계
-        recent_sessions = [
-            session for session in self.metrics['crawl_sessions']
-            if datetime.fromisoformat(session['timestamp']) > last_24h
-        ]
-        
-        if not recent_sessions:
+        if not sessions['count']:
             return {
                 'status': 'no_data',
                 'message': '최근 24시간 동안 크롤링 데이터가 없습니다.'
             }
         
-        # 성공률 계산
-        successful_sessions = [s for s in recent_sessions if s['success']]
-        success_rate = len(successful_sessions) / len(recent_sessions) if recent_sessions else 0
-        
-        # 평균 응답 시간
-        avg_duration = sum(s['duration'] for s in recent_sessions) / len(recent_sessions)
-        
-        # 총 뉴스 수집 수
-        total_news = sum(s['news_count'] for s in recent_sessions)
+        success_rate = sessions['successes'] / sessions['count']
+        avg_duration = sessions['avg_duration']
         
         return {
-            'status': 'healthy' if self._is_healthy(success_rate, len(recent_errors), avg_duration) else 'warning',
+            'status': 'healthy' if self._is_healthy(success_rate, recent_errors, avg_duration) else 'warning',
             'success_rate': success_rate,
             'avg_response_time': avg_duration,
-            'total_news_collected': total_news,
-            'recent_errors': len(recent_errors),
-            'sessions_count': len(recent_sessions),
+            'total_news_collected': sessions['value_sum'],
+            'recent_errors': recent_errors,
+            'sessions_count': sessions['count'],
             'last_update': now.isoformat()
         }
     
+    def get_source_summary(self, metric: str = 'request', window_seconds: int = 3600) -> Dict[str, Dict]:
+        """소스별 메트릭 요약"""
+        return {
+            source: self.store.summarize(metric, window_seconds, source)
+            for source in self.store.sources(metric)
+        }
+    
     def _is_healthy(self, success_rate: float, error_count: int, avg_duration: float) -> bool:
         """시스템 상태 판단"""
         return (
@@ -133,11 +205,11 @@ class PerformanceMonitor:
         )
     
     def check_alerts(self) -> List[Dict[str, str]]:
-        """알림 확인"""
+        """알림 확인 ('id'가 없는 알림은 유형이 곧 알림 ID)"""
         alerts = []
         summary = self.get_performance_summary()
         
-        if summary['status'] != 'healthy':
+        if summary['status'] == 'warning':
             if summary['success_rate'] < self.thresholds.min_success_rate:
                 alerts.append({
                     'type': 'low_success_rate',
@@ -159,51 +231,264 @@ class PerformanceMonitor:
                     'severity': 'warning'
                 })
         
+        if self.peak_memory_percent / 100 > self.thresholds.max_memory_usage:
+            alerts.append({
+                'type': 'high_memory_usage',
+                'message': f"메모리 사용률이 높습니다: {self.peak_memory_percent:.1f}%",
+                'severity': 'critical'
+            })
+        
+        alerts.extend(self.check_degradation())
+        return alerts
+    
+    def check_degradation(self) -> List[Dict[str, str]]:
+        """소스별 요청 시간 추세 확인 (최근 24시간 vs 이전 30일)"""
+        alerts = []
+        history = self.history
+        if history is None:
+            return alerts
+        
+        now = time.time()
+        recent_since = now - 24 * 3600
+        for source in history.sources('request'):
+            recent_count, recent_avg = history.average_duration('request', source, recent_since, now)
+            base_count, base_avg = history.average_duration('request', source, now - 30 * 86400, recent_since)
+            if recent_count >= 3 and base_count >= 10 and base_avg > 0 and \
+                    recent_avg >= base_avg * self.thresholds.degradation_ratio:
+                alerts.append({
+                    'type': 'slow_degradation',
+                    'id': f"slow_degradation:{source}",
+                    'message': f"{source} 요청 시간이 느려졌습니다: {recent_avg:.2f}초 (30일 평균 {base_avg:.2f}초)",
+                    'severity': 'warning'
+                })
         return alerts
     
     def save_metrics(self, filename: str = 'performance_metrics.json'):
-        """메트릭 저장"""
+        """메트릭 저장 (이력 저장소 반영 포함)"""
+        self.flush_history()
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.metrics, f, ensure_ascii=False, indent=2)
+                json.dump({key: list(values) for key, values in self.metrics.items()},
+                          f, ensure_ascii=False, indent=2)
         except Exception as e:
             logging.error(f"메트릭 저장 실패: {e}")
 
+class AlertDispatcher:
+    """백그라운드 알림 발송기
+    
+    알림을 큐에 넣기만 하고 바로 반환한다. 발송 스레드는 flush_interval마다
+    모인 알림을 하나의 요약 메일로 묶고, 그동안 등록된 개별 메일(구독 메일 등)과 함께
+    SMTP 연결 한 번으로 보낸다. 같은 알림 ID(유형 + 소스)가 dedup_window 안에 반복되면
+    건수만 센다. 마지막 발송 시각은 메트릭 이력 DB에 남겨 다음 실행에서도 적용한다.
+    """
+    
+    def __init__(self, email_config: Optional[Dict] = None, dedup_window: float = ALERT_DEDUP_SECONDS,
+                 flush_interval: float = ALERT_FLUSH_SECONDS, max_queue: int = 1000,
+                 history_file: Optional[str] = METRICS_HISTORY_FILE):
+        self.email_config = email_config or {}
+        self.dedup_window = dedup_window
+        self.flush_interval = flush_interval
+        self.history_file = history_file
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.last_sent: Dict[str, float] = {}  # 알림 ID → 마지막 발송 시각 (epoch)
+        self.suppressed: Dict[str, int] = {}   # 알림 ID → 중복으로 생략된 건수
+        self.dropped = 0
+        self.thread = None
+        self.lock = threading.Lock()
+    
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='alert-dispatcher', daemon=True)
+                self.thread.start()
+    
+    def submit(self, message: str, severity: str = 'info', alert_type: str = '',
+               alert_id: Optional[str] = None):
+        """알림 등록 (블로킹 없음, 큐가 가득 차면 버리고 건수만 기록)
+        
+        alert_id는 같은 알림인지 판단하는 고정 ID로, 생략하면 유형(유형도 없으면 메시지)을 쓴다.
+        """
+        self.start()
+        try:
+            self.queue.put_nowait({
+                'timestamp': datetime.now(),
+                'id': alert_id or alert_type or message,
+                'type': alert_type,
+                'message': message,
+                'severity': severity
+            })
+        except queue.Full:
+            self.dropped += 1
+    
+    def submit_mail(self, subject: str, body: str, recipients: List[str]):
+        """개별 메일 등록 (다음 발송 때 요약 메일과 같은 연결로 전송)"""
+        self.start()
+        try:
+            self.queue.put_nowait({'mail': (subject, body, list(recipients))})
+        except queue.Full:
+            self.dropped += 1
+    
+    def _run(self):
+        history = self._open_history()
+        pending, mails = [], []
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                alert = self.queue.get(timeout=max(0.0, next_flush - time.monotonic()))
+            except queue.Empty:
+                alert = None
+            
+            stopping = alert is _STOP
+            if alert is not None and not stopping:
+                if 'mail' in alert:
+                    mails.append(alert['mail'])
+                else:
+                    self._add(pending, alert)
+            if stopping or time.monotonic() >= next_flush:
+                if pending or mails or self.dropped:
+                    self.flush(pending, mails)
+                    if pending and history is not None:
+                        self._save_state(history, pending)
+                    pending, mails = [], []
+                next_flush = time.monotonic() + self.flush_interval
+            if stopping:
+                if history is not None:
+                    history.close()
+                return
+    
+    def _open_history(self):
+        """메트릭 이력 DB를 열고 지난 실행의 알림 발송 시각 복원 (실패하면 이번 실행 안에서만 중복 제거)"""
+        if not self.history_file:
+            return None
+        try:
+            history = MetricsHistory(self.history_file)
+            for alert_id, sent_at in history.load_alert_state(time.time() - self.dedup_window).items():
+                self.last_sent[alert_id] = max(sent_at, self.last_sent.get(alert_id, 0.0))
+            return history
+        except Exception as e:
+            logging.warning(f"알림 발송 기록 로드 실패: {e}")
+            return None
+    
+    def _save_state(self, history: MetricsHistory, pending: List[Dict]):
+        try:
+            history.save_alert_state({item['id']: self.last_sent[item['id']] for item in pending})
+        except Exception as e:
+            logging.warning(f"알림 발송 기록 저장 실패: {e}")
+    
+    def _add(self, pending: List[Dict], alert: Dict):
+        """중복 알림은 건수만 증가 (같은 ID면 수치가 달라도 같은 알림, 메시지는 최신 값)"""
+        key = alert['id']
+        for item in pending:
+            if item['id'] == key:
+                item['count'] += 1
+                item['message'] = alert['message']
+                item['severity'] = max(item['severity'], alert['severity'], key=SEVERITY_ORDER.get)
+                return
+        if time.time() - self.last_sent.get(key, 0.0) < self.dedup_window:
+            self.suppressed[key] = self.suppressed.get(key, 0) + 1
+            return
+        pending.append({**alert, 'count': 1 + self.suppressed.pop(key, 0)})
+    
+    def build_digest(self, pending: List[Dict]) -> tuple:
+        """요약 메일 제목/본문"""
+        critical = sum(1 for item in pending if item['severity'] == 'critical')
+        subject = f"[교육 뉴스 크롤러] 알림 {len(pending)}건" + (f" (심각 {critical}건)" if critical else "")
+        lines = []
+        for item in sorted(pending, key=lambda i: (i['severity'] != 'critical', i['timestamp'])):
+            repeat = f" (x{item['count']})" if item['count'] > 1 else ""
+            lines.append(f"[{item['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}] "
+                         f"{item['severity'].upper()}: {item['message']}{repeat}")
+        if self.dropped:
+            lines.append(f"(알림 큐 초과로 {self.dropped}건 누락)")
+        return subject, '\n'.join(lines)
+    
+    def flush(self, pending: List[Dict], mails: Optional[List[tuple]] = None):
+        """모인 알림 요약 메일 한 통과 개별 메일을 한 번에 발송"""
+        messages = list(mails or [])
+        enabled = self.email_config.get('enabled', False)
+        if pending or self.dropped:
+            subject, body = self.build_digest(pending)
+            recipients = self.email_config.get('recipients', [])
+            if enabled and recipients:
+                messages.insert(0, (subject, body, recipients))
+            else:
+                logging.info(f"알림 요약 ({subject}):\n{body}")
+        if messages:
+            if enabled:
+                self.send_messages(messages)
+            else:
+                logging.info(f"이메일 알림이 비활성화되어 있어 메일 {len(messages)}건을 보내지 않습니다.")
+        now = time.time()
+        for item in pending:
+            self.last_sent[item['id']] = now
+        self.dropped = 0
+    
+    def send_messages(self, messages: List[tuple], recipients: Optional[List[str]] = None) -> bool:
+        """SMTP 연결 한 번으로 여러 메일 발송 (메일별 수신자는 (제목, 본문, 수신자)로 지정)"""
+        config = self.email_config
+        try:
+            with smtplib.SMTP(config['smtp_server'], config['smtp_port'], timeout=SMTP_TIMEOUT) as server:
+                if config.get('use_tls', True):
+                    server.starttls()
+                if config.get('password'):
+                    server.login(config['sender_email'], config['password'])
+                for message in messages:
+                    subject, body = message[:2]
+                    to = message[2] if len(message) > 2 else recipients
+                    msg = MIMEMultipart()
+                    msg['From'] = config['sender_email']
+                    msg['To'] = ', '.join(to)
+                    msg['Subject'] = subject
+                    msg.attach(MIMEText(body, 'plain', 'utf-8'))
+                    server.sendmail(config['sender_email'], to, msg.as_string())
+            logging.info(f"이메일 알림 전송 완료: {len(messages)}건")
+            return True
+        except Exception as e:
+            logging.error(f"이메일 알림 전송 실패: {e}")
+            return False
+    
+    def close(self, timeout: float = SMTP_TIMEOUT * 2):
+        """남은 알림 발송 후 종료 (진행 중인 SMTP 전송이 끝날 수 있도록 SMTP 제한 시간 이상 대기)"""
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is not None:
+            self.queue.put(_STOP)
+            thread.join(timeout)
+
+# 발송 스레드 종료 신호
+_STOP = object()
+
 class NotificationManager:
     """알림 관리 클래스"""
     
     def __init__(self, email_config: Optional[Dict] = None):
         self.email_config = email_config or {}
-        self.notification_history = []
+        self.notification_history = deque(maxlen=100)  # 최근 100개 알림만 유지
+        self.dispatcher = AlertDispatcher(self.email_config)
+    
+    def send_alert(self, message: str, severity: str = 'info', alert_type: str = '',
+                   alert_id: Optional[str] = None):
+        """알림 (콘솔 출력 + 기록 + 백그라운드 요약 메일)"""
+        self.send_console_alert(message, severity)
+        self.log_notification(message, severity)
+        self.dispatcher.submit(message, severity, alert_type, alert_id)
     
     def send_email_alert(self, subject: str, message: str, recipients: List[str]):
-        """이메일 알림 전송"""
+        """이메일 알림 즉시 전송"""
         if not self.email_config.get('enabled', False):
             logging.info("이메일 알림이 비활성화되어 있습니다.")
             return False
         
-        try:
-            msg = MIMEMultipart()
-            msg['From'] = self.email_config['sender_email']
-            msg['To'] = ', '.join(recipients)
-            msg['Subject'] = subject
-            
-            msg.attach(MIMEText(message, 'plain', 'utf-8'))
-            
-            server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
-            server.starttls()
-            server.login(self.email_config['sender_email'], self.email_config['password'])
-            
-            text = msg.as_string()
-            server.sendmail(self.email_config['sender_email'], recipients, text)
-            server.quit()
-            
-            logging.info(f"이메일 알림 전송 완료: {subject}")
-            return True
-            
-        except Exception as e:
-            logging.error(f"이메일 알림 전송 실패: {e}")
+        return self.dispatcher.send_messages([(subject, message)], recipients)
+    
+    def queue_email(self, subject: str, message: str, recipients: List[str]) -> bool:
+        """이메일을 발송 스레드에 등록 (알림 요약 메일과 함께 묶어 전송)"""
+        if not self.email_config.get('enabled', False):
+            logging.info("이메일 알림이 비활성화되어 있습니다.")
             return False
+        
+        self.dispatcher.submit_mail(subject, message, recipients)
+        return True
     
     def send_console_alert(self, message: str, severity: str = 'info'):
         """콘솔 알림"""
@@ -218,21 +503,29 @@ class NotificationManager:
     
     def log_notification(self, message: str, severity: str = 'info'):
         """알림 기록"""
-        notification = {
+        self.notification_history.append({
             'timestamp': datetime.now().isoformat(),
             'message': message,
             'severity': severity
-        }
-        
-        self.notification_history.append(notification)
-        
-        # 최근 100개 알림만 유지
-        if len(self.notification_history) > 100:
-            self.notification_history = self.notification_history[-100:]
+        })
+    
+    def close(self):
+        """대기 중인 알림 발송"""
+        self.dispatcher.close()
+
+def load_email_config(config_file: str = 'monitor_config.json') -> Dict:
+    """모니터링 설정 파일의 이메일 설정"""
+    if os.path.exists(config_file):
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get('email', {})
+        except Exception as e:
+            logging.warning(f"이메일 설정 로드 실패: {e}")
+    return {}
 
 # 전역 모니터링 인스턴스
 performance_monitor = PerformanceMonitor()
-notification_manager = NotificationManager()
+notification_manager = NotificationManager(load_email_config())
 
 def monitor_crawl_performance(func):
     """크롤링 성능 모니터링 데코레이터"""
@@ -4,34 +4,73 @@ from bs4 import BeautifulSoup
 from datetime import datetime
 import time
 import re
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
 import logging
+import os
 from smart_filter import SmartNewsFilter
 from error_handler import error_handler, log_performance
+from title_tokenizer import TitleShingleIndex, default_tokenizer, jaccard
+from page_fingerprint import PageFingerprintStore
+from page_archive import PageArchive
+from feed_ingest import parse_feed, feed_records
+from seen_filter import SeenArticleFilter
+from url_canonicalizer import canonicalize_url, url_key
+from monitor import performance_monitor
+from circuit_breaker import CircuitBreakerRegistry, circuit_breakers
+from fetch_retry import RetryPolicy
+from run_deadline import RunDeadline, DeadlineExceeded
+from profiling import profiler
+from config import (TITLE_SIMILARITY_THRESHOLD, STREAM_CHUNK_SIZE, PAGE_ARCHIVE_DIR, PAGE_ARCHIVE_ENABLED,
+                    PAGE_ARCHIVE_RETENTION_DAYS)
 import concurrent.futures
+import xml.etree.ElementTree as ET
+import heapq
+import threading
 from typing import List, Dict, Optional
 import hashlib
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+item_logger = logging.getLogger('crawler.items')  # 기사/링크 단위 메시지 (기본 비활성)
 
-class EducationNewsCrawler:
-    def __init__(self, max_workers: int = 3, timeout: int = 15):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+class NewsParseState:
+    """한 소스의 여러 목록 페이지에 걸친 중복 체크 상태"""
+    
+    def __init__(self):
+        self.seen_titles = set()  # 중복 체크용 제목 집합
+        self.seen_links = set()   # 중복 체크용 링크 키 집합
+        self.title_index = TitleShingleIndex(threshold=TITLE_SIMILARITY_THRESHOLD)  # 유사 제목 인덱스
+        self.news_count = 0
+
+class SourceCrawlTask:
+    """소스 하나의 크롤링 작업 (재시도 시 실패한 페이지부터 이어서 수집)"""
+    
+    def __init__(self, source: Dict, page_urls: List[str], probe: bool = False,
+                 deadline: Optional[RunDeadline] = None):
+        self.source = source
+        self.name = source['name']
+        self.page_urls = page_urls
+        self.next_page = 0  # 다음에 요청할 페이지 번호 (0부터)
+        self.attempts = 0   # 현재 페이지의 연속 실패 횟수
+        self.probe = probe  # 서킷 반열림 탐색이면 재시도하지 않음
+        self.fingerprint = None
+        self.state = NewsParseState()
+        self.news = []
+        self.deadline = deadline or RunDeadline()  # 이 작업이 속한 실행의 마감 시간
+        self.lock = threading.Lock()  # 결과 기록 (중단 이후 기록 차단)
+        self.abandoned = False
+    
+    def abandon(self) -> List[Dict]:
+        """마감 시간으로 중단 - 작업 스레드가 더는 결과를 기록하지 않게 하고 그때까지의 수집분 반환"""
+        with self.lock:
+            self.abandoned = True
+            return list(self.news)
+
+class NewsPageParser:
+    """목록 페이지 파싱/필터 (요청/상태 파일 없이 HTML만 다룸 - 아카이브 재추출 작업자에서 단독 사용)"""
+    
+    def __init__(self, seen_filter: Optional[SeenArticleFilter] = None):
         self.smart_filter = SmartNewsFilter()
-        self.max_workers = max_workers
-        self.timeout = timeout
-        self.crawled_urls = set()  # 크롤링된 URL 캐시
-        self.performance_stats = {
-            'total_crawled': 0,
-            'successful_crawls': 0,
-            'failed_crawls': 0,
-            'average_response_time': 0
-        }
+        self.seen_filter = seen_filter  # 이미 수집한 기사 필터 (블룸 필터)
     
     def extract_clean_title(self, text):
         """깔끔한 제목만 추출 (원본 제목 최대한 보존)"""
@@ -75,39 +114,288 @@ class EducationNewsCrawler:
         
         return normalized
     
-    def is_similar_title(self, title, seen_titles):
-        """유사한 제목인지 확인"""
-        normalized = self.normalize_title(title)
-        
-        for seen_title in seen_titles:
-            # 80% 이상 일치하면 유사한 것으로 판단
-            if self.calculate_similarity(normalized, seen_title) > 0.8:
-                return True
-        return False
+    def is_similar_title(self, title, title_index: TitleShingleIndex):
+        """유사한 제목인지 확인 (미리 계산된 셔글 인덱스 사용)"""
+        return title_index.find_similar(title) is not None
     
     def calculate_similarity(self, text1, text2):
-        """두 텍스트의 유사도 계산 (간단한 버전)"""
+        """두 텍스트의 유사도 계산 (조사 제거 + 문자 n-gram 셔글 자카드)"""
         if not text1 or not text2:
             return 0
         
-        # 공통 단어 수 계산
-        words1 = set(text1.split())
-        words2 = set(text2.split())
+        return jaccard(default_tokenizer.hashed_shingles(text1),
+                       default_tokenizer.hashed_shingles(text2))
+    
+    def parse_news_page(self, content: bytes, base_url: str, source_name: str,
+                        state: Optional['NewsParseState'] = None, max_news: int = 20) -> List[Dict]:
+        """목록 페이지 HTML에서 뉴스 추출 (state로 여러 페이지에 걸친 중복 체크)"""
+        state = state or NewsParseState()
+        if state.news_count >= max_news:
+            return []
         
-        if not words1 or not words2:
-            return 0
+        soup = BeautifulSoup(content, 'html.parser')
         
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        # 사이트별 특화된 파싱 로직 - 제목 태그 직접 추출
+        if 'eduhope' in source_name.lower():
+            # 교육희망 특화 파싱 - 제목 태그 직접 찾기
+            title_elements = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'], class_=re.compile(r'title|head|subject'))
+            if not title_elements:
+                # 제목 태그가 없으면 링크에서 추출
+                all_links = soup.find_all('a', href=True)
+                all_links = [link for link in all_links if link.get_text(strip=True) and len(link.get_text(strip=True)) > 10]
+            else:
+                all_links = title_elements
+        elif 'hangyo' in source_name.lower():
+            # 한국교육신문 특화 파싱 - 더 정교하게
+            # 1. 제목 태그 찾기 (더 넓은 범위)
+            title_elements = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+            # 2. 클래스명으로 제목 찾기
+            title_by_class = soup.find_all(['div', 'span', 'p'], class_=re.compile(r'title|head|subject|news'))
+            # 3. 링크에서 제목 찾기
+            link_titles = soup.find_all('a', href=True)
+            
+            # 모든 방법을 시도
+            all_links = []
+            if title_elements:
+                all_links.extend(title_elements)
+            if title_by_class:
+                all_links.extend(title_by_class)
+            if not all_links:
+                all_links = [link for link in link_titles if link.get_text(strip=True) and len(link.get_text(strip=True)) > 10]
+        elif 'khan' in source_name.lower() or '경향' in source_name:
+            # 경향신문 특화 파싱
+            # 경향신문은 뉴스 리스트 구조가 다름
+            # 1. 뉴스 리스트 컨테이너 찾기
+            news_containers = soup.find_all(['div', 'ul', 'li'], class_=re.compile(r'list|news|article|item'))
+            
+            # 2. 링크에서 제목 추출 (경향신문은 링크 기반)
+            all_links = soup.find_all('a', href=True)
+            
+            # 3. 뉴스 관련 링크만 필터링
+            news_links = []
+            for link in all_links:
+                href = link.get('href', '')
+                text = link.get_text(strip=True)
+                
+                # 뉴스 링크 패턴 확인
+                if (any(pattern in href.lower() for pattern in ['article', 'news', 'view']) and
+                    len(text) > 10 and
+                    not any(skip in text.lower() for skip in ['메뉴', '로그인', '검색', '구독', '알림'])):
+                    news_links.append(link)
+            
+            all_links = news_links
+        elif 'educhang' in source_name.lower():
+            # 교육언론창 특화 파싱
+            title_elements = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+            if not title_elements:
+                all_links = soup.find_all('a', href=True)
+            else:
+                all_links = title_elements
+        else:
+            # 일반적인 파싱 - 제목 태그 우선, 없으면 링크
+            title_elements = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+            if title_elements:
+                all_links = title_elements
+            else:
+                all_links = soup.find_all('a', href=True)
         
-        return len(intersection) / len(union) if union else 0
+        logger.info(f"{source_name}에서 총 {len(all_links)}개 링크 발견")
         
-    def crawl_education_ministry(self, url, base_url):
-        """교육부 뉴스 크롤링"""
         news_list = []
+        for link in all_links:
+            try:
+                text = link.get_text(strip=True)
+                
+                # 제목 태그인 경우 링크 찾기
+                if link.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+                    # 제목 태그 안의 링크 찾기
+                    href_element = link.find('a', href=True)
+                    if href_element:
+                        href = href_element.get('href', '')
+                    else:
+                        # 제목 태그 자체에 링크가 없으면 스킵
+                        continue
+                else:
+                    # 일반 링크인 경우
+                    href = link.get('href', '')
+                
+                # 링크 완성 (정규화된 URL)
+                full_link = canonicalize_url(href, base_url)
+                link_key = url_key(full_link)
+                
+                # 이미 수집한 기사는 이후 처리 생략
+                if self.seen_filter and self.seen_filter.is_seen_link(full_link):
+                    item_logger.debug("%s 기수집 링크 제외: %s", source_name, full_link,
+                                      extra={'msg_type': 'seen'})
+                    continue
+                
+                # 스마트 필터로 뉴스인지 확인
+                if self.smart_filter.is_valid_news(text, href):
+                    
+                    # 원본 텍스트 로깅 (디버깅용, LOG_ITEM_DETAILS)
+                    item_logger.debug("원본 텍스트: %.100s...", text, extra={'msg_type': 'anchor_text'})
+                    
+                    # 깔끔한 제목 추출
+                    clean_title = self.extract_clean_title(text)
+                    
+                    # 추출된 제목 로깅 (디버깅용, LOG_ITEM_DETAILS)
+                    item_logger.debug("추출된 제목: %s", clean_title, extra={'msg_type': 'title_extracted'})
+                    
+                    # 제목이 너무 짧거나 의미없으면 스킵 (더 엄격하게)
+                    if (len(clean_title) < 10 or 
+                        clean_title in ['', '...', '제목', '뉴스', '기사'] or
+                        clean_title.startswith(('http', 'www', 'mailto')) or
+                        '정책' in clean_title or '책임자' in clean_title):
+                        continue
+                    
+                    # 강화된 중복 체크 (제목 + 링크 기준)
+                    title_normalized = self.normalize_title(clean_title)
+                    is_duplicate = (
+                        title_normalized in state.seen_titles or 
+                        link_key in state.seen_links or
+                        self.is_similar_title(clean_title, state.title_index)
+                    )
+                    
+                    if not is_duplicate:
+                        state.seen_titles.add(title_normalized)
+                        state.seen_links.add(link_key)
+                        state.title_index.add(full_link, clean_title)
+                        
+                        news_list.append({
+                            '날짜': datetime.now().strftime('%Y-%m-%d'),
+                            '제목': clean_title,
+                            '출처': source_name,
+                            '링크': full_link,
+                            '크롤링시간': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                        })
+                        
+                        state.news_count += 1
+                        item_logger.debug("%s 뉴스 수집: %.50s...", source_name, clean_title,
+                                          extra={'msg_type': 'collected'})
+                        
+                        if state.news_count >= max_news:  # 소스당 최대 개수
+                            break
+                    else:
+                        item_logger.debug("%s 중복 제외: %.30s...", source_name, clean_title,
+                                          extra={'msg_type': 'duplicate'})
+                        
+            except Exception as e:
+                continue
+        
+        return news_list
+
+class EducationNewsCrawler(NewsPageParser):
+    def __init__(self, max_workers: int = 3, timeout: int = 15,
+                 seen_filter: Optional[SeenArticleFilter] = None,
+                 state_dir: Optional[str] = None, archive: Optional[bool] = None):
+        """state_dir을 주면 지문/서킷/아카이브 상태를 그 디렉터리에 따로 둔다 (부하 테스트 등)"""
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
+        super().__init__(seen_filter)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        if state_dir:
+            # 전용 서킷 브레이커 (에러 처리기 분류 결과도 이 레지스트리로 전달)
+            self.circuit_breakers = CircuitBreakerRegistry(os.path.join(state_dir, 'circuit_state.json'))
+            error_handler.add_listener(self.circuit_breakers.on_error)
+        else:
+            self.circuit_breakers = circuit_breakers  # 소스별 서킷 브레이커
+        self.retry_policy = RetryPolicy()  # 요청 단위 재시도 정책
+        self.deadline = RunDeadline()  # 실행 마감 시간 (crawl_all_sources 호출마다 설정)
+        # 목록 영역 지문 (변경 없는 페이지 파싱 생략)
+        self.page_fingerprints = PageFingerprintStore(os.path.join(state_dir or '', 'page_fingerprints.json'))
+        self.unchanged_sources = set()
+        self.failed_sources: Dict[str, str] = {}  # 이번 크롤링에서 오류로 끝난 소스 → 오류 메시지
+        archive = PAGE_ARCHIVE_ENABLED if archive is None else archive
+        # 원본 페이지 보관
+        self.page_archive = PageArchive(os.path.join(state_dir or '', PAGE_ARCHIVE_DIR),
+                                        PAGE_ARCHIVE_RETENTION_DAYS) if archive else None
+        self.performance_stats = {
+            'total_crawled': 0,
+            'successful_crawls': 0,
+            'failed_crawls': 0,
+            'retried_requests': 0,
+            'average_response_time': 0
+        }
+    
+    def fetch(self, url: str, source_name: str = '', timeout: Optional[float] = None,
+              end_marker: Optional[str] = None, max_bytes: Optional[int] = None,
+              headers: Optional[Dict[str, str]] = None,
+              deadline: Optional[RunDeadline] = None) -> requests.Response:
+        """HTTP GET (요청별 소요시간/상태를 성능 모니터에 기록)
+        
+        end_marker나 max_bytes가 있으면 응답을 스트리밍으로 읽다가 표식 이후/상한에서
+        읽기를 멈추고, 그때까지 받은 앞부분만 response.content로 남긴다.
+        headers로 조건부 요청을 보내면 304 응답도 그대로 반환한다.
+        deadline은 요청한 작업의 마감 시간이다 (생략하면 현재 실행의 마감 시간).
+        """
+        # 실행 마감 시간까지 남은 시간보다 오래 기다리지 않음
+        deadline = deadline or self.deadline
+        timeout = deadline.timeout(timeout or self.timeout, source_name)
+        stream = bool(end_marker or max_bytes)
+        start_time = time.perf_counter()
+        response = None
+        streamed_size = 0
         try:
-            response = self.session.get(url)
+            response = self.session.get(url, timeout=timeout, stream=stream, headers=headers)
             response.raise_for_status()
+            if stream:
+                streamed_size = len(self.read_until(response, end_marker, max_bytes, source_name, deadline))
+            if self.page_archive and response.status_code != 304:
+                self.page_archive.write(url, response.content, source_name, response.status_code)
+            if source_name:
+                self.circuit_breakers.record_success(source_name)
+            return response
+        finally:
+            if stream and response is not None:
+                response.close()
+            performance_monitor.record_request(
+                source=source_name,
+                url=url,
+                duration=time.perf_counter() - start_time,
+                success=response is not None and response.status_code < 400,
+                status_code=response.status_code if response is not None else None,
+                size=streamed_size if stream else len(response.content) if response is not None else 0
+            )
+    
+    def read_until(self, response: requests.Response, end_marker: Optional[str] = None,
+                   max_bytes: Optional[int] = None, source_name: str = '',
+                   deadline: Optional[RunDeadline] = None) -> bytes:
+        """스트리밍 응답을 종료 표식 또는 바이트 상한까지만 읽기 (나머지는 받지 않음)"""
+        deadline = deadline or self.deadline
+        marker = end_marker.encode('utf-8') if end_marker else b''
+        buffer = bytearray()
+        truncated = False
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            # 표식이 청크 경계에 걸친 경우도 찾도록 이전 청크 끝부분부터 검색
+            search_from = max(0, len(buffer) - len(marker) + 1)
+            buffer.extend(chunk)
+            if marker:
+                position = buffer.find(marker, search_from)
+                if position != -1:
+                    del buffer[position + len(marker):]
+                    truncated = True
+                    break
+            if max_bytes and len(buffer) >= max_bytes:
+                del buffer[max_bytes:]
+                truncated = True
+                break
+            deadline.check(source_name)  # 느리게 흘러드는 응답도 마감 시간에 중단
+        
+        if truncated:
+            logger.debug(f"{source_name} 응답 {len(buffer)}바이트에서 읽기 중단")
+        # 이후 코드가 response.content를 그대로 쓰도록 읽은 부분을 본문으로 설정
+        response._content = bytes(buffer)
+        response._content_consumed = True
+        return response._content
+    
+    def crawl_education_ministry(self, url, base_url, source_name: str = '교육부'):
+        """교육부 뉴스 크롤링"""
+        news_list = []
+        try:
+            response = self.fetch(url, source_name)
             soup = BeautifulSoup(response.content, 'html.parser')
             
             # 교육부 뉴스 리스트 파싱
@@ -122,7 +410,7 @@ class EducationNewsCrawler:
                     if title_elem and link_elem:
                         title = title_elem.get_text(strip=True)
                         date_text = date_elem.get_text(strip=True) if date_elem else ''
-                        link = urljoin(base_url, link_elem.get('href', ''))
+                        link = canonicalize_url(link_elem.get('href', ''), base_url)
                         
                         # 상세 내용 크롤링
                         content = self.get_article_content(link)
@@ -141,200 +429,107 @@ class EducationNewsCrawler:
                     continue
                     
         except Exception as e:
+            error_handler.handle_error(e, "교육부 뉴스 크롤링 오류", source=source_name, url=url)
             logger.error(f"교육부 뉴스 크롤링 오류: {e}")
             
         return news_list
     
-    def crawl_general_news(self, url, base_url, source_name):
-        """일반 교육 뉴스 사이트 크롤링 (개선된 버전)"""
-        news_list = []
-        seen_titles = set()  # 중복 체크용 제목 집합
-        seen_links = set()   # 중복 체크용 링크 집합
+    def changed_list_fingerprint(self, source_name: str, content: bytes,
+                                 list_region: Optional[str] = None) -> Optional[str]:
+        """기사 목록 영역 지문 (지난 실행과 같으면 None - 파싱/필터링/중복 체크 생략)
+
+        목록 영역에서 기사 링크를 찾지 못하면 빈 문자열을 반환해 매번 파싱하고 지문은 저장하지 않는다.
+        """
+        fingerprint = self.page_fingerprints.compute(content, list_region)
+        if fingerprint is None:
+            logger.warning(f"{source_name} 기사 목록 영역을 찾지 못함 - 지문 없이 파싱 (list_region/링크 패턴 확인 필요)")
+            return ''
+        if self.page_fingerprints.is_unchanged(source_name, fingerprint):
+            logger.info(f"{source_name} 기사 목록 변경 없음 - 파싱 생략")
+            self.unchanged_sources.add(source_name)
+            return None
+        return fingerprint
+    
+    @log_performance
+    def crawl_all_sources(self, sources: List[Dict], deadline: Optional[RunDeadline] = None) -> List[Dict]:
+        """모든 뉴스 소스 크롤링 (요청 단위 재시도, 마감 시간이 지나면 수집한 만큼 반환)"""
+        all_news = []
+        self.unchanged_sources.clear()
+        self.failed_sources = {}
+        self.deadline = deadline or RunDeadline()
+        
+        # 서킷이 열린 소스는 제외 (반열림이면 재시도 없이 한 번만 탐색)
+        waiting = []  # (실행 가능 시각, 순번, 작업) 힙
+        for seq, source in enumerate(sources):
+            if not self.circuit_breakers.allow_request(source['name']):
+                logger.info(f"🔌 {source['name']}: 서킷 열림 - 크롤링 생략")
+                continue
+            probe = self.circuit_breakers.is_probe(source['name'])
+            waiting.append((0.0, seq, SourceCrawlTask(source, self._page_urls(source), probe, self.deadline)))
+        heapq.heapify(waiting)
+        seq = len(sources)
         
+        # 병렬 크롤링 실행 (백오프 중인 작업은 작업자를 점유하지 않음)
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        running = {}
         try:
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            logger.info(f"{source_name} 크롤링 시작 - URL: {url}")
-            
-            # 사이트별 특화된 파싱 로직 - 제목 태그 직접 추출
-            if 'eduhope' in source_name.lower():
-                # 교육희망 특화 파싱 - 제목 태그 직접 찾기
-                title_elements = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'], class_=re.compile(r'title|head|subject'))
-                if not title_elements:
-                    # 제목 태그가 없으면 링크에서 추출
-                    all_links = soup.find_all('a', href=True)
-                    all_links = [link for link in all_links if link.get_text(strip=True) and len(link.get_text(strip=True)) > 10]
-                else:
-                    all_links = title_elements
-            elif 'hangyo' in source_name.lower():
-                # 한국교육신문 특화 파싱 - 더 정교하게
-                # 1. 제목 태그 찾기 (더 넓은 범위)
-                title_elements = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-                # 2. 클래스명으로 제목 찾기
-                title_by_class = soup.find_all(['div', 'span', 'p'], class_=re.compile(r'title|head|subject|news'))
-                # 3. 링크에서 제목 찾기
-                link_titles = soup.find_all('a', href=True)
+            while (waiting or running) and not self.deadline.expired():
+                # 대기 시간이 지난 작업 제출
+                now = time.monotonic()
+                while waiting and waiting[0][0] <= now and len(running) < self.max_workers:
+                    task = heapq.heappop(waiting)[2]
+                    running[executor.submit(self._run_crawl_task, task)] = task
                 
-                # 모든 방법을 시도
-                all_links = []
-                if title_elements:
-                    all_links.extend(title_elements)
-                if title_by_class:
-                    all_links.extend(title_by_class)
-                if not all_links:
-                    all_links = [link for link in link_titles if link.get_text(strip=True) and len(link.get_text(strip=True)) > 10]
-            elif 'khan' in source_name.lower() or '경향' in source_name:
-                # 경향신문 특화 파싱
-                # 경향신문은 뉴스 리스트 구조가 다름
-                # 1. 뉴스 리스트 컨테이너 찾기
-                news_containers = soup.find_all(['div', 'ul', 'li'], class_=re.compile(r'list|news|article|item'))
-                
-                # 2. 링크에서 제목 추출 (경향신문은 링크 기반)
-                all_links = soup.find_all('a', href=True)
+                timeout = self.deadline.remaining()
+                if waiting and len(running) < self.max_workers:
+                    timeout = min(timeout, max(0.0, waiting[0][0] - now))
+                if timeout == float('inf'):
+                    timeout = None
+                if not running:
+                    time.sleep(timeout)
+                    continue
                 
-                # 3. 뉴스 관련 링크만 필터링
-                news_links = []
-                for link in all_links:
-                    href = link.get('href', '')
-                    text = link.get_text(strip=True)
-                    
-                    # 뉴스 링크 패턴 확인
-                    if (any(pattern in href.lower() for pattern in ['article', 'news', 'view']) and
-                        len(text) > 10 and
-                        not any(skip in text.lower() for skip in ['메뉴', '로그인', '검색', '구독', '알림'])):
-                        news_links.append(link)
+                done, _ = concurrent.futures.wait(
+                    running, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED)
                 
-                all_links = news_links
-            elif 'educhang' in source_name.lower():
-                # 교육언론창 특화 파싱
-                title_elements = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-                if not title_elements:
-                    all_links = soup.find_all('a', href=True)
-                else:
-                    all_links = title_elements
-            else:
-                # 일반적인 파싱 - 제목 태그 우선, 없으면 링크
-                title_elements = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-                if title_elements:
-                    all_links = title_elements
-                else:
-                    all_links = soup.find_all('a', href=True)
-            
-            logger.info(f"{source_name}에서 총 {len(all_links)}개 링크 발견")
-            
-            news_count = 0
-            for link in all_links:
-                try:
-                    text = link.get_text(strip=True)
-                    
-                    # 제목 태그인 경우 링크 찾기
-                    if link.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                        # 제목 태그 안의 링크 찾기
-                        href_element = link.find('a', href=True)
-                        if href_element:
-                            href = href_element.get('href', '')
-                        else:
-                            # 제목 태그 자체에 링크가 없으면 스킵
-                            continue
-                    else:
-                        # 일반 링크인 경우
-                        href = link.get('href', '')
-                    
-                    # 스마트 필터로 뉴스인지 확인
-                    if self.smart_filter.is_valid_news(text, href):
-                        
-                        # 링크 완성
-                        full_link = urljoin(base_url, href)
-                        
-                        # 원본 텍스트 로깅 (디버깅용)
-                        logger.info(f"원본 텍스트: {text[:100]}...")
-                        
-                        # 깔끔한 제목 추출
-                        clean_title = self.extract_clean_title(text)
-                        
-                        # 추출된 제목 로깅 (디버깅용)
-                        logger.info(f"추출된 제목: {clean_title}")
-                        
-                        # 제목이 너무 짧거나 의미없으면 스킵 (더 엄격하게)
-                        if (len(clean_title) < 10 or 
-                            clean_title in ['', '...', '제목', '뉴스', '기사'] or
-                            clean_title.startswith(('http', 'www', 'mailto')) or
-                            '정책' in clean_title or '책임자' in clean_title):
-                            continue
-                        
-                        # 강화된 중복 체크 (제목 + 링크 기준)
-                        title_normalized = self.normalize_title(clean_title)
-                        is_duplicate = (
-                            title_normalized in seen_titles or 
-                            full_link in seen_links or
-                            self.is_similar_title(clean_title, seen_titles)
+                # 결과 수집
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        retry_delay = future.result()
+                    except Exception as e:
+                        error_handler.handle_error(
+                            e, 
+                            f"소스 크롤링 실패: {task.name}",
+                            source=task.name,
+                            url=task.source['url']
                         )
-                        
-                        if not is_duplicate:
-                            seen_titles.add(title_normalized)
-                            seen_links.add(full_link)
-                            
-                            news_list.append({
-                                '날짜': datetime.now().strftime('%Y-%m-%d'),
-                                '제목': clean_title,
-                                '출처': source_name,
-                                '링크': full_link,
-                                '크롤링시간': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                            })
-                            
-                            news_count += 1
-                            logger.info(f"{source_name} 뉴스 수집: {clean_title[:50]}...")
-                            
-                            if news_count >= 20:  # 최대 20개
-                                break
-                        else:
-                            logger.info(f"{source_name} 중복 제외: {clean_title[:30]}...")
-                            
-                except Exception as e:
-                    continue
+                        logger.error(f"❌ {task.name} 크롤링 실패: {e}")
+                        self.failed_sources[task.name] = str(e)
+                        retry_delay = None
                     
-        except Exception as e:
-            logger.error(f"{source_name} 뉴스 크롤링 오류: {e}")
+                    if retry_delay is not None:
+                        seq += 1
+                        heapq.heappush(waiting, (time.monotonic() + retry_delay, seq, task))
+                        continue
+                    
+                    all_news.extend(self._finish_crawl_task(task))
             
-        logger.info(f"{source_name}에서 총 {len(news_list)}개 뉴스 수집")
-        return news_list
-    
-
-
-    
-    @log_performance
-    def crawl_all_sources(self, sources: List[Dict]) -> List[Dict]:
-        """모든 뉴스 소스 크롤링 (병렬 처리 개선)"""
-        all_news = []
+            if waiting or running:
+                # 마감 시간 초과 - 남은 작업 취소, 이미 수집한 기사는 보존
+                logger.warning(f"⏰ 실행 마감 시간 초과 - 미완료 소스 {len(waiting) + len(running)}개 중단")
+                self.deadline.cancel()
+                for future, task in running.items():
+                    future.cancel()
+                    all_news.extend(self._finish_crawl_task(task, task.abandon()))
+                for _, _, task in waiting:
+                    all_news.extend(self._finish_crawl_task(task))
+        finally:
+            # 진행 중인 요청은 남은 시간 0으로 곧 끝나고 중단된 작업은 결과를 기록하지 않으므로 기다리지 않음
+            executor.shutdown(wait=False, cancel_futures=True)
         
-        # 병렬 크롤링 실행
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # 각 소스별 크롤링 작업 제출
-            future_to_source = {
-                executor.submit(self._crawl_single_source, source): source 
-                for source in sources
-            }
-            
-            # 결과 수집
-            for future in concurrent.futures.as_completed(future_to_source):
-                source = future_to_source[future]
-                try:
-                    news = future.result()
-                    if news:
-                        all_news.extend(news)
-                        logger.info(f"✅ {source['name']}: {len(news)}개 뉴스 수집")
-                    else:
-                        logger.warning(f"⚠️ {source['name']}: 뉴스 수집 실패")
-                except Exception as e:
-                    error_handler.handle_error(
-                        e, 
-                        f"소스 크롤링 실패: {source['name']}",
-                        source=source['name'],
-                        url=source['url']
-                    )
-                    logger.error(f"❌ {source['name']} 크롤링 실패: {e}")
+        # 서킷 상태 저장 (목록 영역 지문은 수집 결과를 저장한 뒤 commit_fingerprints로 반영)
+        self.circuit_breakers.save()
         
         # 성능 통계 업데이트
         self.performance_stats['total_crawled'] += len(all_news)
@@ -342,20 +537,176 @@ class EducationNewsCrawler:
         
         return all_news
     
-    @error_handler.retry_on_error(max_retries=2, delay=1.0)
-    def _crawl_single_source(self, source: Dict) -> List[Dict]:
-        """단일 소스 크롤링 (재시도 로직 포함)"""
-        logger.info(f"🔄 {source['name']} 크롤링 시작...")
+    def _page_urls(self, source: Dict) -> List[str]:
+        """소스의 목록 페이지 URL 목록 ('max_pages'가 2 이상이면 페이지 파라미터 추가)"""
+        urls = [source['url']]
+        page_param = source.get('page_param', 'page')
+        parsed = urlparse(source['url'])
+        query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if k != page_param]
+        first_page = int(dict(parse_qsl(parsed.query)).get(page_param, 1))
+        for page in range(first_page + 1, first_page + source.get('max_pages', 1)):
+            urls.append(urlunparse(parsed._replace(query=urlencode(query + [(page_param, page)]))))
+        return urls
+    
+    def _run_crawl_task(self, task: 'SourceCrawlTask') -> Optional[float]:
+        """작업 실행 (--profile 모드에서는 소스별로 측정)"""
+        with profiler.stage(f"source:{task.name}"):
+            return self._crawl_task_step(task)
+    
+    def _crawl_task_step(self, task: 'SourceCrawlTask') -> Optional[float]:
+        """다음 페이지부터 이어서 수집 (재시도가 필요하면 대기 시간 반환)"""
+        source = task.source
         
-        if '교육부' in source['name']:
-            news = self.crawl_education_ministry(source['url'], source['base_url'])
-        else:
-            news = self.crawl_general_news(source['url'], source['base_url'], source['name'])
+        if '교육부' in task.name:
+            logger.info(f"🔄 {task.name} 크롤링 시작...")
+            news = self.crawl_education_ministry(source['url'], source['base_url'], task.name)
+            with task.lock:
+                if not task.abandoned:
+                    task.news = news
+            return None
+        
+        if task.next_page == 0 and task.attempts == 0:
+            logger.info(f"🔄 {task.name} 크롤링 시작...")
         
-        # 스마트 필터 적용
-        filtered_news = self.smart_filter.filter_news_list(news)
-        logger.info(f"📊 {source['name']}: {len(news)}개 → {len(filtered_news)}개 (필터링 후)")
+        if source.get('feed_url'):
+            return self._crawl_feed_step(task)
+        
+        while task.next_page < len(task.page_urls) and not task.abandoned:
+            url = task.page_urls[task.next_page]
+            try:
+                response = self.fetch(url, task.name, end_marker=source.get('end_marker'),
+                                      max_bytes=source.get('max_bytes'), deadline=task.deadline)
+            except Exception as e:
+                return self._handle_fetch_error(task, url, e)
+            
+            task.attempts = 0
+            if task.next_page == 0:
+                task.fingerprint = self.changed_list_fingerprint(
+                    task.name, response.content, source.get('list_region'))
+                if task.fingerprint is None:
+                    return None
+            
+            news = self.parse_news_page(
+                response.content, source['base_url'], task.name, task.state, source.get('max_news', 20))
+            with task.lock:
+                if task.abandoned:
+                    return None
+                task.news.extend(news)
+                task.next_page += 1
+        
+        # 모든 페이지를 수집한 경우에만 지문 갱신
+        with task.lock:
+            if not task.abandoned:
+                self.page_fingerprints.update(task.name, task.fingerprint, source['url'])
+        return None
+    
+    def _handle_fetch_error(self, task: 'SourceCrawlTask', url: str, error: Exception) -> Optional[float]:
+        """요청 실패 처리 (재시도할 수 있으면 대기 시간, 아니면 None)"""
+        if isinstance(error, DeadlineExceeded) or task.deadline.expired() or task.abandoned:
+            # 마감 시간으로 잘린 요청은 사이트 장애로 기록하지 않음
+            logger.warning(f"⏰ {task.name}: 마감 시간 초과 - {task.next_page}페이지까지 수집분만 사용")
+            return None
         
+        task.attempts += 1
+        max_retries = 0 if task.probe else self.retry_policy.max_retries
+        if task.attempts <= max_retries and self.retry_policy.should_retry(error):
+            delay = self.retry_policy.delay(task.attempts, error)
+            with task.lock:
+                if task.abandoned:
+                    return None
+                self.performance_stats['retried_requests'] += 1
+            logger.warning(f"🔁 {task.name} 요청 실패 ({error}) - {delay:.1f}초 후 재시도 "
+                           f"({task.attempts}/{max_retries})")
+            return delay
+        
+        # 재시도 불가/소진 - 앞 페이지까지 수집한 결과는 보존
+        error_handler.handle_error(error, f"{task.name} 뉴스 크롤링 오류", source=task.name, url=url)
+        logger.error(f"{task.name} 뉴스 크롤링 오류: {error}")
+        self.failed_sources[task.name] = str(error)
+        if task.news:
+            logger.warning(f"{task.name}: {task.next_page}페이지까지 수집한 {len(task.news)}개 뉴스 보존")
+        return None
+    
+    def _crawl_feed_step(self, task: 'SourceCrawlTask') -> Optional[float]:
+        """RSS/Atom/뉴스 사이트맵으로 수집 (조건부 요청, 파싱 실패 시 목록 페이지로 대체)"""
+        source = task.source
+        url = source['feed_url']
+        try:
+            response = self.fetch(url, task.name, max_bytes=source.get('max_bytes'),
+                                  headers=self.page_fingerprints.conditional_headers(task.name, url),
+                                  deadline=task.deadline)
+        except Exception as e:
+            return self._handle_fetch_error(task, url, e)
+        task.attempts = 0
+        
+        if response.status_code == 304:
+            logger.info(f"{task.name} 피드 변경 없음 (304)")
+            self.unchanged_sources.add(task.name)
+            return None
+        
+        try:
+            entries = parse_feed(response.content, max_items=source.get('max_news', 20))
+        except ET.ParseError as e:
+            logger.warning(f"{task.name} 피드 파싱 실패 ({e}) - 목록 페이지로 수집")
+            task.source = {key: value for key, value in source.items() if key != 'feed_url'}
+            return self._crawl_task_step(task)
+        
+        if not entries:
+            # 빈 피드는 지문/검증값을 남기지 않아 다음 실행에서 다시 받음
+            logger.warning(f"{task.name} 피드 항목 없음 - 지문 갱신 생략")
+            return None
+        
+        # 서버가 조건부 요청을 무시해도 항목 링크가 같으면 이후 처리 생략
+        fingerprint = hashlib.blake2b('\n'.join(e['link'] for e in entries).encode('utf-8'),
+                                      digest_size=16).hexdigest()
+        validators = {'etag': response.headers.get('ETag'),
+                      'last_modified': response.headers.get('Last-Modified')}
+        if self.page_fingerprints.is_unchanged(task.name, fingerprint):
+            logger.info(f"{task.name} 피드 항목 변경 없음 - 처리 생략")
+            self.unchanged_sources.add(task.name)
+            with task.lock:
+                if not task.abandoned:
+                    self.page_fingerprints.update(task.name, fingerprint, url, **validators)
+            return None
+        
+        collected = []
+        for news in feed_records(entries, task.name):
+            news['링크'] = canonicalize_url(news['링크'], source['base_url'])
+            link_key = url_key(news['링크'])
+            title_normalized = self.normalize_title(news['제목'])
+            if self.seen_filter and self.seen_filter.is_seen_link(news['링크']):
+                continue
+            if (link_key in task.state.seen_links or title_normalized in task.state.seen_titles or
+                    self.is_similar_title(news['제목'], task.state.title_index)):
+                item_logger.debug("%s 중복 제외: %.30s...", task.name, news['제목'],
+                                  extra={'msg_type': 'duplicate'})
+                continue
+            task.state.seen_links.add(link_key)
+            task.state.seen_titles.add(title_normalized)
+            task.state.title_index.add(news['링크'], news['제목'])
+            collected.append(news)
+        logger.info(f"{task.name} 피드 항목 {len(entries)}개 → 새 기사 {len(collected)}개")
+        
+        with task.lock:
+            if not task.abandoned:
+                task.news.extend(collected)
+                self.page_fingerprints.update(task.name, fingerprint, url, **validators)
+        return None
+    
+    def _finish_crawl_task(self, task: 'SourceCrawlTask', news: Optional[List[Dict]] = None) -> List[Dict]:
+        """완료된 작업 결과에 스마트 필터 적용 (news: 중단된 작업의 수집분)"""
+        news = task.news if news is None else news
+        if not news:
+            if task.name in self.unchanged_sources:
+                logger.info(f"⏭️ {task.name}: 기사 목록 변경 없음")
+            else:
+                logger.warning(f"⚠️ {task.name}: 뉴스 수집 실패")
+            return []
+        
+        with profiler.stage(f"filter:{task.name}"):
+            filtered_news = self.smart_filter.filter_news_list(news)
+        logger.info(f"📊 {task.name}: {len(news)}개 → {len(filtered_news)}개 (필터링 후)")
+        logger.info(f"✅ {task.name}: {len(filtered_news)}개 뉴스 수집")
         return filtered_news
     
     def generate_content_hash(self, content: str) -> str:
@@ -406,9 +757,24 @@ class EducationNewsCrawler:
         return {
             **self.performance_stats,
             'error_stats': error_handler.get_error_stats(),
-            'crawled_urls_count': len(self.crawled_urls)
+            'seen_filter_count': self.seen_filter.count if self.seen_filter else 0
         }
     
+    def commit_fingerprints(self):
+        """이번 크롤링의 목록 영역 지문 저장 (수집한 뉴스를 저장한 뒤 호출)"""
+        self.page_fingerprints.save()
+    
+    def discard_fingerprints(self):
+        """이번 크롤링의 목록 영역 지문 버림 (다음 실행에서 다시 파싱)"""
+        self.page_fingerprints.discard()
+    
+    def close(self):
+        """아카이브 닫기 및 전용 서킷 브레이커 구독 해제"""
+        if self.page_archive is not None:
+            self.page_archive.close()
+        if self.circuit_breakers is not circuit_breakers:
+            error_handler.remove_listener(self.circuit_breakers.on_error)
+    
     def save_to_json(self, news_list: List[Dict], filename: str = 'education_news.json') -> bool:
         """JSON 파일로 저장 (개선된 버전)"""
         try:
@@ -436,10 +802,25 @@ class EducationNewsCrawler:
             return False
 
 if __name__ == "__main__":
-    from config import NEWS_SOURCES
+    import argparse
+    from config import NEWS_SOURCES, PROFILE_DIR
+    from log_config import setup_logging
+    
+    parser = argparse.ArgumentParser(description='교육 뉴스 크롤링')
+    parser.add_argument('--profile', action='store_true', help='단계/소스별 프로파일 저장')
+    parser.add_argument('--profile-dir', default=PROFILE_DIR)
+    args = parser.parse_args()
+    
+    setup_logging()
+    if args.profile:
+        profiler.enable(args.profile_dir)
     
     crawler = EducationNewsCrawler()
-    news_list = crawler.crawl_all_sources(NEWS_SOURCES)
-    crawler.save_to_json(news_list)
+    with profiler.stage('crawl'):
+        news_list = crawler.crawl_all_sources(NEWS_SOURCES)
+    with profiler.stage('save'):
+        if crawler.save_to_json(news_list):
+            crawler.commit_fingerprints()
+    profiler.write_reports()
     
     print(f"총 {len(news_list)}개의 교육 뉴스를 수집했습니다.")
\ No newline at end of file
@@ -0,0 +1,256 @@
+# 원본 페이지 아카이브 모듈 - WARC 형식 gzip 레코드 추가 전용 파일 + URL/수집시각 인덱스
+import argparse
+import concurrent.futures
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from url_canonicalizer import url_key
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FILE_PATTERN = re.compile(r'archive-(\d{6})\.warc\.gz')
+
+
+def read_record(path: str, offset: int, length: int) -> bytes:
+    """아카이브 파일의 gzip 레코드 하나에서 페이지 본문 읽기 (인덱스 DB 없이)"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        record = gzip.decompress(f.read(length))
+    header, _, body = record.partition(b'\r\n\r\n')
+    return body[:-4] if body.endswith(b'\r\n\r\n') else body
+
+
+class PageArchive:
+    """수집한 원본 페이지 보관소
+
+    월별 archive-YYYYMM.warc.gz 파일에 페이지마다 독립된 gzip 멤버(WARC resource
+    레코드)로 추가하고, SQLite 인덱스에 파일/오프셋/길이를 기록해 개별 페이지를
+    파일 전체를 풀지 않고 읽는다. retention_days를 주면 열 때 보존 기간이 지난 월별 파일을 지운다.
+    """
+
+    def __init__(self, archive_dir: str = 'page_archive', retention_days: int = 0):
+        self.archive_dir = archive_dir
+        os.makedirs(archive_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(archive_dir, 'index.db'), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    fetched_at TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    url_key TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    file TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL
+                )""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_url ON pages (url_key, fetched_at)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_source ON pages (source, fetched_at)")
+        if retention_days:
+            self.prune(retention_days)
+
+    @staticmethod
+    def _warc_record(url: str, content: bytes, fetched_at: datetime) -> bytes:
+        """WARC/1.0 resource 레코드 (본문은 HTML 그대로)"""
+        headers = [
+            'WARC/1.0',
+            'WARC-Type: resource',
+            f'WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>',
+            f'WARC-Date: {fetched_at.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")}',
+            f'WARC-Target-URI: {url}',
+            'Content-Type: text/html',
+            f'Content-Length: {len(content)}'
+        ]
+        return ('\r\n'.join(headers) + '\r\n\r\n').encode('utf-8') + content + b'\r\n\r\n'
+
+    def write(self, url: str, content: bytes, source: str = '', status: int = 200,
+              fetched_at: Optional[datetime] = None):
+        """페이지 추가 (레코드마다 별도 gzip 멤버라 파일 끝에 이어 붙이기만 함)"""
+        fetched_at = fetched_at or datetime.now()
+        member = gzip.compress(self._warc_record(url, content, fetched_at))
+        file_name = f"archive-{fetched_at.strftime('%Y%m')}.warc.gz"
+        with self.lock:
+            with open(os.path.join(self.archive_dir, file_name), 'ab') as f:
+                offset = f.tell()
+                f.write(member)
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (fetched_at.isoformat(), url, url_key(url), source, status,
+                     file_name, offset, len(member)))
+
+    def prune(self, retention_days: int, now: Optional[datetime] = None) -> int:
+        """보존 기간이 지난 월별 파일과 인덱스 행 삭제, 지운 파일 수 반환
+
+        파일은 추가 전용이라 월 단위로만 지운다 (기준 시각이 속한 달보다 앞선 달의 파일).
+        """
+        cutoff_month = ((now or datetime.now()) - timedelta(days=retention_days)).strftime('%Y%m')
+        removed = 0
+        with self.lock:
+            for file_name in sorted(os.listdir(self.archive_dir)):
+                match = ARCHIVE_FILE_PATTERN.fullmatch(file_name)
+                if not match or match.group(1) >= cutoff_month:
+                    continue
+                with self.conn:
+                    self.conn.execute("DELETE FROM pages WHERE file = ?", (file_name,))
+                os.remove(os.path.join(self.archive_dir, file_name))
+                removed += 1
+        if removed:
+            logger.info(f"보존 기간({retention_days}일)이 지난 아카이브 파일 {removed}개 삭제")
+        return removed
+
+    def read(self, file_name: str, offset: int, length: int) -> bytes:
+        """인덱스 위치의 페이지 본문 읽기"""
+        return read_record(os.path.join(self.archive_dir, file_name), offset, length)
+
+    def find(self, url: Optional[str] = None, source: Optional[str] = None,
+             since: Optional[str] = None, until: Optional[str] = None) -> List[Dict]:
+        """URL/소스/수집시각(ISO 문자열) 조건으로 인덱스 조회"""
+        conditions, params = [], []
+        if url:
+            conditions.append("url_key = ?")
+            params.append(url_key(url))
+        if source:
+            conditions.append("source = ?")
+            params.append(source)
+        if since:
+            conditions.append("fetched_at >= ?")
+            params.append(since)
+        if until:
+            conditions.append("fetched_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT fetched_at, url, source, status, file, offset, length FROM pages {where} "
+                f"ORDER BY fetched_at", params).fetchall()
+        return [
+            {'fetched_at': fetched_at, 'url': url, 'source': source, 'status': status,
+             'file': file_name, 'offset': offset, 'length': length}
+            for fetched_at, url, source, status, file_name, offset, length in rows
+        ]
+
+    def iter_pages(self, **conditions) -> Iterator[Dict]:
+        """조건에 맞는 페이지를 본문과 함께 순회"""
+        for entry in self.find(**conditions):
+            yield {**entry, 'content': self.read(entry['file'], entry['offset'], entry['length'])}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+# ----------------------------------------------------------------------
+# 재추출 (오프라인)
+# ----------------------------------------------------------------------
+_worker_parser = None
+
+
+def _reextract_page(task: Dict) -> List[Dict]:
+    """작업 프로세스에서 보관된 페이지 하나를 현재 파싱/필터 로직으로 다시 추출"""
+    global _worker_parser
+    if _worker_parser is None:
+        from news_crawler import NewsPageParser
+        _worker_parser = NewsPageParser()
+
+    content = read_record(os.path.join(task['archive_dir'], task['file']), task['offset'], task['length'])
+    news = _worker_parser.parse_news_page(content, task['base_url'], task['source'], max_news=task['max_news'])
+    news = _worker_parser.smart_filter.filter_news_list(news)
+
+    # 수집 시각은 재추출 시각이 아니라 원래 페이지를 받은 시각
+    fetched_at = datetime.fromisoformat(task['fetched_at'])
+    for item in news:
+        item['날짜'] = fetched_at.strftime('%Y-%m-%d')
+        item['크롤링시간'] = fetched_at.strftime('%Y-%m-%d %H:%M:%S')
+    return news
+
+
+def reextract(archive_dir: str, source: Optional[str] = None, since: Optional[str] = None,
+              until: Optional[str] = None, workers: int = 4) -> List[Dict]:
+    """보관된 목록 페이지를 병렬로 다시 추출 (네트워크 사용 안 함)"""
+    from config import NEWS_SOURCES
+
+    sources = {s['name']: s for s in NEWS_SOURCES}
+    archive = PageArchive(archive_dir)
+    try:
+        entries = [e for e in archive.find(source=source, since=since, until=until)
+                   if e['status'] < 400 and '교육부' not in e['source']]
+    finally:
+        archive.close()
+
+    tasks = []
+    for entry in entries:
+        config = sources.get(entry['source'], {})
+        parsed = urlparse(entry['url'])
+        tasks.append({
+            **entry,
+            'archive_dir': archive_dir,
+            'base_url': config.get('base_url', f"{parsed.scheme}://{parsed.netloc}/"),
+            'max_news': config.get('max_news', 20)
+        })
+
+    all_news = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for news in executor.map(_reextract_page, tasks, chunksize=8):
+            all_news.extend(news)
+    logger.info(f"페이지 {len(tasks)}개에서 뉴스 {len(all_news)}개 재추출")
+    return all_news
+
+
+def main():
+    """원본 페이지 아카이브 조회/재추출/정리 명령"""
+    from config import PAGE_ARCHIVE_DIR, PAGE_ARCHIVE_RETENTION_DAYS
+    from log_config import setup_logging
+
+    parser = argparse.ArgumentParser(description='원본 페이지 아카이브')
+    parser.add_argument('--dir', default=PAGE_ARCHIVE_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (('list', '보관된 페이지 목록'), ('reextract', '현재 추출 로직으로 재추출')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--source', default=None)
+        sub.add_argument('--since', default=None, help='YYYY-MM-DD')
+        sub.add_argument('--until', default=None, help='YYYY-MM-DD')
+        if name == 'reextract':
+            sub.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+            sub.add_argument('--output', default='reextracted_news.json')
+    sub = subparsers.add_parser('prune', help='보존 기간이 지난 월별 파일 삭제')
+    sub.add_argument('--days', type=int, default=PAGE_ARCHIVE_RETENTION_DAYS)
+
+    args = parser.parse_args()
+    setup_logging()
+
+    if args.command == 'list':
+        archive = PageArchive(args.dir)
+        try:
+            for entry in archive.find(source=args.source, since=args.since, until=args.until):
+                print(f"{entry['fetched_at'][:19]}  {entry['status']}  {entry['source']:<8} "
+                      f"{entry['length']:>8}B  {entry['url']}")
+        finally:
+            archive.close()
+    elif args.command == 'prune':
+        archive = PageArchive(args.dir)
+        try:
+            print(f"삭제한 아카이브 파일: {archive.prune(args.days) if args.days else 0}개")
+        finally:
+            archive.close()
+    else:
+        news = reextract(args.dir, args.source, args.since, args.until, args.workers)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(news, f, ensure_ascii=False, indent=2)
+        print(f"재추출 결과 {len(news)}개 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# 기사 목록 영역 지문(fingerprint) 모듈 - 변경 없는 페이지의 파싱 생략용
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 기사 링크 (href + 앵커 텍스트) 추출 패턴
+ANCHOR_PATTERN = re.compile(rb'<a\s[^>]*?href\s*=\s*["\']([^"\']+)["\'][^>]*>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+# 기사로 볼 만한 링크 패턴 (광고/메뉴 링크 변화에 영향받지 않도록)
+ARTICLE_HREF_PATTERN = re.compile(rb'article|news|view|idxno', re.IGNORECASE)
+TAG_PATTERN = re.compile(rb'<[^>]+>')
+SPACE_PATTERN = re.compile(rb'\s+')
+
+
+class PageFingerprintStore:
+    """소스별 기사 목록 영역 지문 저장소"""
+
+    def __init__(self, state_file: str = 'page_fingerprints.json'):
+        self.state_file = state_file
+        self.fingerprints: Dict[str, Dict] = {}
+        self.pending: Dict[str, Dict] = {}
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """저장된 지문 로드"""
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self.fingerprints = json.load(f)
+            except Exception as e:
+                logger.warning(f"페이지 지문 로드 실패: {e}")
+                self.fingerprints = {}
+
+    def extract_list_region(self, content: bytes, list_region: Optional[str] = None) -> bytes:
+        """기사 목록 영역만 추출 (광고, 시간 표시 등 매시간 바뀌는 부분 제외)"""
+        if list_region:
+            # 소스별 정규식으로 목록 블록을 지정한 경우
+            match = re.search(list_region.encode('utf-8'), content, re.DOTALL)
+            if match:
+                content = match.group(0)
+
+        # 기사 링크의 href와 텍스트만 순서대로 이어 붙임
+        parts = []
+        for href, text in ANCHOR_PATTERN.findall(content):
+            if not ARTICLE_HREF_PATTERN.search(href):
+                continue
+            text = SPACE_PATTERN.sub(b' ', TAG_PATTERN.sub(b'', text)).strip()
+            parts.append(href + b'\t' + text)
+        return b'\n'.join(parts)
+
+    def compute(self, content: bytes, list_region: Optional[str] = None) -> Optional[str]:
+        """목록 영역 지문 계산 (blake2b, 기사 링크를 찾지 못하면 None - 항상 변경된 것으로 처리)"""
+        region = self.extract_list_region(content, list_region)
+        if not region:
+            return None
+        return hashlib.blake2b(region, digest_size=16).hexdigest()
+
+    def is_unchanged(self, source_name: str, fingerprint: Optional[str]) -> bool:
+        """지난 실행과 목록 영역이 동일한지 확인"""
+        if not fingerprint:
+            return False
+        with self.lock:
+            saved = self.fingerprints.get(source_name)
+        return bool(saved) and saved.get('fingerprint') == fingerprint
+
+    def update(self, source_name: str, fingerprint: str, url: str = '',
+               etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """새 지문 기록 (수집 결과를 저장한 뒤 save 호출 시 반영, 피드는 조건부 요청용 검증값 포함)"""
+        if not fingerprint:
+            return
+        entry = {
+            'fingerprint': fingerprint,
+            'url': url,
+            'updated_at': datetime.now().isoformat()
+        }
+        if etag:
+            entry['etag'] = etag
+        if last_modified:
+            entry['last_modified'] = last_modified
+        with self.lock:
+            self.pending[source_name] = entry
+
+    def conditional_headers(self, source_name: str, url: str) -> Dict[str, str]:
+        """지난 응답의 ETag/Last-Modified로 조건부 요청 헤더 구성 (같은 URL일 때만)"""
+        with self.lock:
+            saved = self.fingerprints.get(source_name) or {}
+        if saved.get('url') != url:
+            return {}
+        headers = {}
+        if saved.get('etag'):
+            headers['If-None-Match'] = saved['etag']
+        if saved.get('last_modified'):
+            headers['If-Modified-Since'] = saved['last_modified']
+        return headers
+
+    def discard(self):
+        """저장하지 않은 지문 버림 (수집 결과가 반영되지 못한 경우)"""
+        with self.lock:
+            self.pending = {}
+
+    def save(self):
+        """기록된 지문 저장"""
+        with self.lock:
+            if not self.pending:
+                return
+            self.fingerprints.update(self.pending)
+            self.pending = {}
+            fingerprints = dict(self.fingerprints)
+
+        try:
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump(fingerprints, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            logger.error(f"페이지 지문 저장 실패: {e}")
@@ -0,0 +1,154 @@
+# 프로파일링 모듈 - 단계/소스별 cProfile 통계 + 샘플링 기반 플레임그래프용 스택
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler(threading.Thread):
+    """주기적으로 모든 스레드의 호출 스택을 수집 (단계 이름을 스택 맨 앞에 붙임)"""
+
+    def __init__(self, labels: Dict[int, List[str]], interval: float = 0.005):
+        super().__init__(name='stack-sampler', daemon=True)
+        self.labels = labels
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def run(self):
+        own_id = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                labels = self.labels.get(thread_id)
+                if thread_id == own_id or not labels:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_name(frame))
+                    frame = frame.f_back
+                self.stacks[';'.join(labels + stack[::-1])] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class StageProfiler:
+    """실행 단계/소스별 프로파일러 (비활성 상태에서는 stage()가 아무것도 하지 않음)
+
+    각 스레드의 가장 바깥 단계마다 cProfile을 켜서 단계별 통계를 합치고,
+    샘플링 스레드가 단계 이름이 붙은 호출 스택을 모아 collapsed 형식으로 저장한다.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.output_dir = ''
+        self.stats: Dict[str, pstats.Stats] = {}
+        self.durations: Dict[str, float] = {}
+        self.labels: Dict[int, List[str]] = {}  # 스레드 ID → 진행 중인 단계 이름
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.sampler: Optional[StackSampler] = None
+
+    def enable(self, output_dir: str = 'profiles', sample_interval: float = 0.005):
+        """프로파일링 시작 (실행마다 별도 디렉터리)"""
+        self.output_dir = os.path.join(output_dir, datetime.now().strftime('%Y%m%d-%H%M%S'))
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.enabled = True
+        self.sampler = StackSampler(self.labels, sample_interval)
+        self.sampler.start()
+        logger.info(f"프로파일링 활성화: {self.output_dir}")
+
+    @contextmanager
+    def stage(self, name: str):
+        """단계 구간 측정"""
+        if not self.enabled:
+            yield
+            return
+
+        thread_id = threading.get_ident()
+        labels = self.labels.setdefault(thread_id, [])
+        labels.append(name)
+        profile = None
+        if not getattr(self.local, 'profiling', False):
+            # 스레드당 하나의 cProfile만 활성화 (중첩 단계는 샘플링 스택으로만 구분)
+            try:
+                profile = cProfile.Profile()
+                profile.enable()
+                self.local.profiling = True
+            except ValueError:
+                profile = None  # 다른 프로파일러가 이미 동작 중인 경우
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+                self.local.profiling = False
+            labels.pop()
+            if not labels:
+                self.labels.pop(thread_id, None)
+            with self.lock:
+                self.durations[name] = self.durations.get(name, 0.0) + elapsed
+                if profile is not None:
+                    if name in self.stats:
+                        self.stats[name].add(profile)
+                    else:
+                        self.stats[name] = pstats.Stats(profile)
+
+    @staticmethod
+    def _file_name(stage: str) -> str:
+        return re.sub(r'[^\w.-]+', '_', stage)
+
+    def write_reports(self, top: int = 25) -> Optional[str]:
+        """단계별 .prof, collapsed 스택, 상위 함수 요약 저장"""
+        if not self.enabled:
+            return None
+        if self.sampler:
+            self.sampler.stop()
+
+        with open(os.path.join(self.output_dir, 'stacks.collapsed'), 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.sampler.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+        summary = io.StringIO()
+        for name in sorted(self.durations, key=self.durations.get, reverse=True):
+            summary.write(f"=== {name} ({self.durations[name]:.2f}초) ===\n")
+            stats = self.stats.get(name)
+            if stats is None:
+                summary.write("(샘플링 스택만 수집됨)\n\n")
+                continue
+            stats.dump_stats(os.path.join(self.output_dir, f"{self._file_name(name)}.prof"))
+            stats.stream = summary
+            stats.sort_stats('cumulative').print_stats(top)
+
+        with open(os.path.join(self.output_dir, 'summary.txt'), 'w', encoding='utf-8') as f:
+            f.write(summary.getvalue())
+
+        for name in sorted(self.durations, key=self.durations.get, reverse=True):
+            logger.info(f"⏱️ {name}: {self.durations[name]:.2f}초")
+        logger.info(f"프로파일 저장 완료: {self.output_dir} "
+                    f"(flamegraph.pl stacks.collapsed > flame.svg)")
+        self.enabled = False
+        return self.output_dir
+
+
+# 전역 프로파일러 (--profile 옵션으로 활성화)
+profiler = StageProfiler()
@@ -0,0 +1,184 @@
+# 프로세스 자원 사용량 샘플링 모듈 - RSS/CPU/소켓/스레드 수를 단계별로 기록
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import psutil
+
+from config import RESOURCE_SAMPLE_INTERVAL, RESOURCE_TRACE_ALLOCATIONS
+from monitor import performance_monitor
+
+logger = logging.getLogger(__name__)
+
+
+class StageUsage:
+    """단계 하나의 자원 사용량 집계"""
+
+    def __init__(self, name: str, rss: int, cpu_seconds: float):
+        self.name = name
+        self.start_rss = rss
+        self.start_cpu = cpu_seconds
+        self.peak_rss = rss
+        self.peak_memory_percent = 0.0
+        self.max_sockets = 0
+        self.max_threads = 0
+        self.cpu_seconds = 0.0
+        self.samples = 0
+        self.top_allocations: List[str] = []
+
+    def update(self, sample: Dict):
+        self.peak_rss = max(self.peak_rss, sample['rss'])
+        self.peak_memory_percent = max(self.peak_memory_percent, sample['memory_percent'])
+        self.max_sockets = max(self.max_sockets, sample['sockets'])
+        self.max_threads = max(self.max_threads, sample['threads'])
+        self.cpu_seconds = sample['cpu_seconds'] - self.start_cpu
+        self.samples += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            'stage': self.name,
+            'peak_rss': self.peak_rss,
+            'peak_rss_mb': round(self.peak_rss / 1024 / 1024, 1),
+            'rss_growth_mb': round((self.peak_rss - self.start_rss) / 1024 / 1024, 1),
+            'peak_memory_percent': round(self.peak_memory_percent, 2),
+            'cpu_seconds': round(self.cpu_seconds, 3),
+            'max_sockets': self.max_sockets,
+            'max_threads': self.max_threads,
+            'top_allocations': self.top_allocations
+        }
+
+
+class ResourceSampler:
+    """백그라운드 스레드에서 주기적으로 현재 프로세스 자원 사용량 측정
+
+    실행 전체('run')와 진행 중인 단계의 최대값을 함께 갱신하고, 단계가 끝나면
+    성능 모니터에 기록한다. trace_allocations가 켜져 있으면 단계 시작/종료
+    tracemalloc 스냅샷 차이로 가장 많이 할당한 코드 위치를 남긴다.
+    """
+
+    def __init__(self, interval: float = 1.0, trace_allocations: bool = False, top_allocations: int = 10):
+        self.interval = interval
+        self.trace_allocations = trace_allocations
+        self.top_allocations = top_allocations
+        self.process = psutil.Process()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.run_usage: Optional[StageUsage] = None
+        self.stages: List[StageUsage] = []  # 진행 중인 단계 (중첩 가능)
+        self.completed: List[Dict] = []
+
+    def sample(self) -> Dict:
+        """현재 자원 사용량 1회 측정"""
+        with self.process.oneshot():
+            cpu = self.process.cpu_times()
+            sample = {
+                'rss': self.process.memory_info().rss,
+                'memory_percent': self.process.memory_percent(),
+                'cpu_seconds': cpu.user + cpu.system,
+                'threads': self.process.num_threads()
+            }
+        try:
+            connections = getattr(self.process, 'net_connections', None) or self.process.connections
+            sample['sockets'] = len(connections(kind='inet'))
+        except psutil.Error:
+            sample['sockets'] = 0
+        return sample
+
+    def _update(self):
+        sample = self.sample()
+        with self.lock:
+            for usage in [self.run_usage] + self.stages:
+                if usage is not None:
+                    usage.update(sample)
+        return sample
+
+    def _loop(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self._update()
+            except psutil.Error as e:
+                logger.debug(f"자원 사용량 측정 실패: {e}")
+
+    def start(self):
+        """실행 단위 측정 시작"""
+        if self.thread is not None:
+            return
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        sample = self.sample()
+        self.run_usage = StageUsage('run', sample['rss'], sample['cpu_seconds'])
+        self.run_usage.update(sample)
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._loop, name='resource-sampler', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> Optional[Dict]:
+        """측정 종료 후 실행 전체 사용량 기록"""
+        if self.thread is None:
+            return None
+        self.stopped.set()
+        self.thread.join()
+        self.thread = None
+        self._update()
+        usage = self.run_usage.to_dict()
+        self._report(usage)
+        if self.trace_allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return usage
+
+    @contextmanager
+    def stage(self, name: str):
+        """단계 구간 측정 (측정 중이 아니면 아무것도 하지 않음)"""
+        if self.thread is None:
+            yield
+            return
+
+        sample = self._update()
+        usage = StageUsage(name, sample['rss'], sample['cpu_seconds'])
+        usage.update(sample)
+        before = self._take_snapshot() if tracemalloc.is_tracing() else None
+        with self.lock:
+            self.stages.append(usage)
+        try:
+            yield
+        finally:
+            self._update()
+            with self.lock:
+                self.stages.remove(usage)
+            if before is not None:
+                usage.top_allocations = self.allocation_diff(before)
+            self._report(usage.to_dict())
+
+    @staticmethod
+    def _take_snapshot() -> 'tracemalloc.Snapshot':
+        """tracemalloc 자체 할당을 제외한 스냅샷"""
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+    def allocation_diff(self, before: 'tracemalloc.Snapshot') -> List[str]:
+        """스냅샷 이후 가장 많이 늘어난 할당 위치"""
+        stats = self._take_snapshot().compare_to(before, 'lineno')
+        return [str(stat) for stat in stats[:self.top_allocations] if stat.size_diff > 0]
+
+    def snapshot_top(self, limit: Optional[int] = None) -> List[str]:
+        """현재 시점의 상위 할당 위치 (tracemalloc이 켜져 있을 때만)"""
+        if not tracemalloc.is_tracing():
+            return []
+        stats = self._take_snapshot().statistics('lineno')
+        return [str(stat) for stat in stats[:limit or self.top_allocations]]
+
+    def _report(self, usage: Dict):
+        """성능 모니터에 단계별 사용량 기록"""
+        self.completed.append(usage)
+        performance_monitor.record_resources(usage)
+        logger.info(f"🧠 {usage['stage']}: 최대 RSS {usage['peak_rss_mb']}MB "
+                    f"(+{usage['rss_growth_mb']}MB), CPU {usage['cpu_seconds']:.2f}초, "
+                    f"소켓 {usage['max_sockets']}개, 스레드 {usage['max_threads']}개")
+        for line in usage['top_allocations'][:3]:
+            logger.info(f"   할당: {line}")
+
+
+# 전역 자원 샘플러 (main_final에서 실행 시작/종료 시 start/stop)
+resource_sampler = ResourceSampler(RESOURCE_SAMPLE_INTERVAL, RESOURCE_TRACE_ALLOCATIONS)
@@ -0,0 +1,51 @@
+# 실행 마감 시간 모듈 - 크롤링/업로드 단계에 남은 시간을 전달하고 협조적으로 중단
+import threading
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    """실행 마감 시간 초과"""
+
+
+class RunDeadline:
+    """실행 단위 마감 시간 (seconds가 None이면 무제한)"""
+
+    def __init__(self, seconds: Optional[float] = None, expires_at: Optional[float] = None,
+                 parent: Optional['RunDeadline'] = None):
+        if expires_at is None and seconds is not None:
+            expires_at = time.monotonic() + seconds
+        self.expires_at = expires_at
+        self.parent = parent
+        self.cancelled = threading.Event()
+
+    def remaining(self) -> float:
+        """남은 시간 (초, 무제한이면 inf)"""
+        if self.cancelled.is_set():
+            return 0.0
+        remaining = float('inf') if self.expires_at is None else max(0.0, self.expires_at - time.monotonic())
+        if self.parent is not None:
+            remaining = min(remaining, self.parent.remaining())
+        return remaining
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def cancel(self):
+        """남은 작업 취소 (이후 check는 모두 실패, 상위 마감 시간에는 영향 없음)"""
+        self.cancelled.set()
+
+    def check(self, stage: str = ''):
+        """마감 시간이 지났으면 DeadlineExceeded 발생"""
+        if self.expired():
+            raise DeadlineExceeded(f"실행 마감 시간 초과{f' ({stage})' if stage else ''}")
+
+    def timeout(self, default: float, stage: str = '') -> float:
+        """요청 타임아웃 (기본값과 남은 시간 중 작은 값)"""
+        self.check(stage)
+        return min(default, self.remaining())
+
+    def reserve(self, seconds: float) -> 'RunDeadline':
+        """seconds만큼 먼저 끝나는 하위 마감 시간 (뒤 단계가 쓸 시간 확보)"""
+        expires_at = None if self.expires_at is None else self.expires_at - seconds
+        return RunDeadline(expires_at=expires_at, parent=self)
@@ -0,0 +1,373 @@
+# 기사 검색 인덱스 모듈 - 기사 이력 파일 위의 n-gram 역색인 (varint 압축 포스팅, mmap 용어 표)
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from title_tokenizer import default_tokenizer
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------------------------------------
+# 포스팅 인코딩 (증가하는 레코드 오프셋의 차이를 varint로)
+# ----------------------------------------------------------------------
+def encode_postings(doc_ids: Iterable[int], previous: int = 0) -> bytes:
+    """정렬된 문서 ID 목록 → 차이값 varint 바이트열 (previous: 앞 블록의 마지막 ID)"""
+    out = bytearray()
+    for doc_id in doc_ids:
+        delta = doc_id - previous
+        previous = doc_id
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_postings(data) -> List[int]:
+    """varint 바이트열 → 문서 ID 목록"""
+    doc_ids = []
+    value = shift = previous = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        doc_ids.append(previous)
+        value = shift = 0
+    return doc_ids
+
+
+def term_hash(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def title_terms(title: str) -> Set[str]:
+    """제목 색인어 (토큰별 문자 bigram, 한 글자 토큰은 그대로)"""
+    terms = set()
+    for token in default_tokenizer.normalize(title).split():
+        if len(token) == 1:
+            terms.add(f"t:{token}")
+        for i in range(len(token) - 1):
+            terms.add(f"t:{token[i:i + 2]}")
+    return terms
+
+
+def record_terms(record: Dict) -> Set[str]:
+    """레코드 색인어 (제목 n-gram + 출처 + 월)"""
+    terms = title_terms(record.get('제목', ''))
+    if record.get('출처'):
+        terms.add(f"s:{record['출처']}")
+    if record.get('날짜'):
+        terms.add(f"m:{str(record['날짜'])[:7]}")
+    return terms
+
+
+def _months(since: date, until: date) -> List[str]:
+    """since~until 사이의 'YYYY-MM' 목록"""
+    months = []
+    year, month = since.year, since.month
+    while (year, month) <= (until.year, until.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+class SearchIndex:
+    """기사 이력(news_history.jsonl) 역색인
+
+    문서 ID는 기사 이력 파일의 레코드 오프셋이라 추가만 되는 파일에서 항상 증가한다.
+    색인어 해시로 정렬한 고정 폭 용어 표를 mmap해 이진 탐색하고, 포스팅은 차이값
+    varint로 저장한다. 인덱스 이후 추가된 레코드는 refresh()로 메모리에 반영하고
+    commit()에서 기존 포스팅 뒤에 이어 붙여 새 파일로 병합한다.
+    """
+
+    MAGIC = b'EDUSRC01'
+    # magic, 색인된 기사 이력 파일 크기, 문서 수, 용어 수, 용어 표 위치
+    HEADER = struct.Struct('<8sQQQQ')
+    # 용어 해시, 포스팅 위치, 포스팅 길이, 문서 수, 마지막 문서 ID
+    ENTRY = struct.Struct('<QQIIQ')
+
+    def __init__(self, store_file: str = 'news_history.jsonl', index_file: Optional[str] = None,
+                 rebuild_ratio: float = 0.05, min_rebuild_records: int = 1000):
+        self.store_file = store_file
+        self.index_file = index_file or f"{os.path.splitext(store_file)[0]}.search"
+        self.rebuild_ratio = rebuild_ratio
+        self.min_rebuild_records = min_rebuild_records
+        self.lock = threading.Lock()
+
+        self.index_mm = None
+        self.index_handle = None
+        self.indexed_size = 0
+        self.indexed_count = 0
+        self.term_count = 0
+        self.table_offset = 0
+
+        # 인덱스에 아직 반영되지 않은 레코드 (용어 해시 → 문서 ID 목록)
+        self.tail_postings: Dict[int, List[int]] = {}
+        self.tail_count = 0
+        self.tail_size = 0
+
+        if not os.path.exists(self.store_file):
+            open(self.store_file, 'ab').close()
+        self.reader = open(self.store_file, 'rb')
+        self._open_index()
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # 인덱스 열기/탐색
+    # ------------------------------------------------------------------
+    def _open_index(self):
+        """인덱스 파일 mmap (없거나 손상되었으면 빈 인덱스로 시작)"""
+        if not os.path.exists(self.index_file) or os.path.getsize(self.index_file) < self.HEADER.size:
+            return
+        handle = open(self.index_file, 'rb')
+        index_mm = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size, count, terms, table_offset = self.HEADER.unpack_from(index_mm, 0)
+        if (magic != self.MAGIC or len(index_mm) != table_offset + terms * self.ENTRY.size
+                or size > os.path.getsize(self.store_file)):
+            logger.warning(f"검색 인덱스가 올바르지 않아 다시 생성합니다: {self.index_file}")
+            index_mm.close()
+            handle.close()
+            return
+        self.index_handle, self.index_mm = handle, index_mm
+        self.indexed_size, self.indexed_count = size, count
+        self.term_count, self.table_offset = terms, table_offset
+
+    def _close_index(self):
+        if self.index_mm is not None:
+            self.index_mm.close()
+            self.index_handle.close()
+        self.index_mm = self.index_handle = None
+        self.indexed_size = self.indexed_count = self.term_count = self.table_offset = 0
+
+    def _entry(self, target: int) -> Optional[Tuple[int, int, int, int, int]]:
+        """용어 표에서 해시가 같은 항목 (이진 탐색)"""
+        if self.index_mm is None:
+            return None
+        low, high = 0, self.term_count
+        while low < high:
+            mid = (low + high) // 2
+            entry = self.ENTRY.unpack_from(self.index_mm, self.table_offset + mid * self.ENTRY.size)
+            if entry[0] < target:
+                low = mid + 1
+            elif entry[0] > target:
+                high = mid
+            else:
+                return entry
+        return None
+
+    def _iter_entries(self) -> Iterator[Tuple[int, int, int, int, int]]:
+        if self.index_mm is None:
+            return
+        for i in range(self.term_count):
+            yield self.ENTRY.unpack_from(self.index_mm, self.table_offset + i * self.ENTRY.size)
+
+    def doc_count(self, term: str) -> int:
+        """색인어가 들어 있는 문서 수 (질의 용어 순서 결정용)"""
+        target = term_hash(term)
+        entry = self._entry(target)
+        return (entry[3] if entry else 0) + len(self.tail_postings.get(target, ()))
+
+    def postings(self, term: str) -> List[int]:
+        """색인어의 문서 ID 목록 (오름차순)"""
+        target = term_hash(term)
+        entry = self._entry(target)
+        doc_ids = decode_postings(self.index_mm[entry[1]:entry[1] + entry[2]]) if entry else []
+        return doc_ids + self.tail_postings.get(target, [])
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self.indexed_count + self.tail_count
+
+    def refresh(self) -> int:
+        """기사 이력 파일에 새로 추가된 레코드를 메모리 인덱스에 반영, 반영한 수 반환"""
+        added = 0
+        with self.lock, open(self.store_file, 'rb') as f:
+            offset = max(self.indexed_size, self.tail_size)
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # 기록 중인 마지막 줄
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"기사 레코드 파싱 실패 (오프셋 {offset})")
+                    else:
+                        for term in record_terms(record):
+                            self.tail_postings.setdefault(term_hash(term), []).append(offset)
+                        self.tail_count += 1
+                        added += 1
+                offset += len(line)
+            self.tail_size = offset
+        return added
+
+    def commit(self, force: bool = False):
+        """미반영 레코드가 일정 비율을 넘으면 인덱스 병합 재생성"""
+        threshold = max(self.min_rebuild_records, int(self.indexed_count * self.rebuild_ratio))
+        if self.tail_count and (force or self.tail_count >= threshold):
+            self.rebuild_index()
+
+    def rebuild_index(self):
+        """기존 포스팅 뒤에 새 문서 ID를 이어 붙여 새 인덱스 파일 작성"""
+        with self.lock:
+            new_terms = sorted(self.tail_postings.items())
+            tmp_file = f"{self.index_file}.tmp"
+            entries = []
+            with open(tmp_file, 'wb') as f:
+                f.write(b'\0' * self.HEADER.size)
+                old_entries = iter(self._iter_entries())
+                old = next(old_entries, None)
+                for target, doc_ids in new_terms + [(None, None)]:
+                    # 새 용어보다 작은 기존 용어는 그대로 복사
+                    while old is not None and (target is None or old[0] < target):
+                        entries.append(self._copy_postings(f, old))
+                        old = next(old_entries, None)
+                    if target is None:
+                        break
+                    position = f.tell()
+                    if old is not None and old[0] == target:
+                        f.write(self.index_mm[old[1]:old[1] + old[2]])
+                        f.write(encode_postings(doc_ids, old[4]))
+                        count = old[3] + len(doc_ids)
+                        old = next(old_entries, None)
+                    else:
+                        f.write(encode_postings(doc_ids))
+                        count = len(doc_ids)
+                    entries.append((target, position, f.tell() - position, count, doc_ids[-1]))
+
+                table_offset = f.tell()
+                for entry in entries:
+                    f.write(self.ENTRY.pack(*entry))
+                f.seek(0)
+                f.write(self.HEADER.pack(self.MAGIC, self.tail_size or self.indexed_size,
+                                         self.indexed_count + self.tail_count, len(entries), table_offset))
+
+            self._close_index()
+            os.replace(tmp_file, self.index_file)
+            self.tail_postings, self.tail_count, self.tail_size = {}, 0, 0
+            self._open_index()
+        logger.info(f"검색 인덱스 갱신 완료: {self.indexed_count}개 기사, 색인어 {self.term_count}개")
+
+    def _copy_postings(self, f, entry: Tuple[int, int, int, int, int]) -> Tuple[int, int, int, int, int]:
+        position = f.tell()
+        f.write(self.index_mm[entry[1]:entry[1] + entry[2]])
+        return (entry[0], position, entry[2], entry[3], entry[4])
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+    def read_record(self, offset: int) -> Optional[Dict]:
+        with self.lock:
+            self.reader.seek(offset)
+            line = self.reader.readline()
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    def search(self, query: str = '', source: Optional[str] = None, since: Optional[str] = None,
+               until: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """키워드(공백 구분 AND)/출처/기간(YYYY-MM-DD, 양끝 포함) 검색, 최신 기사부터 limit개"""
+        keywords = default_tokenizer.normalize(query).split()
+        groups: List[List[str]] = [[term] for term in sorted(title_terms(query), key=self.doc_count)]
+        if source:
+            groups.insert(0, [f"s:{source}"])
+        if since:
+            end = datetime.strptime(until, '%Y-%m-%d').date() if until else date.today()
+            groups.append([f"m:{month}" for month in _months(datetime.strptime(since, '%Y-%m-%d').date(), end)])
+
+        if groups:
+            candidates = None
+            for terms in groups:
+                doc_ids = set()
+                for term in terms:
+                    doc_ids.update(self.postings(term))
+                candidates = doc_ids if candidates is None else candidates & doc_ids
+                if not candidates:
+                    return []
+            doc_ids = sorted(candidates, reverse=True)
+        else:
+            doc_ids = self._all_doc_ids()
+
+        results = []
+        for doc_id in doc_ids:
+            record = self.read_record(doc_id)
+            if record is None:
+                continue
+            # n-gram 일치 후보를 실제 조건으로 확인
+            title = default_tokenizer.normalize(record.get('제목', ''))
+            day = str(record.get('날짜', ''))[:10]
+            if (all(keyword in title for keyword in keywords)
+                    and (not source or record.get('출처') == source)
+                    and (not since or day >= since)
+                    and (not until or day <= until)):
+                results.append(record)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def _all_doc_ids(self) -> List[int]:
+        """조건 없는 검색용 전체 문서 ID (최신순)"""
+        offsets = []
+        with open(self.store_file, 'rb') as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    offsets.append(offset)
+                offset += len(line)
+        return offsets[::-1]
+
+    def close(self):
+        self._close_index()
+        self.reader.close()
+
+
+def main():
+    """기사 이력 검색 명령"""
+    import time
+    from config import NEWS_HISTORY_FILE
+
+    parser = argparse.ArgumentParser(description='기사 이력 검색')
+    parser.add_argument('query', nargs='?', default='', help='검색어 (공백으로 구분하면 모두 포함)')
+    parser.add_argument('--source', default=None)
+    parser.add_argument('--since', default=None, help='YYYY-MM-DD')
+    parser.add_argument('--until', default=None, help='YYYY-MM-DD')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help='JSON으로 출력')
+    parser.add_argument('--rebuild', action='store_true', help='미반영 기사를 인덱스 파일에 병합')
+    args = parser.parse_args()
+
+    index = SearchIndex(NEWS_HISTORY_FILE)
+    try:
+        if args.rebuild:
+            index.commit(force=True)
+            print(f"검색 인덱스: 기사 {len(index)}개, 색인어 {index.term_count}개")
+            return
+        start = time.perf_counter()
+        results = index.search(args.query, args.source, args.since, args.until, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        if args.json:
+            print(json.dumps(results, ensure_ascii=False, indent=2))
+            return
+        for record in results:
+            print(f"{record.get('날짜', '')}  {record.get('출처', ''):<8} {record.get('제목', '')}")
+            print(f"            {record.get('링크', '')}")
+        print(f"{len(results)}건 ({elapsed:.1f}ms, 전체 {len(index)}개 기사)")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
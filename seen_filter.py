@@ -0,0 +1,203 @@
+# 수집 이력 블룸 필터 모듈 - 메모리 사용량이 고정된 "이미 본 기사" 확인
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+from article_store import title_hash
+from url_canonicalizer import url_key
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """디스크 파일을 mmap한 비트 배열 기반 블룸 필터"""
+
+    MAGIC = b'EDUBLOOM'
+    # magic, 비트 수, 해시 함수 수, 추가된 항목 수
+    HEADER = struct.Struct('<8sQQQ')
+
+    def __init__(self, path: str, capacity: int = 100000, error_rate: float = 0.001):
+        self.path = path
+        self.lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                magic, self.num_bits, self.num_hashes, _ = self.HEADER.unpack(f.read(self.HEADER.size))
+            if magic != self.MAGIC:
+                raise ValueError(f"블룸 필터 파일 형식이 올바르지 않습니다: {path}")
+        else:
+            self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+            self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+            with open(path, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.num_bits, self.num_hashes, 0))
+                f.truncate(self.HEADER.size + (self.num_bits + 7) // 8)
+
+        self.capacity = capacity
+        self.file = open(path, 'r+b')
+        self.mm = mmap.mmap(self.file.fileno(), 0)
+
+    @property
+    def count(self) -> int:
+        """추가된 항목 수 (근사치)"""
+        return self.HEADER.unpack_from(self.mm, 0)[3]
+
+    def _positions(self, key: str):
+        """이중 해싱으로 비트 위치 계산"""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> bool:
+        """항목 추가 (새 항목이면 True)"""
+        offset = self.HEADER.size
+        added = False
+        with self.lock:
+            for position in self._positions(key):
+                byte_index = offset + (position >> 3)
+                mask = 1 << (position & 7)
+                if not self.mm[byte_index] & mask:
+                    self.mm[byte_index] |= mask
+                    added = True
+            if added:
+                struct.pack_into('<Q', self.mm, 24, self.count + 1)
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        offset = self.HEADER.size
+        return all(
+            self.mm[offset + (position >> 3)] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def is_full(self) -> bool:
+        return self.count >= self.capacity
+
+    def flush(self):
+        self.mm.flush()
+
+    def close(self):
+        self.mm.flush()
+        self.mm.close()
+        self.file.close()
+
+
+class ScalableBloomFilter:
+    """용량이 차면 더 큰 필터 파일을 추가하는 확장형 블룸 필터"""
+
+    def __init__(self, path_prefix: str, initial_capacity: int = 100000,
+                 error_rate: float = 0.001, growth: int = 2, tightening: float = 0.5):
+        self.path_prefix = path_prefix
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.lock = threading.Lock()
+        self.filters: List[BloomFilter] = []
+
+        # 기존 필터 파일 순서대로 열기
+        while os.path.exists(self._slice_path(len(self.filters))):
+            self.filters.append(self._open_slice(len(self.filters)))
+        if not self.filters:
+            self.filters.append(self._open_slice(0))
+
+    def _slice_path(self, index: int) -> str:
+        return f"{self.path_prefix}.{index}"
+
+    def _open_slice(self, index: int) -> BloomFilter:
+        capacity = self.initial_capacity * (self.growth ** index)
+        error_rate = self.error_rate * (self.tightening ** index)
+        return BloomFilter(self._slice_path(index), capacity, error_rate)
+
+    @property
+    def count(self) -> int:
+        return sum(f.count for f in self.filters)
+
+    def add(self, key: str) -> bool:
+        """항목 추가 (이미 있을 가능성이 있으면 추가하지 않음)"""
+        if key in self:
+            return False
+        with self.lock:
+            if self.filters[-1].is_full():
+                self.filters.append(self._open_slice(len(self.filters)))
+                logger.info(f"블룸 필터 확장: {len(self.filters)}개 슬라이스")
+            return self.filters[-1].add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in f for f in self.filters)
+
+    def flush(self):
+        for f in self.filters:
+            f.flush()
+
+    def close(self):
+        for f in self.filters:
+            f.close()
+
+
+class SeenArticleFilter:
+    """정규화된 링크 키/제목 지문 기반 "이미 수집한 기사" 필터
+
+    블룸 필터가 양성일 때만 confirm 콜백으로 실제 저장소를 확인한다.
+    """
+
+    def __init__(self, path_prefix: str = 'seen_articles.bloom',
+                 capacity: int = 100000, error_rate: float = 0.001,
+                 confirm_link: Optional[Callable[[str], bool]] = None,
+                 confirm_title: Optional[Callable[[str], bool]] = None):
+        self.bloom = ScalableBloomFilter(path_prefix, capacity, error_rate)
+        self.confirm_link = confirm_link
+        self.confirm_title = confirm_title
+        self.stats = {'negative': 0, 'confirmed': 0, 'false_positive': 0}
+
+    @staticmethod
+    def title_fingerprint(title: str) -> str:
+        """제목 지문 (공백/특수문자 제거 후 해시)"""
+        return format(title_hash(title), '016x')
+
+    @property
+    def count(self) -> int:
+        return self.bloom.count
+
+    def _check(self, key: str, value: str, confirm: Optional[Callable[[str], bool]]) -> bool:
+        if key not in self.bloom:
+            self.stats['negative'] += 1
+            return False
+        # 양성인 경우에만 실제 저장소 확인 (확인 수단이 없으면 블룸 결과를 따름)
+        if confirm is None or confirm(value):
+            self.stats['confirmed'] += 1
+            return True
+        self.stats['false_positive'] += 1
+        return False
+
+    def is_seen_link(self, link: str) -> bool:
+        """이미 수집한 링크인지 확인"""
+        if not link:
+            return False
+        return self._check(f"url:{url_key(link)}", link, self.confirm_link)
+
+    def is_seen_title(self, title: str) -> bool:
+        """이미 수집한 제목인지 확인"""
+        if not title:
+            return False
+        return self._check(f"title:{self.title_fingerprint(title)}", title, self.confirm_title)
+
+    def is_seen(self, news: Dict) -> bool:
+        return self.is_seen_link(news.get('링크', '')) or self.is_seen_title(news.get('제목', ''))
+
+    def add_news(self, news_list: Iterable[Dict]):
+        """기사 링크/제목 지문 등록"""
+        for news in news_list:
+            if news.get('링크'):
+                self.bloom.add(f"url:{url_key(news['링크'])}")
+            if news.get('제목'):
+                self.bloom.add(f"title:{self.title_fingerprint(news['제목'])}")
+        self.bloom.flush()
+
+    def close(self):
+        self.bloom.close()
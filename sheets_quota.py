@@ -0,0 +1,153 @@
+# Google Sheets 할당량 관리 모듈 - 읽기/쓰기별 토큰 버킷 + 429/5xx 백오프
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from googleapiclient.errors import HttpError
+
+from config import (
+    SHEETS_READ_PER_MINUTE, SHEETS_WRITE_PER_MINUTE,
+    SHEETS_MAX_RETRIES, SHEETS_RETRY_BASE_DELAY, SHEETS_RETRY_MAX_DELAY
+)
+from fetch_retry import RETRY_STATUSES
+from run_deadline import DeadlineExceeded
+from monitor import performance_monitor
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """분당 요청 수 제한용 토큰 버킷 (스레드 안전)
+
+    버스트 크기를 분당 한도보다 작게 잡아 1분 창 안에서 한도를 넘지 않게 하고,
+    pause()로 할당량 초과 응답을 받으면 모든 호출자를 함께 멈춘다.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst or max(1, int(rate_per_minute // 6))  # 약 10초 분량
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self, deadline=None) -> float:
+        """토큰 1개 획득 (필요하면 대기), 대기한 시간(초) 반환
+
+        deadline이 있으면 남은 시간 안에 토큰을 받을 수 없을 때 기다리지 않고 DeadlineExceeded 발생.
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            if deadline is not None and wait >= deadline.remaining():
+                raise DeadlineExceeded(f"Sheets 할당량 대기({wait:.1f}초)가 마감 시간을 넘어 중단")
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float):
+        """할당량 초과 시 일정 시간 토큰 발급 중단 (버킷도 비움)"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+class SheetsQuotaGovernor:
+    """모든 Sheets API 호출을 거치게 하는 할당량 관리자
+
+    요청 종류('read'/'write')별 토큰 버킷으로 속도를 맞추고, 429/5xx 응답은
+    Retry-After(없으면 지수 백오프)만큼 기다렸다가 재시도한다. 행 추가(append)처럼
+    다시 보내면 중복되는 요청은 서버가 처리하지 않은 429만 재시도하고, 재시도 대기나
+    할당량 대기가 실행 마감 시간을 넘으면 기다리지 않고 DeadlineExceeded를 전달한다. 호출 수, 대기
+    시간, 재시도 수는 성능 모니터에 'sheets_request' 지표로 기록한다.
+    """
+
+    def __init__(self, read_per_minute: float = SHEETS_READ_PER_MINUTE,
+                 write_per_minute: float = SHEETS_WRITE_PER_MINUTE,
+                 max_retries: int = SHEETS_MAX_RETRIES, base_delay: float = SHEETS_RETRY_BASE_DELAY,
+                 max_delay: float = SHEETS_RETRY_MAX_DELAY):
+        self.buckets = {
+            'read': TokenBucket(read_per_minute),
+            'write': TokenBucket(write_per_minute)
+        }
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stats: Dict[str, Dict[str, float]] = {
+            kind: {'requests': 0, 'throttled_seconds': 0.0, 'retries': 0, 'failures': 0}
+            for kind in self.buckets
+        }
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _status(error: HttpError) -> int:
+        return int(getattr(error.resp, 'status', 0) or 0)
+
+    def _retry_delay(self, attempt: int, error: HttpError) -> float:
+        """Retry-After 헤더 우선, 없으면 지수 백오프 + 지터"""
+        value = error.resp.get('retry-after') if hasattr(error.resp, 'get') else None
+        if value:
+            try:
+                return min(max(0.0, float(value)), self.max_delay)
+            except ValueError:
+                pass
+        backoff = self.base_delay * (2 ** (attempt - 1))
+        return min(backoff * random.uniform(0.5, 1.0), self.max_delay)
+
+    def _count(self, kind: str, **values):
+        with self.lock:
+            for key, value in values.items():
+                self.stats[kind][key] += value
+
+    def execute(self, request, kind: str = 'read', idempotent: bool = True, deadline=None):
+        """API 요청 실행 (할당량 대기, 일시적 오류 재시도 후에도 실패하면 HttpError 전달)
+
+        idempotent=False면 429만 재시도한다 (5xx는 서버에 반영됐을 수 있음).
+        """
+        bucket = self.buckets[kind]
+        retry_statuses = RETRY_STATUSES if idempotent else {429}
+        attempt = 0
+        while True:
+            waited = bucket.acquire(deadline)
+            start = time.perf_counter()
+            try:
+                result = request.execute()
+            except HttpError as e:
+                duration = time.perf_counter() - start
+                status = self._status(e)
+                performance_monitor.record_sheets_request(kind, duration, False, waited)
+                self._count(kind, requests=1, throttled_seconds=waited)
+                if status not in retry_statuses or attempt >= self.max_retries:
+                    self._count(kind, failures=1)
+                    raise
+                attempt += 1
+                delay = self._retry_delay(attempt, e)
+                if deadline is not None and delay >= deadline.remaining():
+                    self._count(kind, failures=1)
+                    raise DeadlineExceeded(
+                        f"Sheets {kind} 요청 {status} 응답 - 재시도 대기({delay:.1f}초)가 마감 시간을 넘어 중단") from e
+                if status == 429:
+                    bucket.pause(delay)  # 다른 스레드의 요청도 함께 멈춤
+                logger.warning(f"Sheets {kind} 요청 {status} 응답 - {delay:.1f}초 후 재시도 ({attempt}/{self.max_retries})")
+                self._count(kind, retries=1)
+                time.sleep(delay)
+                continue
+            performance_monitor.record_sheets_request(kind, time.perf_counter() - start, True, waited)
+            self._count(kind, requests=1, throttled_seconds=waited)
+            return result
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            return {kind: dict(values) for kind, values in self.stats.items()}
+
+
+# 전역 할당량 관리자 (할당량은 프로젝트/계정 단위라 모든 GoogleSheetsManager가 공유)
+sheets_quota = SheetsQuotaGovernor()
@@ -1,5 +1,8 @@
 # 스마트 뉴스 필터링 모듈
 import re
+import logging
+
+item_logger = logging.getLogger('crawler.items')  # 기사 단위 메시지 (기본 비활성)
 
 class SmartNewsFilter:
     def __init__(self):
@@ -125,7 +128,7 @@ class SmartNewsFilter:
             if self.is_valid_news(title, link):
                 filtered_news.append(news)
             else:
-                print(f"필터링 제외: {title[:30]}...")
+                item_logger.debug("필터링 제외: %.30s...", title, extra={'msg_type': 'filtered'})
         
         return filtered_news
 
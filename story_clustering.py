@@ -0,0 +1,153 @@
+# 기사 묶음 모듈 - 같은 날 여러 매체의 같은 사건 기사를 해시 n-gram 희소 벡터 코사인 유사도로 묶음
+import argparse
+import logging
+from typing import Dict, List
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from title_tokenizer import default_tokenizer
+from url_canonicalizer import url_key
+
+logger = logging.getLogger(__name__)
+
+CLUSTER_FIELD = '묶음'
+
+
+def feature_matrix(records: List[Dict], dimensions: int = 1 << 18, body_weight: float = 0.5) -> sparse.csr_matrix:
+    """기사 → 해시 셔글 TF-IDF 행 벡터 (행마다 L2 정규화)
+
+    제목 셔글은 가중치 1, 본문이 있으면 본문 셔글을 body_weight로 더한다. IDF는
+    묶는 기사들 안에서 계산해 그날 흔한 '교육', '학교' 같은 n-gram의 영향을 줄인다.
+    """
+    rows, cols, values = [], [], []
+    for row, record in enumerate(records):
+        features: Dict[int, float] = {}
+        for shingle in default_tokenizer.hashed_shingles(record.get('제목', '')):
+            features[shingle % dimensions] = 1.0
+        if record.get('본문'):
+            for shingle in default_tokenizer.hashed_shingles(record['본문']):
+                column = shingle % dimensions
+                features[column] = features.get(column, 0.0) + body_weight
+        rows.extend([row] * len(features))
+        cols.extend(features)
+        values.extend(features.values())
+
+    matrix = sparse.csr_matrix((np.asarray(values, dtype=np.float32), (rows, cols)),
+                               shape=(len(records), dimensions))
+    doc_freq = np.bincount(matrix.indices, minlength=dimensions)
+    idf = np.log((1 + len(records)) / (1 + doc_freq)).astype(np.float32) + 1
+    matrix = matrix @ sparse.diags(idf)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ matrix)
+
+
+def cluster_labels(records: List[Dict], threshold: float = 0.35) -> np.ndarray:
+    """코사인 유사도가 threshold 이상인 기사끼리 이은 연결 요소 번호"""
+    if not records:
+        return np.zeros(0, dtype=np.int32)
+    matrix = feature_matrix(records)
+    similarity = matrix @ matrix.T
+    similarity.data[similarity.data < threshold] = 0
+    similarity.eliminate_zeros()
+    _, labels = connected_components(similarity, directed=False)
+    return labels
+
+
+class StoryClusterer:
+    """날짜별 기사 묶음 지정
+
+    새 기사를 같은 날짜에 이미 저장된 기사와 함께 한 번의 행렬 곱으로 비교한다.
+    기존 기사와 같은 묶음이 되면 기존 묶음 ID를 이어받고(가장 먼저 생긴 ID),
+    아니면 '날짜-첫 기사 링크 키' 형태의 새 ID를 붙인다. 저장된 기사의 ID는 바꾸지 않는다.
+    """
+
+    def __init__(self, threshold: float = 0.35, max_day_records: int = 5000):
+        self.threshold = threshold
+        self.max_day_records = max_day_records
+
+    def assign(self, news_list: List[Dict], day_records=None) -> int:
+        """news_list 각 기사에 묶음 ID 지정, 다른 매체 기사와 묶인 새 기사 수 반환
+
+        day_records(날짜 → 저장된 기사 목록)를 주면 그날 기존 기사의 묶음을 이어받는다.
+        """
+        by_day: Dict[str, List[Dict]] = {}
+        for news in news_list:
+            by_day.setdefault(str(news.get('날짜', ''))[:10], []).append(news)
+
+        grouped = 0
+        for day, new_records in by_day.items():
+            stored = [record for record in (day_records(day) if day_records else [])
+                      if record.get(CLUSTER_FIELD)][:self.max_day_records]
+            batch = stored + new_records
+            labels = cluster_labels(batch, self.threshold)
+
+            # 묶음별 기존 ID (가장 작은 ID가 먼저 생긴 묶음)
+            inherited: Dict[int, str] = {}
+            for record, label in zip(stored, labels):
+                current = inherited.get(label)
+                if current is None or record[CLUSTER_FIELD] < current:
+                    inherited[label] = record[CLUSTER_FIELD]
+
+            members = np.bincount(labels)
+            for record, label in zip(new_records, labels[len(stored):]):
+                if label not in inherited:
+                    inherited[label] = f"{day}-{url_key(record.get('링크') or record.get('제목', ''))[:8]}"
+                record[CLUSTER_FIELD] = inherited[label]
+                if members[label] > 1:
+                    grouped += 1
+        return grouped
+
+
+def group_by_cluster(records: List[Dict]) -> Dict[str, List[Dict]]:
+    """묶음 ID → 기사 목록 (묶음 없는 기사는 제외)"""
+    clusters: Dict[str, List[Dict]] = {}
+    for record in records:
+        if record.get(CLUSTER_FIELD):
+            clusters.setdefault(record[CLUSTER_FIELD], []).append(record)
+    return clusters
+
+
+def main():
+    """날짜별 사건 묶음 보기 (여러 매체가 보도한 묶음부터)"""
+    from datetime import date
+    from config import NEWS_HISTORY_FILE, STORY_CLUSTER_THRESHOLD
+    from search_index import SearchIndex
+
+    parser = argparse.ArgumentParser(description='날짜별 기사 묶음 보기')
+    parser.add_argument('--date', default=date.today().strftime('%Y-%m-%d'), help='YYYY-MM-DD')
+    parser.add_argument('--min-sources', type=int, default=2, help='출력할 묶음의 최소 매체 수')
+    parser.add_argument('--recluster', action='store_true',
+                        help='저장된 묶음 ID 대신 그날 기사 전체를 다시 묶어서 출력')
+    parser.add_argument('--threshold', type=float, default=STORY_CLUSTER_THRESHOLD)
+    args = parser.parse_args()
+
+    index = SearchIndex(NEWS_HISTORY_FILE)
+    try:
+        records = index.search(since=args.date, until=args.date, limit=10 ** 6)
+    finally:
+        index.close()
+
+    if args.recluster:
+        for record in records:
+            record.pop(CLUSTER_FIELD, None)
+        StoryClusterer(args.threshold).assign(records)
+
+    clusters = sorted(group_by_cluster(records).items(),
+                      key=lambda item: len({r.get('출처') for r in item[1]}), reverse=True)
+    shown = 0
+    for cluster_id, members in clusters:
+        sources = sorted({record.get('출처', '') for record in members})
+        if len(sources) < args.min_sources:
+            continue
+        shown += 1
+        print(f"[{cluster_id}] 기사 {len(members)}개, 매체 {len(sources)}곳: {', '.join(sources)}")
+        for record in members:
+            print(f"    {record.get('출처', ''):<8} {record.get('제목', '')}")
+    print(f"{args.date}: 기사 {len(records)}개, 묶음 {len(clusters)}개 (매체 {args.min_sources}곳 이상 {shown}개)")
+
+
+if __name__ == "__main__":
+    main()
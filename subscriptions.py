@@ -0,0 +1,177 @@
+# 구독 매칭 모듈 - 저장된 검색어 구독 전체를 하나의 용어 색인으로 묶어 기사마다 한 번에 매칭
+import argparse
+import json
+import logging
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from title_tokenizer import default_tokenizer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Subscription:
+    """저장된 검색어 구독
+
+    query는 공백으로 구분한 용어를 모두 포함(AND), '|'로 구분한 절 중 하나 이상(OR),
+    '-용어'는 제외를 뜻한다. 예: "고교학점제 | 학점제 고교 -대학"
+    """
+    name: str
+    query: str
+    worksheet: Optional[str] = None        # 일치 기사를 따로 올릴 워크시트
+    recipients: List[str] = field(default_factory=list)  # 일치 기사를 메일로 받을 팀 주소
+    sources: List[str] = field(default_factory=list)  # 비어 있으면 모든 출처
+
+    def clauses(self) -> List[Tuple[Set[str], Set[str]]]:
+        """검색어 → (포함 용어, 제외 용어) 절 목록"""
+        parsed = []
+        for part in self.query.split('|'):
+            required, excluded = set(), set()
+            for word in part.split():
+                target = excluded if word.startswith('-') else required
+                target.update(default_tokenizer.normalize(word.lstrip('-')).split())
+            if required:
+                parsed.append((required, excluded))
+            elif excluded:
+                logger.warning(f"제외 용어만 있는 절은 무시합니다: {self.name} '{part.strip()}'")
+        return parsed
+
+
+class SubscriptionMatcher:
+    """구독 매칭기
+
+    모든 구독의 용어를 용어 → 절 역색인으로 합쳐 두고, 제목을 한 번 훑으며 용어 앞
+    두 글자 색인으로 등장 용어를 찾는다. 기사당 비용은 제목 길이와 실제로 등장한
+    용어의 절 수에 비례하고 구독 수에 비례하지 않는다.
+    """
+
+    def __init__(self, subscriptions: List[Subscription]):
+        self.subscriptions = subscriptions
+        self.clause_owner: List[int] = []          # 절 → 구독 번호
+        self.clause_size: List[int] = []           # 절 → 포함 용어 수
+        self.required: Dict[str, List[int]] = defaultdict(list)   # 용어 → 포함 절
+        self.excluded: Dict[str, List[int]] = defaultdict(list)   # 용어 → 제외 절
+        self.prefixes: Dict[str, List[str]] = defaultdict(list)   # 앞 두 글자(한 글자 용어는 그대로) → 용어
+        self.source_filters: Dict[int, Set[str]] = {}
+        self._compile()
+
+    def _compile(self):
+        terms = set()
+        for owner, subscription in enumerate(self.subscriptions):
+            if subscription.sources:
+                self.source_filters[owner] = set(subscription.sources)
+            for required, excluded in subscription.clauses():
+                clause = len(self.clause_owner)
+                self.clause_owner.append(owner)
+                self.clause_size.append(len(required))
+                for term in required:
+                    self.required[term].append(clause)
+                for term in excluded:
+                    self.excluded[term].append(clause)
+                terms.update(required | excluded)
+        for term in terms:
+            self.prefixes[term[:2]].append(term)
+        self.term_count = len(terms)
+
+    def __len__(self) -> int:
+        return len(self.subscriptions)
+
+    def find_terms(self, title: str) -> Set[str]:
+        """제목에 부분 문자열로 등장하는 구독 용어"""
+        text = default_tokenizer.normalize(title)
+        found = set()
+        for i in range(len(text)):
+            for key in (text[i], text[i:i + 2]):
+                for term in self.prefixes.get(key, ()):
+                    if text.startswith(term, i):
+                        found.add(term)
+        return found
+
+    def match(self, record: Dict) -> List[Subscription]:
+        """기사에 일치하는 구독 목록"""
+        terms = self.find_terms(record.get('제목', ''))
+        hits: Dict[int, int] = defaultdict(int)
+        for term in terms:
+            for clause in self.required.get(term, ()):
+                hits[clause] += 1
+        blocked = {clause for term in terms for clause in self.excluded.get(term, ())}
+
+        owners = set()
+        for clause, count in hits.items():
+            if count == self.clause_size[clause] and clause not in blocked:
+                owner = self.clause_owner[clause]
+                allowed = self.source_filters.get(owner)
+                if allowed is None or record.get('출처') in allowed:
+                    owners.add(owner)
+        return [self.subscriptions[owner] for owner in sorted(owners)]
+
+    def route(self, records: List[Dict]) -> Dict[str, List[Dict]]:
+        """구독 이름 → 일치 기사 목록"""
+        routed: Dict[str, List[Dict]] = defaultdict(list)
+        for record in records:
+            for subscription in self.match(record):
+                routed[subscription.name].append(record)
+        return dict(routed)
+
+    def get(self, name: str) -> Optional[Subscription]:
+        for subscription in self.subscriptions:
+            if subscription.name == name:
+                return subscription
+        return None
+
+
+def build_message(subscription: Subscription, matched: List[Dict]) -> Tuple[str, str]:
+    """구독 메일 제목/본문 (일치 기사 전체 목록)"""
+    subject = f"[교육 뉴스 구독: {subscription.name}] 새 기사 {len(matched)}건"
+    lines = [f"{news.get('날짜', '')} {news.get('출처', '')} {news.get('제목', '')}\n    {news.get('링크', '')}"
+             for news in matched]
+    return subject, '\n'.join(lines)
+
+
+def load_subscriptions(config_file: str = 'subscriptions.json') -> SubscriptionMatcher:
+    """구독 설정 파일 읽기 (없으면 빈 매칭기)"""
+    subscriptions = []
+    if os.path.exists(config_file):
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                for item in json.load(f):
+                    subscriptions.append(Subscription(**item))
+        except Exception as e:
+            logger.warning(f"구독 설정 로드 실패: {e}")
+    return SubscriptionMatcher(subscriptions)
+
+
+def main():
+    """구독 매칭 확인 (기사 이력에서 최근 기사를 매칭해 구독별 건수 출력)"""
+    from article_store import ArticleStore
+    from config import NEWS_HISTORY_FILE, SUBSCRIPTIONS_FILE
+
+    parser = argparse.ArgumentParser(description='구독 매칭 확인')
+    parser.add_argument('--config', default=SUBSCRIPTIONS_FILE)
+    parser.add_argument('--recent', type=int, default=1000, help='매칭할 최근 기사 수')
+    parser.add_argument('--show', type=int, default=3, help='구독별로 출력할 기사 수')
+    args = parser.parse_args()
+
+    matcher = load_subscriptions(args.config)
+    print(f"구독 {len(matcher)}개, 용어 {matcher.term_count}개")
+    store = ArticleStore(NEWS_HISTORY_FILE)
+    try:
+        records = list(store.iter_records())[-args.recent:]
+    finally:
+        store.close()
+
+    routed = matcher.route(records)
+    for subscription in matcher.subscriptions:
+        matched = routed.get(subscription.name, [])
+        target = subscription.worksheet or '-'
+        recipients = ', '.join(subscription.recipients) or '-'
+        print(f"{subscription.name}: {len(matched)}건 (워크시트: {target}, 수신자: {recipients})")
+        for record in matched[-args.show:]:
+            print(f"    {record.get('날짜', '')} {record.get('출처', '')} {record.get('제목', '')}")
+
+
+if __name__ == "__main__":
+    main()
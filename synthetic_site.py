@@ -0,0 +1,343 @@
+# 합성 뉴스 사이트 모듈 - 오프라인 부하/규모 테스트용 교육 뉴스 목록 페이지 서버
+import argparse
+import hashlib
+import json
+import logging
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+# 제목 구성 요소 (스마트 필터 제외 키워드를 피하고 조합마다 셔글이 충분히 다르도록)
+REGIONS = ['서울', '부산', '대구', '인천', '광주', '대전', '울산', '세종', '경기', '강원',
+           '충북', '충남', '전북', '전남', '경북', '경남', '제주']
+ACTORS = ['교육청', '교육부', '교원노조', '학부모회', '대학교', '교육감', '교육위원회', '교사연맹']
+TOPICS = ['고교학점제', '늘봄학교', '디지털 교과서', '수능 출제', '교권 보호', '학교폭력 예방',
+          '기초학력 진단', '유보통합', '특수학급 증설', '다문화 학생 적응', '급식 안전 점검',
+          '방과후 수업', '교원 정원 감축', '학령인구 감소', '대입 전형 개편', '원격수업 인프라',
+          '과학고 신설', '작은학교 통폐합', '학생 정신건강', '예술 교육 확대', '체육 수업 내실화']
+ACTIONS = ['발표', '시행', '추진 계획 확정', '개선 방안 검토', '예산 확대', '도입 논의 본격화',
+           '성과 분석 공개', '시범 운영 시작', '실태 점검 착수', '보완책 마련', '전면 재검토',
+           '의결', '중간 평가 실시']
+DETAILS = ['내년 3월부터', '올해 2학기', '초등 1~2학년 대상', '고교 전 학년', '교사 의견 반영',
+           '학부모 설문 결과', '국회 토론회서', '현장 혼란 우려', '첫 적용', '시도별 편차 커',
+           '{n}개교 참여', '학생 {n}명 대상', '{n}억 원 투입', '{n}곳 추가']
+REPORTERS = ['김민준', '이서연', '박지훈', '최수아', '정예준', '강하은', '조도윤', '윤지우']
+
+LIST_PATH = '/news/articleList.html'
+VIEW_PATH = '/news/articleView.html'
+FEED_PATH = '/rss/allArticle.xml'
+
+
+class SiteConfig:
+    """합성 사이트 생성 설정"""
+
+    def __init__(self, sites: int = 10, pages: int = 3, links: int = 20, dup_rate: float = 0.1,
+                 latency_ms: float = 0.0, error_rate: float = 0.0, page_kb: int = 30, seed: int = 1):
+        self.sites = sites
+        self.pages = pages              # 소스당 목록 페이지 수
+        self.links = links              # 목록 페이지당 기사 수
+        self.dup_rate = dup_rate        # 다른 사이트 기사를 다시 싣는 비율 (매체 간 중복)
+        self.latency_ms = latency_ms    # 평균 응답 지연 (0.5~1.5배 지터)
+        self.error_rate = error_rate    # 503(Retry-After) 응답 비율
+        self.page_kb = page_kb          # 목록 페이지 대략적 크기 (푸터 뒤 채움 포함)
+        self.seed = seed
+
+
+def _rng(*parts) -> random.Random:
+    """위치마다 고정된 난수 생성기 (같은 설정이면 항상 같은 페이지)"""
+    digest = hashlib.blake2b('/'.join(map(str, parts)).encode('utf-8'), digest_size=8).digest()
+    return random.Random(int.from_bytes(digest, 'big'))
+
+
+def article_title(config: SiteConfig, site: int, article: int) -> str:
+    """사이트/기사 번호별 제목"""
+    rng = _rng(config.seed, 'title', site, article)
+    detail = rng.choice(DETAILS).format(n=rng.randint(3, 900))
+    return (f"{rng.choice(REGIONS)} {rng.choice(ACTORS)}, {rng.choice(TOPICS)} "
+            f"{rng.choice(ACTIONS)}…{detail}")
+
+
+def list_articles(config: SiteConfig, site: int, page: int) -> List[Dict]:
+    """목록 페이지에 실릴 기사 (일부는 다른 사이트 기사의 제목을 그대로 사용)"""
+    rng = _rng(config.seed, 'list', site, page)
+    articles = []
+    for slot in range(config.links):
+        article_id = 100000 + (page - 1) * config.links + slot
+        title = article_title(config, site, article_id)
+        if config.sites > 1 and rng.random() < config.dup_rate:
+            other = rng.choice([s for s in range(config.sites) if s != site])
+            title = article_title(config, other, 100000 + rng.randrange(config.pages * config.links))
+        articles.append({
+            'id': article_id,
+            'title': title,
+            'reporter': rng.choice(REPORTERS),
+            'time': f"{rng.randint(7, 22):02d}:{rng.randint(0, 59):02d}"
+        })
+    return articles
+
+
+def render_list_page(config: SiteConfig, site: int, page: int) -> bytes:
+    """기사 목록 페이지 HTML (메뉴/인기 기사/페이지 이동/푸터 포함)"""
+    prefix = f"/s{site}"
+    items = []
+    for article in list_articles(config, site, page):
+        items.append(
+            f'<li><h4 class="titles"><a href="{prefix}{VIEW_PATH}?idxno={article["id"]}">'
+            f'{article["title"]}</a></h4>'
+            f'<span class="byline"><em>{article["reporter"]} 기자</em> <em>{article["time"]}</em></span></li>'
+        )
+    pagination = ''.join(f'<a href="{prefix}{LIST_PATH}?page={p}">{p}</a>' for p in range(1, config.pages + 1))
+    html = (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8">'
+        f'<title>합성교육신문{site:03d}</title></head><body>'
+        '<header><nav><a href="/">홈</a><a href="/login">로그인</a><a href="/search">검색</a>'
+        '<a href="/subscribe">구독하기</a></nav></header>'
+        '<aside><h2>많이 본 기사</h2></aside>'
+        f'<section id="section-list"><ul class="type1">{"".join(items)}</ul></section>'
+        f'<div class="pagination">{pagination}</div>'
+        '<footer><a href="/privacy">개인정보처리방침</a><a href="/terms">이용약관</a></footer>'
+    )
+    # 푸터 뒤 채움 (광고 스크립트 등 목록과 무관한 뒷부분)
+    filler = max(0, config.page_kb * 1024 - len(html.encode('utf-8')))
+    html += f'<script>/*{"x" * filler}*/</script></body></html>'
+    return html.encode('utf-8')
+
+
+def render_feed(config: SiteConfig, site: int) -> bytes:
+    """전체 기사 RSS 2.0 피드 (목록 페이지와 같은 기사, 최신순)"""
+    items = []
+    for page in range(1, config.pages + 1):
+        for article in list_articles(config, site, page):
+            minute = article['id'] % 60
+            items.append(
+                f"<item><title><![CDATA[{article['title']}]]></title>"
+                f"<link>/s{site}{VIEW_PATH}?idxno={article['id']}</link>"
+                f"<author>{article['reporter']} 기자</author>"
+                f"<pubDate>Mon, 20 Oct 2025 {article['time']}:{minute:02d} +0900</pubDate></item>"
+            )
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f'<title>합성교육신문{site:03d}</title>{"".join(items)}</channel></rss>').encode('utf-8')
+
+
+def render_article_page(config: SiteConfig, site: int, article_id: int) -> bytes:
+    title = article_title(config, site, article_id)
+    body = ''.join(f'<p>{title} 관련 본문 문단 {i}.</p>' for i in range(1, 6))
+    return (f'<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>{title}</title></head>'
+            f'<body><article><h1>{title}</h1>{body}</article></body></html>').encode('utf-8')
+
+
+class SyntheticNewsHandler(BaseHTTPRequestHandler):
+    """/s<번호>/news/articleList.html?page=N, /s<번호>/news/articleView.html?idxno=N"""
+
+    server_version = 'SyntheticNews/1.0'
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        config: SiteConfig = self.server.config
+        if config.latency_ms:
+            time.sleep(config.latency_ms / 1000 * random.uniform(0.5, 1.5))
+        if config.error_rate and random.random() < config.error_rate:
+            self.send_response(503)
+            self.send_header('Retry-After', '1')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            self.server.count_request(0)
+            return
+
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        site_part, _, path = parsed.path[1:].partition('/')
+        try:
+            site = int(site_part[1:]) if site_part.startswith('s') else -1
+            if not 0 <= site < config.sites:
+                raise ValueError(site_part)
+            if '/' + path == LIST_PATH:
+                page = int(query.get('page', ['1'])[0])
+                if not 1 <= page <= config.pages:
+                    raise ValueError(page)
+                body = render_list_page(config, site, page)
+            elif '/' + path == FEED_PATH:
+                body = render_feed(config, site)
+                etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    self.server.count_request(0)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                self.server.count_request(len(body))
+                return
+            elif '/' + path == VIEW_PATH:
+                body = render_article_page(config, site, int(query['idxno'][0]))
+            else:
+                raise ValueError(path)
+        except (KeyError, ValueError):
+            self.send_error(404)
+            self.server.count_request(0)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count_request(len(body))
+
+
+class SyntheticNewsServer(ThreadingHTTPServer):
+    """합성 뉴스 사이트 서버 (요청마다 스레드)"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, config: SiteConfig, host: str = '127.0.0.1', port: int = 0):
+        super().__init__((host, port), SyntheticNewsHandler)
+        self.config = config
+        self.requests = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+
+    def count_request(self, size: int):
+        with self.lock:
+            self.requests += 1
+            self.bytes_sent += size
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'SyntheticNewsServer':
+        """백그라운드 스레드에서 서비스 시작"""
+        self.thread = threading.Thread(target=self.serve_forever, name='synthetic-news', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def sources(self, feeds: bool = False) -> List[Dict]:
+        """NEWS_SOURCES 형식의 소스 목록 (feeds: RSS 피드로 수집)"""
+        config = self.config
+        sources = []
+        for site in range(config.sites):
+            source = {
+                'name': f'합성교육신문{site:03d}',
+                'url': f"{self.base_url}/s{site}{LIST_PATH}",
+                'base_url': f"{self.base_url}/s{site}/",
+                'max_pages': config.pages,
+                'max_news': config.pages * config.links,
+                'end_marker': '<footer'
+            }
+            if feeds:
+                source['feed_url'] = f"{self.base_url}/s{site}{FEED_PATH}"
+            sources.append(source)
+        return sources
+
+
+def run_load_test(config: SiteConfig, workers: int = 3, archive: bool = False, feeds: bool = False) -> Dict:
+    """합성 사이트 전체를 한 번 크롤링하고 처리량/중복 제거 결과 반환
+
+    지문/서킷 상태/아카이브는 임시 디렉터리에 두어 실제 실행 상태 파일을 건드리지 않는다.
+    """
+    from config import TITLE_SIMILARITY_THRESHOLD
+    from news_crawler import EducationNewsCrawler
+    from title_tokenizer import TitleShingleIndex
+
+    server = SyntheticNewsServer(config).start()
+    crawler = None
+    with tempfile.TemporaryDirectory() as state_dir:
+        try:
+            crawler = EducationNewsCrawler(max_workers=workers, state_dir=state_dir, archive=archive)
+            start = time.perf_counter()
+            news = crawler.crawl_all_sources(server.sources(feeds))
+            elapsed = time.perf_counter() - start
+        finally:
+            server.stop()
+            if crawler is not None:
+                crawler.close()
+
+    # main_final과 같은 매체 간 유사 제목 중복 제거를 거친 기사 수
+    title_index = TitleShingleIndex(threshold=TITLE_SIMILARITY_THRESHOLD)
+    after_dedup = 0
+    for item in news:
+        if not title_index.find_similar(item['제목']):
+            title_index.add(item['링크'], item['제목'])
+            after_dedup += 1
+
+    expected_pages = config.sites * config.pages
+    return {
+        'sources': config.sites,
+        'pages': expected_pages,
+        'http_requests': server.requests,
+        'http_kb': round(server.bytes_sent / 1024, 1),
+        'news': len(news),
+        'unique_titles': len({item['제목'] for item in news}),
+        'after_dedup': after_dedup,
+        'seconds': round(elapsed, 2),
+        'pages_per_second': round(expected_pages / elapsed, 1) if elapsed else 0.0,
+        'retried_requests': crawler.performance_stats['retried_requests']
+    }
+
+
+def main():
+    """합성 뉴스 사이트 서버/부하 테스트 명령"""
+    from log_config import setup_logging
+
+    parser = argparse.ArgumentParser(description='합성 교육 뉴스 사이트')
+    parser.add_argument('--sites', type=int, default=10)
+    parser.add_argument('--pages', type=int, default=3)
+    parser.add_argument('--links', type=int, default=20)
+    parser.add_argument('--dup-rate', type=float, default=0.1)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--page-kb', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=1)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    sub = subparsers.add_parser('serve', help='서버 실행 (소스 목록을 JSON으로 저장)')
+    sub.add_argument('--port', type=int, default=8765)
+    sub.add_argument('--sources-file', default='synthetic_sources.json')
+    sub = subparsers.add_parser('load', help='서버를 띄우고 전체 소스를 한 번 크롤링')
+    sub.add_argument('--workers', type=int, default=3)
+    sub.add_argument('--archive', action='store_true', help='원본 페이지 아카이브 포함')
+    sub.add_argument('--feeds', action='store_true', help='목록 페이지 대신 RSS 피드로 수집')
+
+    args = parser.parse_args()
+    config = SiteConfig(args.sites, args.pages, args.links, args.dup_rate, args.latency_ms,
+                        args.error_rate, args.page_kb, args.seed)
+
+    if args.command == 'serve':
+        setup_logging()
+        server = SyntheticNewsServer(config, port=args.port)
+        with open(args.sources_file, 'w', encoding='utf-8') as f:
+            json.dump(server.sources(), f, ensure_ascii=False, indent=2)
+        print(f"합성 뉴스 사이트 {config.sites}개: {server.base_url} (소스 목록: {args.sources_file})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    else:
+        setup_logging(level=logging.WARNING)
+        print(json.dumps(run_load_test(config, args.workers, args.archive, args.feeds), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# 기사 이력 저장소 (mmap 해시 인덱스) 테스트
+import os
+
+from article_store import ArticleStore
+
+
+def make_news(i, **fields):
+    return {'제목': f"교육 뉴스 제목 {i}", '링크': f"https://example.com/news/{i}", '출처': '테스트', **fields}
+
+
+def open_store(tmp_path, **options):
+    return ArticleStore(str(tmp_path / 'history.jsonl'), **options)
+
+
+def test_lookup_before_and_after_commit(tmp_path):
+    store = open_store(tmp_path)
+    store.append([make_news(i) for i in range(10)])
+    # 인덱스 반영 전에는 메모리 꼬리 인덱스로 찾음
+    assert store.index_mm is None
+    assert store.find_by_link('https://example.com/news/3')['제목'] == '교육 뉴스 제목 3'
+
+    store.commit(force=True)
+    assert store.index_mm is not None and store.tail_count == 0
+    assert store.find_by_link('https://example.com/news/7')['제목'] == '교육 뉴스 제목 7'
+    assert store.contains_title('교육 뉴스 제목 9')
+    assert not store.contains_link('https://example.com/news/10')
+    assert len(store) == 10
+    store.close()
+
+
+def test_link_lookup_uses_canonical_url_key(tmp_path):
+    store = open_store(tmp_path)
+    store.import_records([make_news(1, 링크='https://example.com/news/1?utm_source=feed')])
+    assert store.contains_link('http://example.com/news/1')
+    assert store.contains_link('https://example.com/news/1/?fbclid=abc')
+    store.close()
+
+
+def test_title_lookup_ignores_spacing_and_punctuation(tmp_path):
+    store = open_store(tmp_path)
+    store.import_records([make_news(1, 제목='교육부, 2026학년도 대입 개편안 발표')])
+    assert store.contains_title('교육부 2026학년도 대입 개편안 발표!')
+    assert not store.contains_title('교육부 2027학년도 대입 개편안 발표')
+    store.close()
+
+
+def test_reopen_reads_index_and_scans_only_the_tail(tmp_path):
+    store = open_store(tmp_path)
+    store.import_records([make_news(i) for i in range(5)])
+    store.close()
+
+    # 다른 프로세스가 인덱스 갱신 없이 레코드만 추가한 경우
+    writer = open_store(tmp_path, min_rebuild_records=100)
+    writer.append([make_news(5)])
+    writer.commit()
+    writer.close()
+
+    reopened = open_store(tmp_path)
+    assert reopened.indexed_count == 5
+    assert reopened.tail_count == 1
+    assert reopened.contains_link('https://example.com/news/5')
+    assert len(reopened) == 6
+    reopened.close()
+
+
+def test_incremental_commits_merge_into_the_sorted_index(tmp_path):
+    store = open_store(tmp_path, min_rebuild_records=1)
+    for batch in range(3):
+        store.append([make_news(batch * 10 + i) for i in range(10)])
+        store.commit()
+    assert store.indexed_count == 30 and store.tail_count == 0
+    hashes = [store.ENTRY.unpack_from(store.index_mm, store.HEADER.size + i * store.ENTRY.size)[0]
+              for i in range(store.link_entries)]
+    assert hashes == sorted(hashes)
+    assert all(store.contains_link(f"https://example.com/news/{i}") for i in range(30))
+    store.close()
+
+
+def test_corrupt_index_is_ignored(tmp_path):
+    store = open_store(tmp_path)
+    store.import_records([make_news(i) for i in range(3)])
+    store.close()
+    with open(store.index_file, 'r+b') as f:
+        f.truncate(os.path.getsize(store.index_file) - 1)
+
+    reopened = open_store(tmp_path)
+    assert reopened.index_mm is None
+    assert reopened.tail_count == 3
+    assert reopened.contains_link('https://example.com/news/2')
+    reopened.close()
@@ -0,0 +1,81 @@
+# 기사 검색 인덱스 (varint 포스팅) 테스트
+import json
+
+from search_index import SearchIndex, decode_postings, encode_postings
+
+
+def write_records(path, records):
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def make_news(i, 제목, 출처='교육신문', 날짜='2026-03-02'):
+    return {'제목': 제목, '링크': f"https://example.com/news/{i}", '출처': 출처, '날짜': 날짜}
+
+
+def test_postings_round_trip_with_large_deltas():
+    doc_ids = [0, 1, 127, 128, 16383, 16384, 2 ** 35, 2 ** 35 + 1]
+    data = encode_postings(doc_ids)
+    assert decode_postings(data) == doc_ids
+    # 차이값 127까지는 1바이트
+    assert len(encode_postings([5, 132])) == 2
+
+
+def test_postings_continue_from_previous_block():
+    first, second = [3, 40, 900], [901, 70000]
+    data = encode_postings(first) + encode_postings(second, previous=first[-1])
+    assert decode_postings(data) == first + second
+
+
+def test_incremental_commits_keep_postings_ascending(tmp_path):
+    store_file = str(tmp_path / 'history.jsonl')
+    write_records(store_file, [make_news(i, f"고교학점제 시행 {i}") for i in range(3)])
+    index = SearchIndex(store_file, min_rebuild_records=1)
+    index.commit()
+    first = index.postings('t:학점')
+    assert len(first) == 3 and index.tail_count == 0
+
+    write_records(store_file, [make_news(i, f"고교학점제 보완 {i}") for i in range(3, 6)])
+    assert index.refresh() == 3
+    index.commit()
+    merged = index.postings('t:학점')
+    assert merged[:3] == first
+    assert merged == sorted(merged) and len(merged) == 6
+    assert index.doc_count('t:보완') == 3
+    index.close()
+
+
+def test_search_filters_by_keyword_source_and_period(tmp_path):
+    store_file = str(tmp_path / 'history.jsonl')
+    write_records(store_file, [
+        make_news(1, '늘봄학교 전면 확대', 날짜='2026-02-27'),
+        make_news(2, '늘봄학교 강사 부족', 출처='교육일보', 날짜='2026-03-03'),
+        make_news(3, '디지털 교과서 도입 연기', 날짜='2026-03-10'),
+        make_news(4, '늘봄학교 예산 증액', 날짜='2026-04-01'),
+    ])
+    index = SearchIndex(store_file)
+
+    assert [r['링크'][-1] for r in index.search('늘봄학교')] == ['4', '2', '1']
+    assert [r['링크'][-1] for r in index.search('늘봄 강사')] == ['2']
+    assert [r['링크'][-1] for r in index.search('늘봄학교', source='교육신문')] == ['4', '1']
+    march = index.search('늘봄학교', since='2026-03-01', until='2026-03-31')
+    assert [r['링크'][-1] for r in march] == ['2']
+    assert index.search('학교 급식') == []
+    assert len(index.search(limit=2)) == 2
+    index.close()
+
+
+def test_reopen_uses_index_and_tail(tmp_path):
+    store_file = str(tmp_path / 'history.jsonl')
+    write_records(store_file, [make_news(i, f"교원 성과급 개편 {i}") for i in range(4)])
+    index = SearchIndex(store_file)
+    index.commit(force=True)
+    index.close()
+
+    write_records(store_file, [make_news(4, '교원 성과급 폐지 논의')])
+    reopened = SearchIndex(store_file)
+    assert reopened.indexed_count == 4 and reopened.tail_count == 1
+    assert [r['제목'] for r in reopened.search('폐지')] == ['교원 성과급 폐지 논의']
+    assert len(reopened.search('성과급')) == 5
+    reopened.close()
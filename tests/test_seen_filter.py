@@ -0,0 +1,68 @@
+# 수집 이력 블룸 필터 테스트
+from seen_filter import BloomFilter, ScalableBloomFilter, SeenArticleFilter
+
+
+def test_bloom_filter_has_no_false_negatives(tmp_path):
+    bloom = BloomFilter(str(tmp_path / 'seen.bloom'), capacity=1000, error_rate=0.01)
+    keys = [f"url:{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    bloom.close()
+
+
+def test_bloom_filter_false_positive_rate_is_near_target(tmp_path):
+    bloom = BloomFilter(str(tmp_path / 'seen.bloom'), capacity=2000, error_rate=0.01)
+    for i in range(2000):
+        bloom.add(f"in:{i}")
+    false_positives = sum(f"out:{i}" in bloom for i in range(10000))
+    assert false_positives / 10000 < 0.03
+    bloom.close()
+
+
+def test_bloom_filter_state_survives_reopen(tmp_path):
+    path = str(tmp_path / 'seen.bloom')
+    bloom = BloomFilter(path, capacity=100)
+    assert bloom.add('title:abc')
+    assert not bloom.add('title:abc')
+    bloom.close()
+
+    reopened = BloomFilter(path, capacity=100)
+    assert 'title:abc' in reopened
+    assert reopened.count == 1
+    reopened.close()
+
+
+def test_scalable_bloom_filter_adds_slices_when_full(tmp_path):
+    prefix = str(tmp_path / 'seen.bloom')
+    bloom = ScalableBloomFilter(prefix, initial_capacity=50, error_rate=0.01)
+    for i in range(200):
+        bloom.add(f"key:{i}")
+    assert len(bloom.filters) > 1
+    assert all(f"key:{i}" in bloom for i in range(200))
+    bloom.close()
+
+    reopened = ScalableBloomFilter(prefix, initial_capacity=50, error_rate=0.01)
+    assert len(reopened.filters) == len(bloom.filters)
+    assert 'key:199' in reopened
+    reopened.close()
+
+
+def test_seen_filter_matches_canonical_links_and_titles(tmp_path):
+    seen = SeenArticleFilter(str(tmp_path / 'seen.bloom'), capacity=100)
+    seen.add_news([{'링크': 'https://www.edupress.kr/news/articleView.html?idxno=1&utm_source=x',
+                    '제목': '고교학점제 전면 시행'}])
+    assert seen.is_seen_link('http://edupress.kr/news/articleView.html?idxno=1')
+    assert seen.is_seen_title('고교학점제, 전면 시행!')
+    assert not seen.is_seen({'링크': 'https://www.edupress.kr/news/articleView.html?idxno=2',
+                             '제목': '다른 기사'})
+    seen.close()
+
+
+def test_seen_filter_confirms_positives_with_the_store(tmp_path):
+    seen = SeenArticleFilter(str(tmp_path / 'seen.bloom'), capacity=100,
+                             confirm_link=lambda link: False)
+    seen.add_news([{'링크': 'https://example.com/news/1'}])
+    assert not seen.is_seen_link('https://example.com/news/1')
+    assert seen.stats['false_positive'] == 1
+    seen.close()
@@ -0,0 +1,36 @@
+# 구독 매칭 (용어 역색인) 테스트
+from subscriptions import Subscription, SubscriptionMatcher
+
+
+def names(matcher, 제목, 출처='교육신문'):
+    return [s.name for s in matcher.match({'제목': 제목, '출처': 출처})]
+
+
+def test_and_or_and_excluded_terms():
+    matcher = SubscriptionMatcher([
+        Subscription('학점제', '고교학점제 | 학점제 고교 -대학'),
+        Subscription('늘봄', '늘봄학교 예산'),
+    ])
+    assert names(matcher, '고교학점제 전면 시행') == ['학점제']
+    assert names(matcher, '고교 학점제 보완책 발표') == ['학점제']
+    assert names(matcher, '대학 학점제 고교 연계') == []
+    assert names(matcher, '늘봄학교 예산 증액') == ['늘봄']
+    assert names(matcher, '늘봄학교 강사 부족') == []
+
+
+def test_source_filter_and_route():
+    matcher = SubscriptionMatcher([
+        Subscription('전체', '교권'),
+        Subscription('교육일보만', '교권', sources=['교육일보']),
+    ])
+    records = [{'제목': '교권 보호 법안 통과', '출처': '교육신문'},
+               {'제목': '교권 침해 대응', '출처': '교육일보'}]
+    routed = matcher.route(records)
+    assert routed['전체'] == records
+    assert routed['교육일보만'] == records[1:]
+
+
+def test_exclusion_only_clause_is_ignored():
+    matcher = SubscriptionMatcher([Subscription('제외만', '-대학')])
+    assert matcher.term_count == 0
+    assert names(matcher, '초등학교 소식') == []
@@ -0,0 +1,105 @@
+# 업로드 대기열 (재시도/전달 불가) 테스트
+import pytest
+
+from run_deadline import DeadlineExceeded
+from upload_outbox import UploadOutbox
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = UploadOutbox(str(tmp_path / 'outbox.db'), max_attempts=2)
+    yield outbox
+    outbox.close()
+
+
+def make_news(i, **fields):
+    return {'제목': f"교육 뉴스 {i}", '링크': f"https://example.com/news/{i}", **fields}
+
+
+class Uploader:
+    """워크시트별로 실패/성공을 정해 둔 업로드 함수"""
+
+    def __init__(self, failing=(), error=None):
+        self.failing = set(failing)
+        self.error = error
+        self.calls = []
+
+    def __call__(self, news_list, worksheet):
+        self.calls.append((worksheet, len(news_list)))
+        if worksheet in self.failing:
+            if self.error:
+                raise self.error
+            return False
+        return True
+
+
+def test_enqueue_dedups_by_canonical_link(outbox):
+    assert outbox.enqueue([make_news(1), make_news(2)], '뉴스') == 2
+    assert outbox.enqueue([make_news(1, 링크='http://example.com/news/1?utm_source=x')], '뉴스') == 0
+    # 같은 기사라도 워크시트가 다르면 따로 보냄
+    assert outbox.enqueue_many({'뉴스': [make_news(2)], '구독': [make_news(2)]}) == 1
+    assert outbox.pending_count() == 3
+
+
+def test_delivered_rows_are_not_sent_again(outbox):
+    outbox.enqueue([make_news(i) for i in range(3)], '뉴스')
+    uploader = Uploader()
+    assert outbox.drain(uploader) == 3
+    assert outbox.drain(uploader) == 0
+    assert uploader.calls == [('뉴스', 3)]
+    assert outbox.pending_count() == 0
+
+
+def test_failed_rows_become_dead_letters_after_max_attempts(outbox):
+    outbox.enqueue([make_news(1)], '뉴스')
+    uploader = Uploader(failing={'뉴스'}, error=RuntimeError('권한 없음'))
+
+    assert outbox.drain(uploader) == 0
+    assert outbox.pending_count() == 1 and outbox.dead_letters() == {}
+    assert outbox.drain(uploader) == 0
+    assert outbox.pending_count() == 0
+    assert outbox.dead_letters() == {'뉴스': {'count': 1, 'last_error': '권한 없음'}}
+    # 전달 불가 행은 더 보내지 않음
+    outbox.drain(uploader)
+    assert len(uploader.calls) == 2
+
+
+def test_dead_letters_do_not_block_other_rows(outbox):
+    outbox.enqueue([make_news(1)], '뉴스')
+    failing = Uploader(failing={'뉴스'})
+    outbox.drain(failing)
+    outbox.enqueue([make_news(2)], '뉴스')
+    # 첫 행이 전달 불가가 된 뒤 같은 실행에서 다음 행을 계속 보냄
+    calls = []
+
+    def upload(news_list, worksheet):
+        calls.append([news['제목'] for news in news_list])
+        return news_list[0]['제목'] != '교육 뉴스 1'
+
+    assert outbox.drain(upload) == 1
+    assert calls == [['교육 뉴스 1', '교육 뉴스 2'], ['교육 뉴스 2']]
+    assert outbox.dead_letters()['뉴스']['count'] == 1
+
+
+def test_retry_dead_letters_requeues_rows(outbox):
+    outbox.enqueue([make_news(1)], '뉴스')
+    outbox.enqueue([make_news(2)], '구독')
+    failing = Uploader(failing={'뉴스', '구독'})
+    outbox.drain(failing)
+    outbox.drain(failing)
+    assert set(outbox.dead_letters()) == {'뉴스', '구독'}
+
+    assert outbox.retry_dead_letters('뉴스') == 1
+    assert set(outbox.dead_letters()) == {'구독'}
+    assert outbox.drain(Uploader()) == 1
+    assert outbox.pending_count() == 0
+
+
+def test_deadline_does_not_count_as_an_attempt(outbox):
+    outbox.enqueue([make_news(1)], '뉴스')
+    timed_out = Uploader(failing={'뉴스'}, error=DeadlineExceeded('시간 초과'))
+    for _ in range(3):
+        assert outbox.drain(timed_out) == 0
+    assert outbox.dead_letters() == {}
+    assert outbox.pending_count() == 1
+    assert outbox.drain(Uploader()) == 1
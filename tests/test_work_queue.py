@@ -0,0 +1,115 @@
+# 작업 대기열 (임대/만료/재임대) 테스트
+import time
+
+import pytest
+
+from work_queue import SqliteWorkQueue, WorkQueue, run_worker, source_tasks
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = SqliteWorkQueue(str(tmp_path / 'queue.db'), max_attempts=3)
+    yield queue
+    queue.close()
+
+
+class StubCrawler:
+    """소스 이름별로 정해 둔 결과/오류를 돌려주는 크롤러"""
+
+    def __init__(self, news=None, errors=None):
+        self.news = news or {}
+        self.errors = errors or {}
+        self.failed_sources = {}
+        self.crawled = []
+        self.committed = 0
+
+    def crawl_all_sources(self, sources, deadline=None):
+        name = sources[0]['name']
+        self.crawled.append(name)
+        self.failed_sources = {name: self.errors[name]} if name in self.errors else {}
+        return list(self.news.get(name, []))
+
+    def commit_fingerprints(self):
+        self.committed += 1
+
+    def discard_fingerprints(self):
+        pass
+
+
+def test_work_queue_is_abstract():
+    with pytest.raises(TypeError):
+        WorkQueue()
+
+
+def test_lease_is_exclusive_until_it_expires(queue):
+    queue.enqueue('run', {'run/a': {'name': 'a'}})
+    lease = queue.lease('worker-1', lease_seconds=0.2)
+    assert lease.task_id == 'run/a' and lease.attempts == 1
+    assert queue.lease('worker-2', lease_seconds=0.2) is None
+
+    time.sleep(0.3)
+    reclaimed = queue.lease('worker-2', lease_seconds=10)
+    assert reclaimed.task_id == 'run/a' and reclaimed.attempts == 2
+    # 임대를 잃은 작업자는 연장할 수 없음
+    assert not queue.heartbeat(lease, 10)
+    assert queue.heartbeat(reclaimed, 10)
+
+
+def test_expired_lease_counts_as_queued_in_status(queue):
+    queue.enqueue('run', {'run/a': {'name': 'a'}})
+    queue.lease('worker-1', lease_seconds=0.1)
+    assert queue.status('run')['leased'] == 1
+    time.sleep(0.2)
+    assert queue.status('run') == {'queued': 1, 'leased': 0, 'done': 0, 'failed': 0}
+
+
+def test_first_result_wins_after_reclaim(queue):
+    queue.enqueue('run', {'run/a': {'name': 'a'}})
+    stale = queue.lease('worker-1', lease_seconds=0.1)
+    time.sleep(0.2)
+    fresh = queue.lease('worker-2', lease_seconds=10)
+
+    assert queue.complete(fresh, ['second'], 'worker-2')
+    assert not queue.complete(stale, ['first'], 'worker-1')
+    assert queue.results('run') == {'run/a': ['second']}
+    assert queue.status('run')['done'] == 1
+
+
+def test_fail_requeues_until_max_attempts(queue):
+    queue.enqueue('run', {'run/a': {'name': 'a'}})
+    for attempt in range(1, 4):
+        lease = queue.lease('worker', lease_seconds=10)
+        assert lease.attempts == attempt
+        queue.fail(lease, 'boom')
+    assert queue.lease('worker', lease_seconds=10) is None
+    assert queue.status('run')['failed'] == 1
+
+
+def test_enqueue_ignores_existing_task_ids(queue):
+    tasks = source_tasks('run', [{'name': 'a'}, {'name': 'b'}])
+    assert queue.enqueue('run', tasks) == 2
+    assert queue.enqueue('run', tasks) == 0
+
+
+def test_worker_without_run_id_only_takes_the_latest_run(queue):
+    queue.enqueue('old', {'old/a': {'name': 'a'}})
+    queue.enqueue('new', {'new/b': {'name': 'b'}})
+    # 지난 실행 작업을 건드려도 최근 실행은 바뀌지 않음
+    queue.fail(queue.lease('worker', lease_seconds=10, run_id='old'), 'boom')
+    assert queue.latest_run() == 'new'
+
+    crawler = StubCrawler(news={'b': [{'제목': 'b'}]})
+    assert run_worker(queue, crawler, lease_seconds=10) == 1
+    assert crawler.crawled == ['b']
+    assert crawler.committed == 1
+    assert queue.status('old')['queued'] == 1
+
+
+def test_worker_fails_sources_that_errored_without_news(queue):
+    queue.enqueue('run', {'run/a': {'name': 'a'}, 'run/b': {'name': 'b'}})
+    crawler = StubCrawler(news={'b': [{'제목': 'partial'}]}, errors={'a': 'timeout', 'b': 'page 2 failed'})
+    run_worker(queue, crawler, 'run', lease_seconds=10)
+
+    assert queue.status('run') == {'queued': 0, 'leased': 0, 'done': 1, 'failed': 1}
+    assert crawler.crawled.count('a') == 3  # max_attempts까지 재시도
+    assert queue.results('run') == {'run/b': [{'제목': 'partial'}]}
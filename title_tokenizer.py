@@ -0,0 +1,115 @@
+# 한국어 뉴스 제목 토크나이저 및 셔글 인덱스 모듈
+import re
+import zlib
+from typing import Dict, FrozenSet, Hashable, List, Optional, Set
+
+# 자주 붙는 조사/어미 (긴 것부터 검사)
+PARTICLES = sorted([
+    '으로서', '으로써', '에서는', '에게서', '으로는', '이라도', '까지도',
+    '에서', '에게', '한테', '께서', '으로', '부터', '까지', '보다', '처럼',
+    '이나', '라도', '에는', '에도', '로는', '와는', '과는', '이며', '이고',
+    '은', '는', '이', '가', '을', '를', '의', '에', '로', '와', '과', '도', '만', '나'
+], key=len, reverse=True)
+PARTICLE_SET = set(PARTICLES)
+
+# 중복 판단에 의미 없는 단어
+STOP_WORDS = {'기사', '뉴스', '보도', '단독', '속보', '종합', '기고', '사설', '칼럼'}
+
+
+class KoreanTitleTokenizer:
+    """한국어 제목 토크나이저 (조사 제거 토큰 + 문자 bigram/trigram 셔글)"""
+
+    def __init__(self, ngram_sizes=(2, 3), min_stem_length: int = 2):
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.min_stem_length = min_stem_length
+
+    def normalize(self, title: str) -> str:
+        """소문자 변환 및 특수문자 제거"""
+        normalized = re.sub(r'[^\w\s가-힣]', ' ', (title or '').lower())
+        return re.sub(r'\s+', ' ', normalized).strip()
+
+    def strip_particle(self, token: str) -> str:
+        """토큰 끝에 붙은 조사 제거 (어간이 너무 짧아지면 유지)"""
+        for particle in PARTICLES:
+            if token.endswith(particle) and len(token) - len(particle) >= self.min_stem_length:
+                return token[:-len(particle)]
+        return token
+
+    def tokenize(self, title: str) -> List[str]:
+        """조사가 제거된 토큰 목록"""
+        tokens = []
+        for token in self.normalize(title).split():
+            if token in PARTICLE_SET:
+                continue
+            stem = self.strip_particle(token)
+            if stem and stem not in STOP_WORDS:
+                tokens.append(stem)
+        return tokens
+
+    def shingles(self, title: str) -> Set[str]:
+        """토큰 + 문자 n-gram 셔글 (띄어쓰기 차이를 흡수하기 위해 토큰을 이어서 생성)"""
+        tokens = self.tokenize(title)
+        result = set(tokens)
+        joined = ''.join(tokens)
+        for size in self.ngram_sizes:
+            for i in range(len(joined) - size + 1):
+                result.add(joined[i:i + size])
+        return result
+
+    def hashed_shingles(self, title: str) -> FrozenSet[int]:
+        """정수 해시 셔글 집합 (실행 간에도 값이 동일하도록 crc32 사용)"""
+        return frozenset(zlib.crc32(s.encode('utf-8')) for s in self.shingles(title))
+
+
+def jaccard(shingles1: FrozenSet[int], shingles2: FrozenSet[int]) -> float:
+    """두 셔글 집합의 자카드 유사도"""
+    if not shingles1 or not shingles2:
+        return 0
+    intersection = len(shingles1 & shingles2)
+    return intersection / (len(shingles1) + len(shingles2) - intersection)
+
+
+class TitleShingleIndex:
+    """기사별 셔글 집합을 미리 계산해 두는 유사 제목 인덱스"""
+
+    def __init__(self, tokenizer: Optional[KoreanTitleTokenizer] = None, threshold: float = 0.5):
+        self.tokenizer = tokenizer or default_tokenizer
+        self.threshold = threshold
+        self.shingles_by_key: Dict[Hashable, FrozenSet[int]] = {}
+        self.postings: Dict[int, Set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self.shingles_by_key)
+
+    def add(self, key: Hashable, title: str) -> FrozenSet[int]:
+        """기사 셔글 등록"""
+        shingles = self.tokenizer.hashed_shingles(title)
+        self.shingles_by_key[key] = shingles
+        for shingle in shingles:
+            self.postings.setdefault(shingle, set()).add(key)
+        return shingles
+
+    def find_similar(self, title: str, threshold: Optional[float] = None):
+        """임계값 이상으로 유사한 기사 (key, 유사도) 반환, 없으면 None"""
+        threshold = self.threshold if threshold is None else threshold
+        shingles = self.tokenizer.hashed_shingles(title)
+        if not shingles:
+            return None
+
+        # 공유 셔글 개수만 세어 후보를 좁힘 (정수 집합 연산만 사용)
+        overlap: Dict[Hashable, int] = {}
+        for shingle in shingles:
+            for key in self.postings.get(shingle, ()):
+                overlap[key] = overlap.get(key, 0) + 1
+
+        best = None
+        for key, intersection in overlap.items():
+            union = len(shingles) + len(self.shingles_by_key[key]) - intersection
+            similarity = intersection / union
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+
+# 전역 토크나이저 인스턴스
+default_tokenizer = KoreanTitleTokenizer()
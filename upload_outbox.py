@@ -0,0 +1,185 @@
+# 업로드 대기열(outbox) 모듈 - 스프레드시트 업로드를 크롤링과 분리하고 최소 1회 전달 보장
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from run_deadline import DeadlineExceeded
+from url_canonicalizer import url_key
+
+logger = logging.getLogger(__name__)
+
+
+class UploadOutbox:
+    """업로드할 행을 SQLite에 보관하고 성공할 때까지 다시 보내는 대기열
+
+    행 키는 정규화된 링크 키라 같은 기사를 여러 번 넣어도 한 행만 남고,
+    업로드 함수가 성공을 반환한 행만 전달 완료로 표시한다. max_attempts번 실패한 행은
+    전달 불가(dead letter)로 남겨 두고 더 보내지 않아 같은 워크시트의 다음 행을 막지 않는다.
+    """
+
+    def __init__(self, db_file: str = 'upload_outbox.db', delivered_retention_days: int = 7,
+                 max_attempts: int = 5):
+        self.db_file = db_file
+        self.max_attempts = max_attempts
+        self.delivered_retention_days = delivered_retention_days
+        self.lock = threading.Lock()        # DB 접근
+        self.drain_lock = threading.Lock()  # 동시에 하나의 전달 작업만
+        self.threads: List[threading.Thread] = []
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    row_key TEXT NOT NULL,
+                    worksheet TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    delivered_at REAL,
+                    PRIMARY KEY (worksheet, row_key)
+                )""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox (delivered_at, created_at)")
+
+    @staticmethod
+    def row_key(news: Dict) -> str:
+        """행 키 (정규화된 링크 키, 링크가 없으면 제목)"""
+        return url_key(news['링크']) if news.get('링크') else f"title:{news.get('제목', '')}"
+
+    def enqueue(self, news_list: List[Dict], worksheet: str) -> int:
+        """업로드할 기사 추가 (이미 있는 키는 무시)"""
+        return self.enqueue_many({worksheet: news_list})
+
+    def enqueue_many(self, batches: Dict[str, List[Dict]]) -> int:
+        """워크시트별 기사를 한 트랜잭션으로 추가 (모두 들어가거나 하나도 안 들어감)"""
+        now = time.time()
+        rows = [(self.row_key(news), worksheet, json.dumps(news, ensure_ascii=False), now)
+                for worksheet, news_list in batches.items() for news in news_list]
+        with self.lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO outbox (row_key, worksheet, payload, created_at) VALUES (?, ?, ?, ?)",
+                rows)
+            return self.conn.total_changes - before
+
+    def pending_count(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM outbox WHERE delivered_at IS NULL AND attempts < ?",
+                                     (self.max_attempts,)).fetchone()[0]
+
+    def dead_letters(self) -> Dict[str, Dict]:
+        """전달 불가 행의 워크시트별 건수와 마지막 오류"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT worksheet, COUNT(*), MAX(last_error) FROM outbox "
+                "WHERE delivered_at IS NULL AND attempts >= ? GROUP BY worksheet", (self.max_attempts,)).fetchall()
+        return {worksheet: {'count': count, 'last_error': error} for worksheet, count, error in rows}
+
+    def retry_dead_letters(self, worksheet: Optional[str] = None) -> int:
+        """전달 불가 행을 다시 대기 상태로 (원인을 고친 뒤 호출)"""
+        query = "UPDATE outbox SET attempts = 0 WHERE delivered_at IS NULL AND attempts >= ?"
+        params = [self.max_attempts]
+        if worksheet:
+            query += " AND worksheet = ?"
+            params.append(worksheet)
+        with self.lock, self.conn:
+            return self.conn.execute(query, params).rowcount
+
+    def pending(self, worksheet: str, limit: int = 1000) -> List[tuple]:
+        """전달되지 않은 (키, 기사) 목록 (오래된 순)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT row_key, payload FROM outbox WHERE worksheet = ? AND delivered_at IS NULL AND attempts < ? "
+                "ORDER BY created_at LIMIT ?", (worksheet, self.max_attempts, limit)).fetchall()
+        return [(key, json.loads(payload)) for key, payload in rows]
+
+    def _worksheets(self) -> List[str]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT DISTINCT worksheet FROM outbox WHERE delivered_at IS NULL AND attempts < ?",
+                (self.max_attempts,)).fetchall()
+        return [row[0] for row in rows]
+
+    def mark_delivered(self, worksheet: str, keys: List[str]):
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "UPDATE outbox SET delivered_at = ?, attempts = attempts + 1, last_error = NULL "
+                "WHERE worksheet = ? AND row_key = ?", [(now, worksheet, key) for key in keys])
+
+    def mark_failed(self, worksheet: str, keys: List[str], error: str) -> int:
+        """실패 기록, 이번에 전달 불가가 된 행 수 반환"""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, last_error = ? WHERE worksheet = ? AND row_key = ?",
+                [(error, worksheet, key) for key in keys])
+            dead = 0
+            for offset in range(0, len(keys), 500):
+                chunk = keys[offset:offset + 500]
+                dead += self.conn.execute(
+                    f"SELECT COUNT(*) FROM outbox WHERE worksheet = ? AND attempts = ? "
+                    f"AND row_key IN ({','.join('?' * len(chunk))})",
+                    [worksheet, self.max_attempts, *chunk]).fetchone()[0]
+            return dead
+
+    def drain(self, upload: Callable[[List[Dict], str], bool], batch_size: int = 1000) -> int:
+        """대기 중인 행을 워크시트별로 묶어 업로드 (성공한 묶음만 완료 표시)"""
+        delivered = 0
+        with self.drain_lock:
+            for worksheet in self._worksheets():
+                while True:
+                    batch = self.pending(worksheet, batch_size)
+                    if not batch:
+                        break
+                    keys = [key for key, _ in batch]
+                    try:
+                        ok = upload([news for _, news in batch], worksheet)
+                        error = '' if ok else '업로드 실패'
+                    except DeadlineExceeded as e:
+                        # 시간이 부족했을 뿐이므로 실패 횟수에 넣지 않음
+                        logger.warning(f"업로드 대기열 전달 중단 ({worksheet}): {e} - 다음 실행에서 재시도")
+                        break
+                    except Exception as e:
+                        ok, error = False, str(e)
+                    if not ok:
+                        dead = self.mark_failed(worksheet, keys, error)
+                        if dead:
+                            logger.error(f"업로드 대기열 전달 불가 ({worksheet}, {dead}개): {self.max_attempts}회 실패 - "
+                                         f"{error} (원인 확인 후 retry_dead_letters로 재시도)")
+                            continue  # 전달 불가 행을 빼고 다음 묶음 진행
+                        logger.warning(f"업로드 대기열 전달 실패 ({worksheet}, {len(keys)}개): {error} - 다음 실행에서 재시도")
+                        break
+                    self.mark_delivered(worksheet, keys)
+                    delivered += len(keys)
+            self.purge_delivered()
+        if delivered:
+            logger.info(f"업로드 대기열 전달 완료: {delivered}개")
+        return delivered
+
+    def drain_async(self, upload: Callable[[List[Dict], str], bool]) -> threading.Thread:
+        """백그라운드 스레드에서 전달"""
+        thread = threading.Thread(target=self.drain, args=(upload,), name='upload-outbox', daemon=True)
+        thread.start()
+        self.threads = [t for t in self.threads if t.is_alive()] + [thread]
+        return thread
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """진행 중인 전달 작업 대기 (시간 안에 모두 끝나면 True)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self.threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        self.threads = [t for t in self.threads if t.is_alive()]
+        return not self.threads
+
+    def purge_delivered(self):
+        """보존 기간이 지난 전달 완료 행 삭제"""
+        cutoff = time.time() - self.delivered_retention_days * 86400
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM outbox WHERE delivered_at IS NOT NULL AND delivered_at < ?", (cutoff,))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
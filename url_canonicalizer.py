@@ -0,0 +1,87 @@
+# URL 정규화 모듈 - 중복 체크 및 캐시 키 통일
+import hashlib
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from config import URL_CANONICAL_RULES
+
+# 기사 식별과 무관한 추적용 파라미터
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'yclid',
+    'ref', 'referer', 'from', 'share', 'sns', 'cmpid', 'ncid',
+}
+TRACKING_PREFIXES = ('utm_', 'mc_', 'pk_')
+
+
+class UrlCanonicalizer:
+    """소스별 규칙(식별 파라미터, 호스트 별칭)을 적용한 URL 정규화"""
+
+    def __init__(self, rules: Optional[Dict[str, Dict]] = None):
+        self.rules = rules or {}
+        # 별칭 호스트 → 대표 호스트
+        self.host_aliases = {}
+        for host, rule in self.rules.items():
+            self.host_aliases[host] = host
+            for alias in rule.get('aliases', []):
+                self.host_aliases[alias] = host
+
+    def canonicalize(self, url: str, base_url: Optional[str] = None) -> str:
+        """정규화된 URL 반환 (http/https, 호스트 별칭, 파라미터 순서/추적 파라미터 통일)"""
+        if not url:
+            return ''
+        if base_url:
+            url = urljoin(base_url, url)
+
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or '').lower()
+        if not host:
+            return url
+
+        canonical_host = self.host_aliases.get(host)
+        rule = self.rules.get(canonical_host, {}) if canonical_host else {}
+        if canonical_host:
+            host = canonical_host
+            scheme = 'https' if rule.get('https', True) else scheme
+        if parts.port and parts.port not in (80, 443):
+            host = f"{host}:{parts.port}"
+
+        path = parts.path or '/'
+        while '//' in path:
+            path = path.replace('//', '/')
+        if len(path) > 1 and path.endswith('/'):
+            path = path.rstrip('/')
+
+        strip_params = set(rule.get('strip_params', []))
+        params = [
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=False)
+            if key.lower() not in TRACKING_PARAMS and key not in strip_params
+            and not key.lower().startswith(TRACKING_PREFIXES)
+        ]
+        # 식별 파라미터가 있으면 그것만 남김 (예: articleView.html?idxno=123)
+        id_params = rule.get('id_params', [])
+        if id_params and any(key in id_params for key, _ in params):
+            params = [(key, value) for key, value in params if key in id_params]
+        query = urlencode(sorted(params))
+
+        return urlunsplit((scheme, host, path, query, ''))
+
+    def key(self, url: str, base_url: Optional[str] = None) -> str:
+        """정규화된 URL의 짧은 키 (스킴 제외, 16자리 hex)"""
+        canonical = self.canonicalize(url, base_url)
+        without_scheme = canonical.split('://', 1)[-1]
+        return hashlib.blake2b(without_scheme.encode('utf-8'), digest_size=8).hexdigest()
+
+
+# 전역 URL 정규화 인스턴스
+url_canonicalizer = UrlCanonicalizer(URL_CANONICAL_RULES)
+
+
+def canonicalize_url(url: str, base_url: Optional[str] = None) -> str:
+    """정규화된 URL"""
+    return url_canonicalizer.canonicalize(url, base_url)
+
+
+def url_key(url: str, base_url: Optional[str] = None) -> str:
+    """중복 체크/캐시용 URL 키"""
+    return url_canonicalizer.key(url, base_url)
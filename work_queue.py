@@ -0,0 +1,370 @@
+# 분산 크롤링 작업 대기열 모듈 - 임대(lease)/하트비트 기반 작업 분배 + 멱등 결과 기록
+import argparse
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from run_deadline import RunDeadline
+
+logger = logging.getLogger(__name__)
+
+
+class Lease:
+    """작업자가 임대한 작업 하나"""
+
+    def __init__(self, task_id: str, run_id: str, token: str, payload: Dict, attempts: int):
+        self.task_id = task_id
+        self.run_id = run_id
+        self.token = token
+        self.payload = payload
+        self.attempts = attempts
+
+
+class WorkQueue(ABC):
+    """작업 대기열 인터페이스 (다른 저장소로 구현할 때 이 메서드들을 제공)
+
+    작업은 임대 기간 동안만 한 작업자에게 배정되고, 하트비트가 끊겨 기간이 지나면
+    다른 작업자가 다시 가져간다. 결과는 작업 ID당 처음 한 번만 기록된다.
+    """
+
+    @abstractmethod
+    def enqueue(self, run_id: str, tasks: Dict[str, Dict]) -> int:
+        """작업 추가 (작업 ID → 내용, 이미 있는 ID는 무시)"""
+
+    @abstractmethod
+    def lease(self, worker_id: str, lease_seconds: float, run_id: Optional[str] = None) -> Optional[Lease]:
+        """실행 가능한 작업 하나 임대 (없으면 None)"""
+
+    @abstractmethod
+    def heartbeat(self, lease: Lease, lease_seconds: float) -> bool:
+        """임대 연장 (다른 작업자에게 넘어갔으면 False)"""
+
+    @abstractmethod
+    def complete(self, lease: Lease, result, worker_id: str = '') -> bool:
+        """결과 기록 (이미 기록된 작업이면 무시하고 False)"""
+
+    @abstractmethod
+    def fail(self, lease: Lease, error: str):
+        """실패 기록 (재시도 횟수가 남았으면 다시 대기 상태로)"""
+
+    @abstractmethod
+    def results(self, run_id: str) -> Dict[str, object]:
+        """실행의 작업별 결과"""
+
+    @abstractmethod
+    def status(self, run_id: str) -> Dict[str, int]:
+        """실행의 상태별 작업 수"""
+
+    @abstractmethod
+    def latest_run(self) -> Optional[str]:
+        """가장 최근에 등록된 실행 ID (없으면 None)"""
+
+
+class SqliteWorkQueue(WorkQueue):
+    """SQLite 작업 대기열 (같은 파일을 쓰는 여러 프로세스가 공유)"""
+
+    def __init__(self, db_file: str = 'work_queue.db', max_attempts: int = 3):
+        self.db_file = db_file
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        # 트랜잭션은 직접 관리 (임대는 BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡음)
+        self.conn = sqlite3.connect(db_file, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                lease_owner TEXT,
+                lease_token TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at REAL NOT NULL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_run ON tasks (run_id, status)")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                task_id TEXT PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                worker TEXT NOT NULL,
+                committed_at REAL NOT NULL
+            )""")
+
+    def _transaction(self, statements):
+        """BEGIN IMMEDIATE 트랜잭션에서 statements(conn) 실행"""
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = statements(self.conn)
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+            return result
+
+    def enqueue(self, run_id: str, tasks: Dict[str, Dict]) -> int:
+        now = time.time()
+
+        def insert(conn):
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (task_id, run_id, payload, updated_at) VALUES (?, ?, ?, ?)",
+                [(task_id, run_id, json.dumps(payload, ensure_ascii=False), now)
+                 for task_id, payload in tasks.items()])
+            return conn.total_changes - before
+        return self._transaction(insert)
+
+    def lease(self, worker_id: str, lease_seconds: float, run_id: Optional[str] = None) -> Optional[Lease]:
+        now = time.time()
+
+        def take(conn):
+            query = ("SELECT task_id, run_id, payload, attempts FROM tasks "
+                     "WHERE (status = 'queued' OR (status = 'leased' AND lease_expires < ?)) AND attempts < ?")
+            params = [now, self.max_attempts]
+            if run_id:
+                query += " AND run_id = ?"
+                params.append(run_id)
+            row = conn.execute(query + " ORDER BY attempts, updated_at LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            task_id, task_run_id, payload, attempts = row
+            token = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_token = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE task_id = ?",
+                (worker_id, token, now + lease_seconds, now, task_id))
+            return Lease(task_id, task_run_id, token, json.loads(payload), attempts + 1)
+        return self._transaction(take)
+
+    def heartbeat(self, lease: Lease, lease_seconds: float) -> bool:
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? "
+                "WHERE task_id = ? AND lease_token = ? AND status = 'leased'",
+                (time.time() + lease_seconds, time.time(), lease.task_id, lease.token))
+            return cursor.rowcount == 1
+
+    def complete(self, lease: Lease, result, worker_id: str = '') -> bool:
+        # 임대가 만료되어 다른 작업자가 가져갔더라도 먼저 도착한 결과를 인정 (작업 ID당 한 번)
+        now = time.time()
+
+        def commit(conn):
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO results (task_id, run_id, payload, worker, committed_at) VALUES (?, ?, ?, ?, ?)",
+                (lease.task_id, lease.run_id, json.dumps(result, ensure_ascii=False), worker_id, now))
+            conn.execute(
+                "UPDATE tasks SET status = 'done', lease_token = NULL, updated_at = ? WHERE task_id = ?",
+                (now, lease.task_id))
+            return cursor.rowcount == 1
+        return self._transaction(commit)
+
+    def fail(self, lease: Lease, error: str):
+        def release(conn):
+            conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+                "lease_token = NULL, last_error = ?, updated_at = ? "
+                "WHERE task_id = ? AND lease_token = ?",
+                (self.max_attempts, error, time.time(), lease.task_id, lease.token))
+        self._transaction(release)
+
+    def results(self, run_id: str) -> Dict[str, object]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT task_id, payload FROM results WHERE run_id = ? ORDER BY committed_at", (run_id,)).fetchall()
+        return {task_id: json.loads(payload) for task_id, payload in rows}
+
+    def status(self, run_id: str) -> Dict[str, int]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT status, lease_expires, attempts FROM tasks WHERE run_id = ?", (run_id,)).fetchall()
+        counts = {'queued': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        now = time.time()
+        for status, lease_expires, attempts in rows:
+            if status == 'leased' and lease_expires < now:
+                # 만료된 임대는 재시도 횟수가 남았으면 대기, 아니면 실패로 집계
+                status = 'queued' if attempts < self.max_attempts else 'failed'
+            counts[status] += 1
+        return counts
+
+    def latest_run(self) -> Optional[str]:
+        with self.lock:
+            # 등록 순서 기준 (임대/완료로 바뀌는 updated_at은 지난 실행을 최근으로 보이게 함)
+            row = self.conn.execute("SELECT run_id FROM tasks ORDER BY rowid DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class LeaseKeeper(threading.Thread):
+    """작업 중 주기적으로 임대 연장 (임대를 잃으면 작업 마감 시간 취소)"""
+
+    def __init__(self, queue: WorkQueue, lease: Lease, lease_seconds: float, deadline: RunDeadline):
+        super().__init__(name=f'lease-{lease.task_id}', daemon=True)
+        self.queue = queue
+        self.lease = lease
+        self.lease_seconds = lease_seconds
+        self.deadline = deadline
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self):
+        while not self.stopped.wait(self.lease_seconds / 3):
+            try:
+                if self.queue.heartbeat(self.lease, self.lease_seconds):
+                    continue
+            except sqlite3.Error as e:
+                logger.warning(f"하트비트 실패 ({self.lease.task_id}): {e}")
+                continue
+            logger.warning(f"작업 임대 상실: {self.lease.task_id} - 중단")
+            self.lost = True
+            self.deadline.cancel()
+            return
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def worker_id() -> str:
+    """작업자 식별자 (호스트:PID)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def source_tasks(run_id: str, sources: List[Dict]) -> Dict[str, Dict]:
+    """뉴스 소스 목록 → 작업 (작업 ID는 '실행ID/소스 이름')"""
+    return {f"{run_id}/{source['name']}": source for source in sources}
+
+
+def run_worker(queue: WorkQueue, crawler, run_id: Optional[str] = None, lease_seconds: float = 120.0,
+               deadline: Optional[RunDeadline] = None, worker: Optional[str] = None) -> int:
+    """대기열이 빌 때까지 소스 작업을 임대해 크롤링하고 결과 기록, 처리한 작업 수 반환
+
+    run_id를 생략하면 가장 최근 실행의 작업만 처리한다 (지난 실행의 남은 작업은 가져오지 않음).
+    같은 크롤러로 crawl_all_sources를 동시에 부르지 않도록 작업은 하나씩 처리하고,
+    처리량은 작업자 프로세스/머신 수로 늘린다. 소스가 오류로 아무것도 수집하지 못하면
+    실패로 기록해 재시도하게 하고, 목록 영역 지문은 결과가 대기열에 기록된 작업만 저장한다.
+    """
+    deadline = deadline or RunDeadline()
+    worker = worker or worker_id()
+    run_id = run_id or queue.latest_run()
+    if run_id is None:
+        return 0
+    processed = 0
+    while not deadline.expired():
+        lease = queue.lease(worker, lease_seconds, run_id)
+        if lease is None:
+            break
+
+        task_deadline = RunDeadline(parent=deadline)
+        keeper = LeaseKeeper(queue, lease, lease_seconds, task_deadline)
+        keeper.start()
+        try:
+            news = crawler.crawl_all_sources([lease.payload], deadline=task_deadline)
+        except Exception as e:
+            keeper.stop()
+            crawler.discard_fingerprints()
+            queue.fail(lease, str(e))
+            logger.error(f"작업 실패 ({lease.task_id}, {lease.attempts}회째): {e}")
+            continue
+        keeper.stop()
+
+        if keeper.lost:
+            crawler.discard_fingerprints()
+            continue  # 다른 작업자가 이어서 처리
+        error = crawler.failed_sources.get(lease.payload['name'])
+        if error and not news:
+            # crawl_all_sources는 소스 오류를 삼키므로 여기서 실패로 기록 (재시도 횟수가 남았으면 다시 대기)
+            crawler.discard_fingerprints()
+            queue.fail(lease, error)
+            logger.error(f"작업 실패 ({lease.task_id}, {lease.attempts}회째): {error}")
+            continue
+        # 마감 시간/오류로 중단된 작업도 그때까지 수집한 뉴스로 완료 (단일 실행과 같은 동작)
+        partial = ' - 마감 시간으로 일부만 수집' if task_deadline.expired() else \
+            f' - 오류로 일부만 수집 ({error})' if error else ''
+        if queue.complete(lease, news, worker):
+            crawler.commit_fingerprints()
+            logger.info(f"작업 완료: {lease.task_id} ({len(news)}개){partial}")
+        else:
+            crawler.discard_fingerprints()
+        processed += 1
+    return processed
+
+
+def crawl_with_queue(queue: WorkQueue, crawler, sources: List[Dict], deadline: Optional[RunDeadline] = None,
+                     run_id: Optional[str] = None, lease_seconds: float = 120.0,
+                     poll_interval: float = 2.0) -> List[Dict]:
+    """조정자: 실행 작업을 등록하고 직접 작업자로도 참여한 뒤, 모든 작업이 끝나거나
+    마감 시간이 되면 기록된 결과를 모아 반환"""
+    deadline = deadline or RunDeadline()
+    run_id = run_id or time.strftime('%Y%m%d-%H%M%S')
+    queue.enqueue(run_id, source_tasks(run_id, sources))
+    logger.info(f"작업 대기열 등록: 실행 {run_id}, 소스 {len(sources)}개")
+
+    while not deadline.expired():
+        run_worker(queue, crawler, run_id, lease_seconds, deadline)
+        counts = queue.status(run_id)
+        if counts['queued'] == 0 and counts['leased'] == 0:
+            break
+        time.sleep(min(poll_interval, deadline.remaining()))  # 다른 작업자가 처리 중
+
+    counts = queue.status(run_id)
+    logger.info(f"작업 대기열 상태 ({run_id}): {counts}")
+    all_news = []
+    for news in queue.results(run_id).values():
+        all_news.extend(news)
+    return all_news
+
+
+def main():
+    """작업 대기열 명령 (작업자 실행, 상태 조회)"""
+    from config import NEWS_SOURCES, WORK_QUEUE_FILE, WORK_QUEUE_LEASE_SECONDS
+    from log_config import setup_logging
+
+    parser = argparse.ArgumentParser(description='분산 크롤링 작업 대기열')
+    parser.add_argument('--db', default=WORK_QUEUE_FILE)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    sub = subparsers.add_parser('enqueue', help='전체 소스를 새 실행으로 등록')
+    sub.add_argument('--run-id', default=None)
+    sub = subparsers.add_parser('worker', help='대기 중인 작업 처리')
+    sub.add_argument('--run-id', default=None)
+    sub.add_argument('--lease-seconds', type=float, default=WORK_QUEUE_LEASE_SECONDS)
+    sub = subparsers.add_parser('status', help='실행 상태 조회')
+    sub.add_argument('--run-id', default=None)
+
+    args = parser.parse_args()
+    setup_logging()
+    queue = SqliteWorkQueue(args.db)
+    try:
+        if args.command == 'enqueue':
+            run_id = args.run_id or time.strftime('%Y%m%d-%H%M%S')
+            added = queue.enqueue(run_id, source_tasks(run_id, NEWS_SOURCES))
+            print(f"실행 {run_id}: 작업 {added}개 등록")
+        elif args.command == 'worker':
+            from news_crawler import EducationNewsCrawler
+            processed = run_worker(queue, EducationNewsCrawler(), args.run_id, args.lease_seconds)
+            print(f"작업 {processed}개 처리")
+        else:
+            run_id = args.run_id or queue.latest_run()
+            if run_id is None:
+                print("등록된 실행이 없습니다.")
+                return
+            results = queue.results(run_id)
+            print(f"실행 {run_id}: {queue.status(run_id)}, 결과 뉴스 {sum(len(n) for n in results.values())}개")
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()